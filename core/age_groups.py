@@ -0,0 +1,129 @@
+from collections import Counter, namedtuple
+from datetime import date
+
+from .db import write_transaction
+from .models import DancerParticipation, Participation
+
+# Highest average age (inclusive) for each age group; anything older is Adult.
+# static/js/age_groups.js keeps its own copy of these bounds.
+AGE_GROUP_LIMITS = [
+    (6, "Baby"),
+    (8, "Mini Kids"),
+    (11, "Kids"),
+    (14, "Teen"),
+    (17, "Youth"),
+]
+OLDEST_AGE_GROUP = "Adult"
+
+AgeGroupChange = namedtuple("AgeGroupChange", ["participation_id", "category", "old", "new", "avg_age"])
+
+
+def calculate_age_group(dancers, on=None):
+    """
+    Return (age_group_key, average_age) based on dancer DOB(s), with ages taken
+    on `on` (default today). Mirrored in static/js/age_groups.js and, for whole
+    events, age_groups_on; all three are checked against
+    core/age_group_vectors.json (manage.py check_age_groups).
+    """
+    if not dancers:
+        return "Adult", None  # fallback
+
+    today = on or date.today()
+    ages = []
+    for d in dancers:
+        if d.date_of_birth:
+            age = today.year - d.date_of_birth.year - (
+                (today.month, today.day) < (d.date_of_birth.month, d.date_of_birth.day)
+            )
+            ages.append(age)
+
+    if not ages:
+        return "Adult", None
+
+    avg_age = sum(ages) / len(ages)
+
+    # Map average age to categories (keys from Participation.AGE_GROUP_CHOICES)
+    group = next((name for limit, name in AGE_GROUP_LIMITS if avg_age <= limit), OLDEST_AGE_GROUP)
+
+    # Half-up on the exact average, which the browser can reproduce bit for bit
+    return group, (sum(ages) * 20 + len(ages)) // (2 * len(ages)) / 10
+
+
+def age_groups_on(participation_ids, birth_dates, on):
+    """
+    Vectorised calculate_age_group: for parallel sequences of participation ids
+    and dancer birth dates, return {participation_id: (age_group, avg_age)} with
+    ages taken on `on`. Same boundaries and rounding as the per-entry function.
+    """
+    import numpy as np  # only the bulk paths need numpy
+
+    if not participation_ids:
+        return {}
+
+    ids, entry = np.unique(np.asarray(participation_ids), return_inverse=True)
+    born = np.asarray(birth_dates, dtype="datetime64[D]")
+    years = born.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = born.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    days = (born - born.astype("datetime64[M]")).astype(np.int64) + 1
+
+    before_birthday = (months > on.month) | ((months == on.month) & (days > on.day))
+    ages = on.year - years - before_birthday
+
+    totals = np.bincount(entry, weights=ages).astype(np.int64)
+    counts = np.bincount(entry)
+    averages = totals / counts
+    rounded = (totals * 20 + counts) // (2 * counts) / 10
+
+    names = np.array([name for _limit, name in AGE_GROUP_LIMITS] + [OLDEST_AGE_GROUP])
+    groups = names[np.searchsorted([limit for limit, _name in AGE_GROUP_LIMITS], averages, side="left")]
+
+    return {
+        int(pid): (str(group), float(avg))
+        for pid, group, avg in zip(ids, groups, rounded)
+    }
+
+
+def plan_age_group_changes(event, on=None):
+    """
+    Entries of `event` whose stored age group differs from the one their
+    dancers' ages on `on` (default: the event date) give. Productions stay
+    Mixed Age and entries without dancers are left alone.
+    """
+    on = on or event.date
+    links = (
+        DancerParticipation.objects.filter(participation__event=event)
+        .exclude(participation__group_type="Production")
+        .values_list("participation_id", "dancer__date_of_birth")
+    )
+    participation_ids, birth_dates = [], []
+    for participation_id, dob in links:
+        participation_ids.append(participation_id)
+        birth_dates.append(dob)
+    planned = age_groups_on(participation_ids, birth_dates, on)
+
+    changes = []
+    for pid, style, group_type, difficulty, stored in (
+        Participation.objects.filter(event=event, id__in=list(planned))
+        .order_by("id")
+        .values_list("id", "style__name", "group_type", "difficulty", "age_group")
+    ):
+        new, avg_age = planned[pid]
+        if new != stored:
+            changes.append(AgeGroupChange(pid, (style, group_type, difficulty), stored, new, avg_age))
+    return changes
+
+
+def summarize_changes(changes):
+    """[(style, group_type, difficulty, old, new, entries)] sorted by category."""
+    counts = Counter((*c.category, c.old, c.new) for c in changes)
+    return [(*key, count) for key, count in sorted(counts.items())]
+
+
+def apply_age_group_changes(changes, batch_size=500):
+    with write_transaction():
+        Participation.objects.bulk_update(
+            [Participation(id=c.participation_id, age_group=c.new) for c in changes],
+            ["age_group"],
+            batch_size=batch_size,
+        )
+    return len(changes)
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+
+
+class CoreConfig(AppConfig):
+    name = "core"
+
+    def ready(self):
+        from .db import configure_sqlite_connection
+        from .models import Event
+        from .page_cache import bump_events_version
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid="core.configure_sqlite_connection")
+        post_save.connect(bump_events_version, sender=Event, dispatch_uid="core.page_cache.event_saved")
+        post_delete.connect(bump_events_version, sender=Event, dispatch_uid="core.page_cache.event_deleted")
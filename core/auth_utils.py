@@ -1,3 +1,10 @@
+import secrets
+from datetime import datetime, time, timedelta
+
+from django.core import signing
+from django.utils import timezone
+
+
 def is_judge_account(user):
     if not getattr(user, "is_authenticated", False):
         return False
@@ -20,3 +27,56 @@ def judge_event_id_from_username(username):
     except Exception:
         return None
     return None
+
+
+JUDGE_LOGIN_SALT = "core.judge-login"
+
+
+def judge_login_expiry(event):
+    """Login links stay valid until the end of the event day (local time)."""
+    end_of_day = datetime.combine(event.date + timedelta(days=1), time.min)
+    return timezone.make_aware(end_of_day)
+
+
+def make_judge_login_token(judge, event):
+    """
+    Create a one-time login token for a judge and return its signed string.
+    The signature is an HMAC over the token id and nonce, so redeeming it
+    needs no password hashing.
+    """
+    from .models import JudgeLoginToken
+
+    token = JudgeLoginToken.objects.create(
+        judge=judge,
+        event=event,
+        nonce=secrets.token_urlsafe(24),
+        expires_at=judge_login_expiry(event),
+    )
+    return signing.dumps({"t": token.id, "n": token.nonce}, salt=JUDGE_LOGIN_SALT, compress=True)
+
+
+def redeem_judge_login_token(value):
+    """
+    Validate a signed login token and mark it used.
+    Returns the JudgeLoginToken, or None if it is forged, expired or already used.
+    """
+    from .models import JudgeLoginToken
+
+    try:
+        data = signing.loads(value, salt=JUDGE_LOGIN_SALT)
+        token_id, nonce = int(data["t"]), str(data["n"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+    now = timezone.now()
+    # Conditional update so two simultaneous scans cannot both log in.
+    claimed = JudgeLoginToken.objects.filter(
+        id=token_id, nonce=nonce, used_at__isnull=True, expires_at__gt=now,
+    ).update(used_at=now)
+    if not claimed:
+        return None
+
+    token = JudgeLoginToken.objects.select_related("judge", "event").get(id=token_id)
+    if not token.judge.is_active or judge_event_id_from_username(token.judge.username) != token.event_id:
+        return None
+    return token
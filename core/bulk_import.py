@@ -0,0 +1,383 @@
+import csv
+import io
+import os
+import re
+from collections import defaultdict
+from datetime import date, datetime
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+
+from .age_groups import calculate_age_group
+from .db import write_transaction
+from .forms import GROUP_DANCER_LIMITS, MUSIC_DURATION_LIMITS
+from .models import Dancer, DancerParticipation, Participation, StyleCategory
+
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d.%m.%Y.", "%d/%m/%Y")
+
+DANCER_COLUMNS = ["first_name", "last_name", "date_of_birth"]
+PARTICIPATION_COLUMNS = [
+    "style", "group_type", "difficulty", "choreographer_name",
+    "choreography_name", "group_name", "dancers", "music_file",
+]
+
+GROUP_NAME_REQUIRED = ("Group", "Formation", "Production")
+
+BATCH_SIZE = 500
+
+
+class SheetError(Exception):
+    """The upload cannot be read as a sheet at all (wrong type, empty, too long)."""
+
+
+class ImportReport:
+    """Outcome of one upload. Nothing is written while `errors` is non-empty."""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.skipped = 0
+        self.errors = []    # (row number, message)
+        self.warnings = []  # (row number, message); the row is still imported
+
+    def error(self, row_number, problems):
+        self.errors.append((row_number, "; ".join(problems)))
+
+
+def _column(header):
+    return re.sub(r"\s+", "_", str(header or "").strip().lower())
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _csv_rows(upload):
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(text, dialect)
+    except UnicodeDecodeError as exc:
+        raise SheetError(_("The CSV file must be UTF-8 encoded.")) from exc
+    finally:
+        text.detach()
+
+
+def _xlsx_rows(upload):
+    from openpyxl import load_workbook  # only needed for spreadsheet uploads
+
+    try:
+        workbook = load_workbook(upload.file, read_only=True, data_only=True)
+    except Exception as exc:
+        raise SheetError(_("The spreadsheet could not be read.")) from exc
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_rows(upload):
+    """
+    (row_number, {column: value}) for every non-blank row of a CSV or XLSX
+    upload, read lazily. Row 1 is the header; column names are lower-cased
+    with spaces turned into underscores.
+    """
+    name = upload.name.lower()
+    if name.endswith(".csv"):
+        rows = _csv_rows(upload)
+    elif name.endswith(".xlsx"):
+        rows = _xlsx_rows(upload)
+    else:
+        raise SheetError(_("Upload a .csv or .xlsx file."))
+
+    header = next(rows, None)
+    if not header or not any(header):
+        raise SheetError(_("The file is empty."))
+    columns = [_column(h) for h in header]
+
+    max_rows = settings.BULK_IMPORT_MAX_ROWS
+    for number, values in enumerate(rows, start=2):
+        cells = {col: _cell(value) for col, value in zip(columns, values) if col}
+        if not any(cells.values()):
+            continue
+        if number - 1 > max_rows:
+            raise SheetError(_("The file has more than %(max)d rows.") % {"max": max_rows})
+        yield number, cells
+
+
+def parse_date(value):
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _name_key(*parts):
+    return " ".join(" ".join(str(p) for p in parts).lower().split())
+
+
+def _missing_columns(required, row):
+    return [c for c in required if c not in row]
+
+
+def import_dancers(club, upload):
+    """
+    Add the roster in `upload` to `club`. Dancers the club already has (same
+    name and date of birth) are skipped; any invalid row blocks the whole import.
+    """
+    report = ImportReport()
+    existing = {
+        _name_key(first, last, dob.isoformat())
+        for first, last, dob in Dancer.objects.filter(club=club).values_list(
+            "first_name", "last_name", "date_of_birth"
+        )
+    }
+    today = date.today()
+    max_name = Dancer._meta.get_field("first_name").max_length
+    new_dancers = []
+
+    for number, row in iter_rows(upload):
+        report.rows += 1
+        missing = _missing_columns(DANCER_COLUMNS, row)
+        if missing:
+            raise SheetError(_("Missing column(s): %(columns)s") % {"columns": ", ".join(missing)})
+
+        first, last = str(row["first_name"]), str(row["last_name"])
+        dob = parse_date(row["date_of_birth"])
+        problems = []
+        if not first:
+            problems.append(_("first name is missing"))
+        if not last:
+            problems.append(_("last name is missing"))
+        if len(first) > max_name or len(last) > max_name:
+            problems.append(_("names are limited to %(max)d characters") % {"max": max_name})
+        if dob is None:
+            problems.append(_("date of birth is missing or not a date (use YYYY-MM-DD or DD.MM.YYYY)"))
+        elif dob > today:
+            problems.append(_("date of birth is in the future"))
+        if problems:
+            report.error(number, problems)
+            continue
+
+        key = _name_key(first, last, dob.isoformat())
+        if key in existing:
+            report.skipped += 1
+            continue
+        existing.add(key)
+        new_dancers.append(Dancer(first_name=first, last_name=last, date_of_birth=dob, club=club))
+
+    if not report.errors:
+        with write_transaction():
+            Dancer.objects.bulk_create(new_dancers, batch_size=BATCH_SIZE)
+        report.created = len(new_dancers)
+    return report
+
+
+class _MusicLookup:
+    """Uploaded MP3s by file name; each file's duration is read once."""
+
+    def __init__(self, files):
+        self.files = {os.path.basename(f.name).lower(): f for f in files}
+        self._durations = {}
+
+    def check(self, name, group_type):
+        """(upload, problem) for the file a row names."""
+        upload = self.files.get(os.path.basename(name).lower())
+        if upload is None:
+            return None, _("music file %(name)s was not uploaded") % {"name": name}
+        if not upload.name.lower().endswith(".mp3"):
+            return None, _("only MP3 files are supported")
+
+        key = upload.name.lower()
+        if key not in self._durations:
+            from mutagen.mp3 import MP3  # only entry imports with music read audio headers
+
+            try:
+                upload.seek(0)
+                self._durations[key] = MP3(upload.file).info.length
+            except Exception:
+                self._durations[key] = None
+        duration = self._durations[key]
+        if duration is None:
+            return None, _("%(name)s is not a readable MP3 file") % {"name": upload.name}
+
+        limit = MUSIC_DURATION_LIMITS.get(group_type)
+        if limit and duration > limit:
+            return None, _(
+                "%(name)s is too long for %(group_type)s: max %(max)s, file is %(length)s"
+            ) % {
+                "name": upload.name,
+                "group_type": group_type,
+                "max": f"{limit // 60}:{limit % 60:02d}",
+                "length": f"{int(duration // 60)}:{int(duration % 60):02d}",
+            }
+        return upload, None
+
+
+def import_participations(event, club, upload, music_files=()):
+    """
+    Register the entries in `upload` for `club` at `event`. Styles, dancers and
+    choices are looked up once up front; group sizes and music are validated per
+    row and, if every row passes, entries and dancer links are bulk-created in
+    one transaction. The age group is assigned as register_dancer does.
+    """
+    report = ImportReport()
+    styles = {
+        _name_key(style.name): style
+        for style in StyleCategory.objects.filter(event=event)
+    }
+    club_dancers = list(Dancer.objects.filter(club=club))
+    dancers_by_id = {str(d.id): d for d in club_dancers}
+    dancers_by_name = defaultdict(list)
+    for dancer in club_dancers:
+        dancers_by_name[_name_key(dancer.first_name, dancer.last_name)].append(dancer)
+    group_types = {key.lower(): key for key, _label in Participation.CHOREO_TYPE_CHOICES}
+    difficulties = {key.lower(): key for key, _label in Participation.DIFFICULTY_CHOICES}
+    music = _MusicLookup(music_files)
+    music_open = event.music_open
+    max_lengths = {
+        column: Participation._meta.get_field(column).max_length
+        for column in ("choreographer_name", "choreography_name", "group_name")
+    }
+
+    entries = []  # (participation, crew, music upload or None)
+    for number, row in iter_rows(upload):
+        report.rows += 1
+        missing = _missing_columns(
+            [c for c in PARTICIPATION_COLUMNS if c not in ("group_name", "music_file")], row
+        )
+        if missing:
+            raise SheetError(_("Missing column(s): %(columns)s") % {"columns": ", ".join(missing)})
+
+        problems = []
+        style = styles.get(_name_key(row["style"]))
+        if style is None:
+            problems.append(_("unknown style %(style)s") % {"style": row["style"]})
+        group_type = group_types.get(str(row["group_type"]).lower())
+        if group_type is None:
+            problems.append(_("unknown group type %(group_type)s") % {"group_type": row["group_type"]})
+        difficulty = difficulties.get(str(row["difficulty"]).lower())
+        if difficulty is None:
+            problems.append(_("unknown difficulty %(difficulty)s") % {"difficulty": row["difficulty"]})
+        for column in ("choreographer_name", "choreography_name"):
+            if not row[column]:
+                problems.append(_("%(column)s is missing") % {"column": column})
+        group_name = str(row.get("group_name", ""))
+        if group_type in GROUP_NAME_REQUIRED and not group_name:
+            problems.append(_("group name is required for groups of 4 or more dancers"))
+        for column, max_length in max_lengths.items():
+            if len(str(row.get(column, ""))) > max_length:
+                problems.append(_("%(column)s is limited to %(max)d characters") % {
+                    "column": column, "max": max_length,
+                })
+
+        crew = []
+        for token in re.split(r"[;\n]", str(row["dancers"])):
+            token = token.strip()
+            if not token:
+                continue
+            if token.isdigit():
+                dancer = dancers_by_id.get(token)
+                if dancer is None:
+                    problems.append(_("dancer #%(id)s is not in your club") % {"id": token})
+                    continue
+            else:
+                matches = dancers_by_name.get(_name_key(token), [])
+                if not matches:
+                    problems.append(_("dancer %(name)s is not in your club") % {"name": token})
+                    continue
+                if len(matches) > 1:
+                    problems.append(_("%(name)s matches several dancers; use the dancer ID") % {"name": token})
+                    continue
+                dancer = matches[0]
+            if dancer not in crew:
+                crew.append(dancer)
+
+        if group_type in GROUP_DANCER_LIMITS:
+            min_required, max_required = GROUP_DANCER_LIMITS[group_type]
+            if not (min_required <= len(crew) <= max_required):
+                problems.append(
+                    _("%(group_type)s requires between %(min)d and %(max)d dancers, got %(count)d") % {
+                        "group_type": group_type, "min": min_required, "max": max_required, "count": len(crew),
+                    }
+                )
+
+        music_upload = None
+        music_name = str(row.get("music_file", ""))
+        if music_name and group_type:
+            if not music_open:
+                report.warnings.append((number, _("music not saved: the upload period is closed")))
+            else:
+                music_upload, problem = music.check(music_name, group_type)
+                if problem:
+                    problems.append(problem)
+
+        if problems:
+            report.error(number, problems)
+            continue
+
+        if group_type == "Production":
+            age_group = "Mixed Age"
+        else:
+            age_group, _avg_age = calculate_age_group(crew)
+        entries.append((
+            Participation(
+                event=event,
+                club=club,
+                style=style,
+                group_type=group_type,
+                age_group=age_group,
+                difficulty=difficulty,
+                choreographer_name=row["choreographer_name"],
+                choreography_name=row["choreography_name"],
+                group_name=group_name or None,
+            ),
+            crew,
+            music_upload,
+        ))
+
+    if report.errors:
+        return report
+
+    saved_files = []
+    try:
+        with write_transaction():
+            for participation, _crew, music_upload in entries:
+                if music_upload is not None:
+                    music_upload.seek(0)
+                    participation.music_file.save(os.path.basename(music_upload.name), music_upload, save=False)
+                    saved_files.append(participation.music_file.name)
+            Participation.objects.bulk_create([p for p, _crew, _m in entries], batch_size=BATCH_SIZE)
+            DancerParticipation.objects.bulk_create(
+                [
+                    DancerParticipation(participation=participation, dancer=dancer)
+                    for participation, crew, _m in entries
+                    for dancer in crew
+                ],
+                batch_size=BATCH_SIZE,
+            )
+    except Exception:
+        storage = Participation._meta.get_field("music_file").storage
+        for name in saved_files:
+            storage.delete(name)
+        raise
+
+    report.created = len(entries)
+    return report
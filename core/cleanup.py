@@ -0,0 +1,115 @@
+import logging
+
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_delete, pre_delete
+
+from .db import write_transaction
+from .models import (
+    DancerParticipation, Diploma, Event, EventPlaybackState, EventRegistration,
+    JudgeLoginToken, JudgeScore, Participation, PendingFileDeletion,
+    StartListSlot, StyleCategory,
+)
+from .snapshots import snapshot_file_names
+
+logger = logging.getLogger(__name__)
+
+# Deletion order for an event's rows, children first. Every model that points
+# at Event (directly or through these) must be listed for the fast path to run.
+EVENT_TEARDOWN = [
+    (JudgeScore, "participation__event"),
+    (DancerParticipation, "participation__event"),
+    (Diploma, "event"),
+    (EventRegistration, "event"),
+    (JudgeLoginToken, "event"),
+    (EventPlaybackState, "event"),
+    (StartListSlot, "event"),
+    (Participation, "event"),
+    (EventRegistration, "style_category__event"),
+    (StyleCategory, "event"),
+]
+
+
+def _fast_delete_is_safe():
+    """
+    True when nothing but the models above references an event's rows and no
+    delete signals are connected to them, so skipping the collector loses nothing.
+    Event itself may have post_delete receivers; delete_event_fast sends that one.
+    """
+    covered = {model for model, _lookup in EVENT_TEARDOWN}
+    for model in covered | {Event}:
+        if pre_delete.has_listeners(model) or (model is not Event and post_delete.has_listeners(model)):
+            return False
+        for rel in model._meta.related_objects:
+            if rel.related_model not in covered:
+                return False
+    return True
+
+
+def event_file_names(event):
+    """
+    Stored names of every file owned by the event: music, poster, diploma
+    template, diplomas and the published results / start list snapshots.
+    """
+    names = set(
+        Participation.objects.filter(event=event)
+        .exclude(music_file="").exclude(music_file__isnull=True)
+        .values_list("music_file", flat=True)
+    )
+    names.update(Diploma.objects.filter(event=event).exclude(image="").values_list("image", flat=True))
+    for field_file in (event.notice_image, event.diploma_template):
+        if field_file:
+            names.add(field_file.name)
+
+    # Music can be shared between entries; keep files another event still uses
+    shared = set(
+        Participation.objects.exclude(event=event)
+        .filter(music_file__in=names)
+        .values_list("music_file", flat=True)
+    )
+    return sorted((names - shared) | set(snapshot_file_names(event)))
+
+
+def enqueue_file_deletions(names):
+    PendingFileDeletion.objects.bulk_create([PendingFileDeletion(name=name) for name in names])
+
+
+def delete_event_fast(event):
+    """
+    Delete an event and everything under it in one transaction, with one DELETE
+    per table instead of Django's row-loading collector when that is safe.
+    Its files are queued for purge_deleted_files rather than removed inline.
+    Returns the number of files queued.
+    """
+    with write_transaction():
+        names = event_file_names(event)
+        enqueue_file_deletions(names)
+
+        if _fast_delete_is_safe():
+            for model, lookup in EVENT_TEARDOWN:
+                # _raw_delete issues a single DELETE ... WHERE without fetching rows
+                qs = model.objects.filter(**{lookup: event})
+                qs._raw_delete(qs.db)
+            Event.objects.filter(pk=event.pk)._raw_delete(Event.objects.db)
+            post_delete.send(sender=Event, instance=event, using=Event.objects.db, origin=event)
+        else:
+            event.delete()
+    return len(names)
+
+
+def purge_pending_files(limit=500, max_attempts=5):
+    """Remove queued files from storage; returns (removed, failed)."""
+    removed = failed = 0
+    pending = PendingFileDeletion.objects.filter(attempts__lt=max_attempts).order_by("id")[:limit]
+    for item in pending:
+        try:
+            default_storage.delete(item.name)
+        except Exception as exc:
+            logger.warning("Could not delete %s: %s", item.name, exc)
+            item.attempts += 1
+            item.last_error = str(exc)[:1000]
+            item.save(update_fields=["attempts", "last_error"])
+            failed += 1
+        else:
+            item.delete()
+            removed += 1
+    return removed, failed
@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection, transaction
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    Apply settings.SQLITE_PRAGMAS to every new SQLite connection.
+    WAL lets readers run alongside the single writer, and the busy timeout
+    makes writers queue for the lock instead of raising "database is locked".
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@contextmanager
+def write_transaction(using=None):
+    """
+    transaction.atomic() for write paths. On SQLite the outermost block opens
+    with BEGIN IMMEDIATE: the write lock is taken up front, so concurrent
+    writers queue on the busy timeout instead of failing to upgrade a read
+    lock mid-transaction. Reads keep SQLite's default deferred BEGIN.
+    Works as a `with` block or a decorator.
+    """
+    conn = transaction.get_connection(using)
+    if conn.vendor != "sqlite" or conn.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    conn.ensure_connection()  # connecting resets transaction_mode from OPTIONS
+    previous = conn.transaction_mode
+    conn.transaction_mode = "IMMEDIATE"
+    try:
+        with transaction.atomic(using=using):
+            conn.transaction_mode = previous
+            yield
+    finally:
+        conn.transaction_mode = previous
+
+
+@contextmanager
+def lock_wait_timeout(milliseconds, using=None):
+    """
+    Wait at most `milliseconds` for a database lock inside the block, then raise
+    OperationalError, instead of SQLite's busy timeout or PostgreSQL's
+    unbounded wait. For writes that must not hold up the response.
+    On PostgreSQL the block runs in a transaction (SET LOCAL needs one).
+    """
+    milliseconds = int(milliseconds)
+    conn = transaction.get_connection(using)
+    if conn.vendor == "sqlite":
+        with conn.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            previous = cursor.fetchone()[0]
+            cursor.execute(f"PRAGMA busy_timeout = {milliseconds}")
+        try:
+            yield
+        finally:
+            with conn.cursor() as cursor:
+                cursor.execute(f"PRAGMA busy_timeout = {int(previous)}")
+    elif conn.vendor == "postgresql":
+        with transaction.atomic(using=using):
+            with conn.cursor() as cursor:
+                cursor.execute(f"SET LOCAL lock_timeout = {milliseconds}")
+                cursor.execute(f"SET LOCAL statement_timeout = {milliseconds}")
+            yield
+    else:
+        yield
+
+
+def statement_timeout(milliseconds=None):
+    """
+    Run the view in a transaction whose statements PostgreSQL cancels after
+    `milliseconds` (default settings.ADMIN_STATEMENT_TIMEOUT_MS), so one heavy
+    admin page cannot hold a pooled connection indefinitely.
+    Other backends run the view unchanged.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if connection.vendor != "postgresql":
+                return view_func(request, *args, **kwargs)
+            timeout = int(milliseconds or settings.ADMIN_STATEMENT_TIMEOUT_MS)
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SET LOCAL statement_timeout = {timeout}")
+                return view_func(request, *args, **kwargs)
+        return _wrapped
+    return decorator
+
+
+def read_only_transaction(view_func):
+    """
+    Run a public page inside a READ ONLY transaction on PostgreSQL: the server
+    rejects any write and can skip write bookkeeping for the request.
+    Session and message storage happen in middleware, after the transaction.
+    """
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if connection.vendor != "postgresql":
+            return view_func(request, *args, **kwargs)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION READ ONLY")
+            return view_func(request, *args, **kwargs)
+    return _wrapped
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import os
+import re
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from .db import lock_wait_timeout
+from .models import ServerErrorGroup
+from .outbox import enqueue_email
+
+logger = logging.getLogger(__name__)
+
+# Occurrences are counted in the shared cache; the group row is written at most
+# once per TOUCH_SECONDS so a burst of errors does not queue up on the database.
+# Counts are approximate: the file-based cache's incr is a read-modify-write
+# across worker processes, so simultaneous errors can overwrite each other.
+COUNT_KEY = "error-alerts:count:{}"
+TOUCH_KEY = "error-alerts:touch:{}"
+TOUCH_SECONDS = 60
+
+# Longest the 500 handler waits for the database to record a group. During a
+# "database is locked" incident the write is skipped; the count stays in the cache.
+WRITE_WAIT_MS = 200
+
+# Groups not seen for this long are no longer checked for unsent occurrences.
+ACTIVE_DAYS = 1
+
+
+def _location(tb):
+    """'file:line in function' of the innermost frame in project code."""
+    frames = traceback.extract_tb(tb)
+    if not frames:
+        return ""
+    base = str(settings.BASE_DIR)
+    ours = [f for f in frames if f.filename.startswith(base) and "site-packages" not in f.filename]
+    frame = (ours or frames)[-1]
+    filename = os.path.relpath(frame.filename, base) if ours else frame.filename
+    return f"{filename}:{frame.lineno} in {frame.name}"
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    if match is not None and match.route:
+        return "/" + match.route
+    # Unresolved URL: fold ids so /events/12/ and /events/13/ group together
+    return re.sub(r"\d+", "<n>", request.path) if request else ""
+
+
+def fingerprint(exception_type, location, path):
+    return hashlib.sha1(f"{exception_type}|{location}|{path}".encode()).hexdigest()
+
+
+def record_server_error(request, exc_info, details):
+    """
+    Count one 500 under its fingerprint. Nothing is sent here; `details`
+    (the request summary) is kept as the group's latest sample.
+    """
+    exc_type, exc, tb = exc_info
+    if exc_type is None:
+        exception_type, location = "Unknown", ""
+    else:
+        exception_type, location = f"{exc_type.__module__}.{exc_type.__qualname__}", _location(tb)
+    path = _route(request)
+    key = fingerprint(exception_type, location, path)
+
+    count_key = COUNT_KEY.format(key)
+    # add + incr rather than get + set: atomic on memcached/Redis and within one
+    # process; across processes on FileBasedCache an increment can still be lost
+    cache.add(count_key, 0, timeout=None)
+    try:
+        cache.incr(count_key)
+    except ValueError:  # evicted since the add
+        cache.add(count_key, 1, timeout=None)
+
+    if not cache.add(TOUCH_KEY.format(key), True, timeout=TOUCH_SECONDS):
+        return key
+    sample = f"{exc}\n\n{details}" if exc is not None else details
+    try:
+        with lock_wait_timeout(WRITE_WAIT_MS):
+            ServerErrorGroup.objects.update_or_create(
+                fingerprint=key,
+                defaults={"last_seen": timezone.now(), "sample": sample[:4000]},
+                create_defaults={
+                    "exception_type": exception_type[:255],
+                    "location": location[:255],
+                    "path": path[:255],
+                    "sample": sample[:4000],
+                },
+            )
+    except DatabaseError as db_exc:
+        # Let the next occurrence try again instead of waiting out this window
+        cache.delete(TOUCH_KEY.format(key))
+        logger.warning("Could not record server error group %s: %s", key, db_exc)
+    return key
+
+
+def queue_error_digests(window_minutes=None, recipient=None):
+    """
+    Queue one email per error group with occurrences not yet reported, unless
+    that group was already reported within the window. Returns how many were queued.
+    """
+    window = timedelta(minutes=settings.ERROR_ALERT_WINDOW_MINUTES if window_minutes is None else window_minutes)
+    recipient = recipient or settings.DEVELOPER_ALERT_EMAIL or settings.EMAIL_HOST_USER
+    now = timezone.now()
+
+    groups = list(
+        ServerErrorGroup.objects.filter(last_seen__gte=now - timedelta(days=ACTIVE_DAYS))
+        .exclude(last_notified_at__gt=now - window)
+    )
+    counts = cache.get_many([COUNT_KEY.format(g.fingerprint) for g in groups])
+    queued = 0
+    for group in groups:
+        count_key = COUNT_KEY.format(group.fingerprint)
+        new = counts.get(count_key) or 0
+        if not new:
+            continue
+        # Take what was read; errors counted since then wait for the next digest
+        try:
+            cache.decr(count_key, new)
+        except ValueError:  # evicted since the read
+            pass
+
+        since = group.last_notified_at or group.first_seen
+        group.occurrences += new
+        body = (
+            f"{new} server error(s) since {timezone.localtime(since):%Y-%m-%d %H:%M:%S}"
+            f" ({group.occurrences} in total, first seen {timezone.localtime(group.first_seen):%Y-%m-%d %H:%M:%S}).\n\n"
+            f"Exception: {group.exception_type}\n"
+            f"Location: {group.location}\n"
+            f"Path: {group.path}\n\n"
+            f"Latest occurrence:\n{group.sample}\n"
+        )
+        with transaction.atomic():
+            if recipient:
+                enqueue_email(f"[5678Community] Server 500 error x{new}: {group.exception_type}", body, [recipient])
+            group.notified_occurrences = group.occurrences
+            group.last_notified_at = now
+            group.save(update_fields=["occurrences", "notified_occurrences", "last_notified_at"])
+        queued += 1
+    return queued
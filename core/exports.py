@@ -0,0 +1,174 @@
+import csv
+import heapq
+import os
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from django.db.models import F, Min, Prefetch, Value, Window
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+
+from .models import DancerParticipation, JudgeScore, Participation, StartListSlot
+from .playback import get_music_duration
+from .scoring import compute_final_score
+
+# Rows fetched per database round trip, and rows joined into each response chunk.
+CHUNK_SIZE = 1000
+
+# Same fallback _build_start_list uses for entries without a display order.
+UNORDERED = 999999
+
+REGISTRATION_HEADER = [
+    "entry_id", "style", "group_type", "age_group", "difficulty", "group_name",
+    "choreography_name", "choreographer_name", "music_file",
+    "dancer_id", "first_name", "last_name", "date_of_birth", "club", "club_city",
+]
+START_LIST_HEADER = [
+    "number", "start_time", "end_time", "kind", "style", "group_type", "age_group",
+    "difficulty", "title", "choreographer_name", "group_name", "dancers", "club", "club_city",
+]
+RESULTS_HEADER = [
+    "style", "group_type", "age_group", "difficulty", "position", "final_score",
+    "entry_id", "group_name", "dancers", "club", "choreography_name", "choreographer_name",
+]
+
+
+class _Echo:
+    """csv.writer target that returns each line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_response(filename, header, rows):
+    """Stream `rows` as a UTF-8 CSV download, CHUNK_SIZE lines per chunk."""
+    writer = csv.writer(_Echo())
+
+    def content():
+        # BOM so Excel opens the file as UTF-8
+        yield "\ufeff" + writer.writerow(header)
+        chunk = []
+        for row in rows:
+            chunk.append(writer.writerow(row))
+            if len(chunk) >= CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+
+    response = StreamingHttpResponse(content(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _dancer_links():
+    return Prefetch(
+        "dancer_links",
+        queryset=DancerParticipation.objects.select_related("dancer__club").order_by("id"),
+    )
+
+
+def _names(dancers):
+    return ", ".join(f"{d.first_name} {d.last_name}" for d in dancers)
+
+
+def registration_rows(event, club=None):
+    """One row per entry and dancer; with `club`, only entries that club's dancers are in."""
+    links = DancerParticipation.objects.filter(participation__event=event)
+    if club is not None:
+        links = links.filter(
+            participation__in=Participation.objects.filter(event=event, dancer_links__dancer__club=club)
+        )
+    links = links.select_related("participation__style", "dancer__club").order_by("participation_id", "id")
+
+    for link in links.iterator(chunk_size=CHUNK_SIZE):
+        p, dancer = link.participation, link.dancer
+        yield [
+            p.id, p.style.name, p.group_type, p.age_group, p.difficulty, p.group_name or "",
+            p.choreography_name, p.choreographer_name,
+            os.path.basename(p.music_file.name) if p.music_file else "",
+            dancer.id, dancer.first_name, dancer.last_name, dancer.date_of_birth,
+            dancer.club.club_name, dancer.club.city,
+        ]
+
+
+def start_list_rows(event, is_admin=False):
+    """
+    The timed start list as start_list shows it: performances and ceremonies
+    in display order, numbered from 101, with start times from event.start_time.
+    """
+    participations = (
+        Participation.objects.filter(event=event)
+        .select_related("style")
+        .prefetch_related(_dancer_links())
+        .order_by(F("display_order").asc(nulls_last=True), "id")
+    )
+    ceremonies = StartListSlot.objects.filter(event=event).order_by(
+        F("display_order").asc(nulls_last=True), "id"
+    )
+    # Ties go to performances first, as in _build_start_list's stable sort
+    timeline = heapq.merge(
+        ((p.display_order if p.display_order is not None else UNORDERED, 0, p)
+         for p in participations.iterator(chunk_size=CHUNK_SIZE)),
+        ((c.display_order if c.display_order is not None else UNORDERED, 1, c)
+         for c in ceremonies.iterator(chunk_size=CHUNK_SIZE)),
+        key=lambda item: item[:2],
+    )
+
+    current_time = datetime.combine(datetime.today(), event.start_time) if event.start_time else None
+    number = 101
+    for _order, kind, obj in timeline:
+        start = current_time.strftime("%H:%M") if current_time else ""
+        if kind == 0:
+            dancers = [link.dancer for link in obj.dancer_links.all()]
+            club = dancers[0].club if dancers else None
+            shown = obj.group_name if not is_admin and len(dancers) > 3 and obj.group_name else _names(dancers)
+            yield [
+                number, start, "", "performance", obj.style.name, obj.group_type, obj.age_group,
+                obj.difficulty, obj.choreography_name, obj.choreographer_name, obj.group_name or "",
+                shown, club.club_name if club else "", club.city if club else "",
+            ]
+            number += 1
+            if current_time:
+                current_time += timedelta(seconds=get_music_duration(obj))
+        else:
+            end = (current_time + timedelta(minutes=obj.duration_minutes)).strftime("%H:%M") if current_time else ""
+            yield [
+                "", start, end, "ceremony", "", "", obj.age_group or "", "", obj.title, "", "", "", "", "",
+            ]
+            if current_time:
+                current_time += timedelta(minutes=obj.duration_minutes)
+
+
+def results_rows(event):
+    """
+    Ranked results per category, in start-list category order, one category
+    in memory at a time. Scores match event_awards_view.
+    """
+    category = [F("style_id"), F("group_type"), F("age_group"), F("difficulty")]
+    participations = (
+        Participation.objects.filter(event=event)
+        .select_related("style")
+        .annotate(category_order=Window(
+            Min(Coalesce("group_display_order", Value(0))), partition_by=category,
+        ))
+        .prefetch_related(_dancer_links(), Prefetch("judgescore_set", queryset=JudgeScore.objects.order_by("id")))
+        .order_by("category_order", "style__name", "group_type", "age_group", "difficulty", "id")
+    )
+
+    def category_key(p):
+        return (p.style.name, p.group_type, p.age_group, p.difficulty)
+
+    for key, entries in groupby(participations.iterator(chunk_size=CHUNK_SIZE), key=category_key):
+        scored = []
+        for p in entries:
+            score = compute_final_score(p, list(p.judgescore_set.all()), discard_extremes=event.discard_extreme_scores)
+            if score is not None:
+                scored.append((score, p, [link.dancer for link in p.dancer_links.all()]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+
+        for position, (score, p, dancers) in enumerate(scored, start=1):
+            yield [
+                *key, position, score, p.id, p.group_name or "", _names(dancers),
+                dancers[0].club.club_name if dancers else "", p.choreography_name, p.choreographer_name,
+            ]
@@ -4,10 +4,28 @@ from django_countries.fields import CountryField
 from django_countries.widgets import CountrySelectWidget
 from django.utils.translation import gettext_lazy as _
 from .models import Dancer, Event, Participation, DanceClub, StyleCategory, JudgeScore, StartListSlot
-from mutagen.mp3 import MP3
 from django.contrib.auth.forms import AuthenticationForm
 from django.core.exceptions import ValidationError
 
+# (min, max) dancers per group type
+GROUP_DANCER_LIMITS = {
+    'Solo': (1, 1),
+    'Duo': (2, 2),
+    'Trio': (3, 3),
+    'Group': (4, 9),
+    'Formation': (10, 29),
+    'Production': (30, 200),
+}
+
+# Longest accepted music (seconds) per group type; Production has no limit
+MUSIC_DURATION_LIMITS = {
+    "Solo": 135,
+    "Duo": 135,
+    "Trio": 135,
+    "Group": 180,
+    "Formation": 240,
+}
+
 
 class DancerForm(forms.ModelForm):
     date_of_birth = forms.DateField(
@@ -244,17 +262,8 @@ class GroupParticipationForm(forms.Form):
         dancers = [d for d in dancers if getattr(d, "id", None)]  # drop None/empty
         cleaned_data["dancers"] = dancers
 
-        limits = {
-            'Solo': (1, 1),
-            'Duo': (2, 2),
-            'Trio': (3, 3),
-            'Group': (4, 9),
-            'Formation': (10, 29),
-            'Production': (30, 200),
-        }
-
-        if group_type in limits:
-            min_required, max_required = limits[group_type]
+        if group_type in GROUP_DANCER_LIMITS:
+            min_required, max_required = GROUP_DANCER_LIMITS[group_type]
             if not (min_required <= len(dancers) <= max_required):
                 raise forms.ValidationError(
                     f"{group_type} requires between {min_required} and {max_required} dancers. "
@@ -277,6 +286,8 @@ class GroupParticipationForm(forms.Form):
         if not music_file.name.lower().endswith(".mp3"):
             raise forms.ValidationError(_("Only MP3 files are supported."))
 
+        from mutagen.mp3 import MP3  # only uploads read audio headers
+
         try:
             music_file.seek(0)
             audio = MP3(music_file.file)
@@ -284,15 +295,7 @@ class GroupParticipationForm(forms.Form):
         except Exception:
             raise forms.ValidationError(_("Failed to process the uploaded MP3 file."))
 
-        limits = {
-            "Solo": 135,
-            "Duo": 135,
-            "Trio": 135,
-            "Group": 180,
-            "Formation": 240,
-        }
-
-        limit = limits.get(group_type)
+        limit = MUSIC_DURATION_LIMITS.get(group_type)
         if limit and duration > limit:
             raise forms.ValidationError(
                 _(f"File too long for {group_type}. Max is {limit // 60}:{limit % 60:02d}, "
@@ -302,6 +305,36 @@ class GroupParticipationForm(forms.Form):
         return music_file
 
 
+class MultipleFileInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+
+class MultipleFileField(forms.FileField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("widget", MultipleFileInput())
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        if isinstance(data, (list, tuple)):
+            return [super(MultipleFileField, self).clean(d, initial) for d in data]
+        return [super().clean(data, initial)] if data else []
+
+
+class DancerImportForm(forms.Form):
+    sheet = forms.FileField(
+        label=_("CSV or XLSX file"),
+        widget=forms.ClearableFileInput(attrs={'accept': '.csv,.xlsx'}),
+    )
+
+
+class ParticipationImportForm(DancerImportForm):
+    music_files = MultipleFileField(
+        required=False,
+        label=_("MP3 files named in the music_file column"),
+        widget=MultipleFileInput(attrs={'accept': '.mp3'}),
+    )
+
+
 class SingleJudgeForm(forms.Form):
     first_name = forms.CharField(max_length=50, label=_("First Name"))
     last_name = forms.CharField(max_length=50, label=_("Last Name"))
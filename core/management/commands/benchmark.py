@@ -0,0 +1,183 @@
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, time as dt_time, timedelta
+from decimal import Decimal
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from PIL import Image
+
+from core.models import (
+    DanceClub, Dancer, Event, JudgeScore, Participation, StartListSlot, StyleCategory,
+)
+from core.age_groups import calculate_age_group
+from core.scoring import compute_final_score
+from core.views.diplomas import _diploma_fonts, _ordinal, _render_diploma
+from core.start_list import AGE_GROUP_ORDER, GROUP_TYPE_ORDER, STYLE_ORDER, default_start_list_order
+from core.views.start_list import _build_start_list
+
+# A4 at 150 dpi, the size of the diploma templates in use.
+DIPLOMA_SIZE = (1240, 1754)
+
+
+class Fixture:
+    """
+    Unsaved model instances for one synthetic event. Nothing touches the
+    database, so timings cover the Python hot paths only and repeat exactly.
+    """
+
+    def __init__(self, entries, dancers, judges, seed):
+        rng = random.Random(seed)
+        self.event = Event(id=1, name="Benchmark", city="Novi Sad", location="Spens",
+                           date=date(2030, 1, 1), start_time=dt_time(9, 0), discard_extreme_scores=True)
+        styles = [StyleCategory(id=i, event=self.event, name=name) for i, name in enumerate(STYLE_ORDER, 1)]
+        club = DanceClub(id=1, club_name="Bench Club", city="Novi Sad")
+
+        today = timezone.localdate()
+        self.dancers = [
+            Dancer(id=i, first_name=f"Dancer{i}", last_name=f"L{i}", club=club,
+                   date_of_birth=today - timedelta(days=rng.randint(5 * 365, 40 * 365)))
+            for i in range(1, dancers + 1)
+        ]
+
+        self.participations = []
+        self.dancer_map = defaultdict(list)
+        for n in range(1, entries + 1):
+            p = Participation(
+                id=n, event=self.event, style=rng.choice(styles),
+                group_type=rng.choice(GROUP_TYPE_ORDER[:4]), age_group=rng.choice(AGE_GROUP_ORDER),
+                difficulty=rng.choice("AB"), choreographer_name=f"Choreo {n}",
+                choreography_name=f"Routine {n}", group_name=f"Crew {n}", display_order=n,
+            )
+            self.participations.append(p)
+            self.dancer_map[p.id] = rng.sample(self.dancers, rng.randint(1, 6))
+
+        self.ceremonies = [
+            StartListSlot(id=i, event=self.event, title=f"Ceremony {i}", duration_minutes=15,
+                          display_order=i * entries // 4, is_ceremony=True)
+            for i in range(1, 4)
+        ]
+
+        self.scores = defaultdict(list)
+        for p in self.participations:
+            for j in range(judges):
+                self.scores[p.id].append(JudgeScore(
+                    participation=p,
+                    technique=Decimal(rng.randint(50, 100)) / 10,
+                    composition=Decimal(rng.randint(50, 100)) / 10,
+                    image=Decimal(rng.randint(50, 100)) / 10,
+                    show_value=Decimal(rng.randint(50, 100)) / 10 if p.style.name == "Show Dance" else None,
+                ))
+
+
+def bench_final_scores(fx):
+    for p in fx.participations:
+        compute_final_score(p, fx.scores[p.id], discard_extremes=fx.event.discard_extreme_scores)
+
+
+def bench_timeline(fx):
+    _build_start_list(fx.event, fx.participations, fx.ceremonies, fx.dancer_map, is_admin=False)
+
+
+def bench_age_groups(fx):
+    for p in fx.participations:
+        calculate_age_group(fx.dancer_map[p.id])
+    calculate_age_group(fx.dancers)
+
+
+def bench_default_order(fx):
+    default_start_list_order(fx.participations)
+
+
+class DiplomaBench:
+    """Per-diploma rendering on a blank template, as generate_diploma draws it."""
+
+    def __init__(self):
+        self.template = Image.new("RGBA", DIPLOMA_SIZE, "white")
+        self.fonts = _diploma_fonts(DIPLOMA_SIZE[1])
+
+    def __call__(self, fx):
+        p = fx.participations[0]
+        dancer = fx.dancer_map[p.id][0]
+        _render_diploma(self.template, [
+            f"{_ordinal(1)} Place",
+            " – ".join([p.style.name, p.group_type, p.age_group, p.difficulty]),
+            p.group_name,
+            f"{dancer.first_name} {dancer.last_name}",
+            dancer.club.club_name,
+            p.choreography_name,
+        ], self.fonts)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the scoring, start-list, age-group and diploma hot paths on a "
+        "synthetic event and print the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=1000, help="Participations in the synthetic event")
+        parser.add_argument('--dancers', type=int, default=5000, help="Dancers in the synthetic event")
+        parser.add_argument('--judges', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=7, help="Timed rounds per benchmark")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--only', action='append', help="Run only this benchmark (repeatable)")
+        parser.add_argument('--output', help="Write the JSON here instead of stdout")
+
+    def handle(self, *args, **options):
+        benchmarks = {
+            "compute_final_score_event": (bench_final_scores, options['entries']),
+            "start_list_timeline": (bench_timeline, options['entries']),
+            "calculate_age_group": (bench_age_groups, options['entries'] + 1),
+            "publish_start_list_default_order": (bench_default_order, options['entries']),
+            "diploma_render": (DiplomaBench(), 1),
+        }
+        selected = options['only'] or list(benchmarks)
+        unknown = set(selected) - set(benchmarks)
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+        fx = Fixture(options['entries'], options['dancers'], options['judges'], options['seed'])
+
+        results = {}
+        for name in selected:
+            func, ops = benchmarks[name]
+            func(fx)  # warm-up: imports, font caches, lazy attributes
+            rounds = []
+            for _round in range(options['repeat']):
+                started = time.perf_counter()
+                func(fx)
+                rounds.append(time.perf_counter() - started)
+            results[name] = {
+                "ops_per_round": ops,
+                "rounds": len(rounds),
+                "min_s": min(rounds),
+                "median_s": statistics.median(rounds),
+                "mean_s": statistics.fmean(rounds),
+                "stdev_s": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+                "per_op_us": statistics.median(rounds) / ops * 1e6,
+            }
+
+        report = {
+            "timestamp": timezone.now().isoformat(),
+            "machine": {
+                "python": sys.version.split()[0],
+                "django": django.get_version(),
+                "platform": platform.platform(),
+            },
+            "params": {k: options[k] for k in ("entries", "dancers", "judges", "repeat", "seed")},
+            "benchmarks": results,
+        }
+        payload = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], "w", encoding="utf-8") as fh:
+                fh.write(payload + "\n")
+            self.stdout.write(self.style.SUCCESS(f"✅ Wrote {len(results)} benchmark(s) to {options['output']}"))
+        else:
+            self.stdout.write(payload)
@@ -0,0 +1,106 @@
+import json
+import shutil
+import subprocess
+from datetime import date
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from core.age_groups import age_groups_on, calculate_age_group
+from core.models import Dancer
+
+VECTORS_PATH = Path(__file__).resolve().parents[2] / "age_group_vectors.json"
+
+# Runs the browser copy over the vectors and prints its results as JSON.
+NODE_RUNNER = """
+const api = require(process.argv[1]);
+const cases = JSON.parse(require('fs').readFileSync(0, 'utf8')).cases;
+process.stdout.write(JSON.stringify(cases.map(c => api.calculate(c.birth_dates, c.on, c.group_type))));
+"""
+
+
+def python_result(case):
+    """Age group as the registration views assign it on submit."""
+    if case["group_type"] == "Production":
+        return "Mixed Age", None
+    dancers = [
+        Dancer(date_of_birth=date.fromisoformat(dob) if dob else None)
+        for dob in case["birth_dates"]
+    ]
+    return calculate_age_group(dancers, on=date.fromisoformat(case["on"]))
+
+
+def load_cases():
+    return json.loads(VECTORS_PATH.read_text(encoding="utf-8"))["cases"]
+
+
+def python_mismatches(cases):
+    failures = []
+    for case in cases:
+        got = python_result(case)
+        if got != (case["age_group"], case["avg_age"]):
+            failures.append(f"python: {case['name']}: expected {case['age_group']}/{case['avg_age']}, got {got[0]}/{got[1]}")
+    return failures
+
+
+def bulk_mismatches(cases):
+    """Bulk path: only entries with dated dancers, Productions are never recomputed."""
+    failures = []
+    for case in cases:
+        dates = [date.fromisoformat(dob) for dob in case["birth_dates"] if dob]
+        if case["group_type"] == "Production" or not dates:
+            continue
+        got = age_groups_on([0] * len(dates), dates, date.fromisoformat(case["on"]))[0]
+        if got != (case["age_group"], case["avg_age"]):
+            failures.append(f"bulk: {case['name']}: expected {case['age_group']}/{case['avg_age']}, got {got[0]}/{got[1]}")
+    return failures
+
+
+def js_mismatches(cases, node):
+    """Runs static/js/age_groups.js under `node`; raises CommandError if it cannot run."""
+    script = finders.find("js/age_groups.js")
+    if not script:
+        raise CommandError("js/age_groups.js not found in static files.")
+    proc = subprocess.run(
+        [node, "-e", NODE_RUNNER, script],
+        input=json.dumps({"cases": cases}), capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise CommandError(f"node failed: {proc.stderr.strip()}")
+    failures = []
+    for case, got in zip(cases, json.loads(proc.stdout)):
+        if (got["ageGroup"], got["avgAge"]) != (case["age_group"], case["avg_age"]):
+            failures.append(
+                f"js: {case['name']}: expected {case['age_group']}/{case['avg_age']}, "
+                f"got {got['ageGroup']}/{got['avgAge']}"
+            )
+    return failures
+
+
+class Command(BaseCommand):
+    help = (
+        "Check calculate_age_group, the bulk age_groups_on and static/js/age_groups.js "
+        "against the shared vectors in core/age_group_vectors.json so they all agree."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--node', default=shutil.which("node"), help="Node.js binary for the browser copy")
+        parser.add_argument('--skip-js', action='store_true', help="Only check the Python implementation")
+
+    def handle(self, *args, **options):
+        cases = load_cases()
+        failures = python_mismatches(cases) + bulk_mismatches(cases)
+
+        if options['skip_js']:
+            self.stdout.write(self.style.WARNING("Skipping the JavaScript check."))
+        elif not options['node']:
+            raise CommandError("Node.js not found; pass --node or --skip-js.")
+        else:
+            failures += js_mismatches(cases, options['node'])
+
+        for failure in failures:
+            self.stdout.write(self.style.ERROR(failure))
+        if failures:
+            raise CommandError(f"{len(failures)} age-group mismatch(es).")
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(cases)} age-group vectors agree."))
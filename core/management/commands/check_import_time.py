@@ -0,0 +1,79 @@
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a gunicorn worker imports before it can answer its first request.
+STARTUP_SCRIPT = """
+import os, sys
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dance_portal.settings")
+from dance_portal.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(" ".join(sorted(sys.modules)))
+"""
+
+# Only the views (or commands) that need these may import them.
+LAZY_MODULES = ["PIL", "mutagen", "openpyxl", "numpy", "pandas", "sklearn", "matplotlib", "seaborn"]
+
+IMPORT_LINE = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \|( +)(\S+)$")
+
+
+def measure_startup():
+    """(total_us, {package: self_us}, loaded module names) for one fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise CommandError(f"Start-up script failed:\n{proc.stderr.strip()[-2000:]}")
+
+    total = 0
+    packages = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        packages[name.split(".")[0]] += int(self_us)
+        # One space of indent marks an import nobody else triggered
+        if len(indent) == 1:
+            total += int(cumulative_us)
+    loaded = set(proc.stdout.split())
+    return total, packages, loaded
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure web worker start-up imports with `python -X importtime` and fail when they "
+        "exceed the budget or pull in a library that should be imported lazily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=400, help="Largest acceptable import time")
+        parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters to time; the fastest counts")
+        parser.add_argument('--top', type=int, default=10, help="Heaviest packages to list")
+
+    def handle(self, *args, **options):
+        runs = [measure_startup() for _ in range(max(options['runs'], 1))]
+        total, packages, loaded = min(runs, key=lambda run: run[0])
+
+        self.stdout.write(f"Heaviest packages by own import time (fastest of {len(runs)} runs):")
+        for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {us / 1000:8.1f} ms  {name}")
+
+        problems = []
+        eager = [name for name in LAZY_MODULES if name in loaded]
+        if eager:
+            problems.append(f"imported at start-up but should be lazy: {', '.join(eager)}")
+        if total / 1000 > options['budget_ms']:
+            problems.append(f"start-up imports took {total / 1000:.1f} ms, budget is {options['budget_ms']:.0f} ms")
+        if problems:
+            raise CommandError("; ".join(problems))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Start-up imports took {total / 1000:.1f} ms (budget {options['budget_ms']:.0f} ms)."
+        ))
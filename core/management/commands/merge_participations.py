@@ -1,39 +1,109 @@
-from django.core.management.base import BaseCommand
 from collections import defaultdict
-from core.models import Participation, DancerParticipation
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Event, Participation, DancerParticipation
+from core.playback import invalidate_music_index
+
+
+def duplicate_pairs(event_ids):
+    """
+    (duplicate_id, primary_id, event_id) for every Participation that repeats an
+    earlier one in the same event, style, group type, age group, difficulty and
+    choreographer (trimmed, case-insensitive). The oldest entry is the primary.
+    The name is folded in Python: SQLite's LOWER() and TRIM() only handle ASCII
+    case and spaces, so "Ana Čolić" and "ana čolić" would not match in SQL.
+    """
+    rows = (
+        Participation.objects.filter(event_id__in=event_ids)
+        .order_by("id")
+        .values_list("id", "event_id", "style_id", "group_type", "age_group", "difficulty", "choreographer_name")
+    )
+    primary_of_key = {}
+    pairs = []
+    for participation_id, event_id, *category, choreographer in rows.iterator(chunk_size=2000):
+        key = (event_id, *category, (choreographer or "").strip().casefold())
+        primary_id = primary_of_key.setdefault(key, participation_id)
+        if primary_id != participation_id:
+            pairs.append((participation_id, primary_id, event_id))
+    return pairs
+
 
 class Command(BaseCommand):
     help = "Merge duplicate Participation entries into grouped participations using DancerParticipation"
 
-    def handle(self, *args, **kwargs):
-        grouped = defaultdict(list)
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, action='append', dest='events',
+                            help="Only merge this event (repeatable); default is every event")
+        parser.add_argument('--dry-run', action='store_true', help="Report what would be merged without writing")
+        parser.add_argument('--chunk-size', type=int, default=20, help="Events per transaction")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Duplicates per link copy and delete")
 
-        for p in Participation.objects.all():
-            key = (
-                p.event_id,
-                p.style_id,
-                p.group_type,
-                p.age_group,
-                p.difficulty,
-                p.choreographer_name.strip().lower() if p.choreographer_name else '',
-            )
-            grouped[key].append(p)
+    def handle(self, *args, **options):
+        event_ids = options['events'] or list(Event.objects.order_by("id").values_list("id", flat=True))
+        dry_run = options['dry_run']
+        chunk_size = options['chunk_size']
 
         merged_count = 0
+        moved_links = 0
+        for start in range(0, len(event_ids), chunk_size):
+            chunk = event_ids[start:start + chunk_size]
+            with transaction.atomic():
+                pairs = list(duplicate_pairs(chunk))
+                if not pairs:
+                    continue
+
+                per_event = defaultdict(int)
+                for _dup_id, _primary_id, event_id in pairs:
+                    per_event[event_id] += 1
+                for event_id, count in sorted(per_event.items()):
+                    verb = "Would merge" if dry_run else "Merging"
+                    self.stdout.write(f"{verb} {count} duplicate(s) in event #{event_id}")
+
+                for batch_start in range(0, len(pairs), options['batch_size']):
+                    batch = pairs[batch_start:batch_start + options['batch_size']]
+                    moved_links += self._merge_batch(batch, dry_run)
+                    merged_count += len(batch)
+
+                if not dry_run:
+                    for event_id in per_event:
+                        transaction.on_commit(lambda eid=event_id: invalidate_music_index(eid))
 
-        for key, parts in grouped.items():
-            if len(parts) < 2:
-                continue
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f"Dry run: {merged_count} duplicate Participation objects would be merged, "
+                f"{moved_links} dancer links moved."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Merged and removed {merged_count} duplicate Participation objects "
+                f"({moved_links} dancer links moved)."
+            ))
 
-            primary = parts[0]
-            duplicates = parts[1:]
+    def _merge_batch(self, batch, dry_run):
+        """Copy the duplicates' dancers onto their primaries, then delete the duplicates."""
+        primary_of = {dup_id: primary_id for dup_id, primary_id, _event_id in batch}
+        ids = set(primary_of) | set(primary_of.values())
 
-            for dup in duplicates:
-                dps = DancerParticipation.objects.filter(participation=dup)
-                for dp in dps:
-                    DancerParticipation.objects.get_or_create(participation=primary, dancer=dp.dancer)
+        # DancerParticipation has no unique constraint, so skip links the primary already has
+        existing = set()
+        dup_links = []
+        for participation_id, dancer_id in DancerParticipation.objects.filter(
+            participation_id__in=ids
+        ).values_list("participation_id", "dancer_id"):
+            if participation_id in primary_of:
+                dup_links.append((primary_of[participation_id], dancer_id))
+            else:
+                existing.add((participation_id, dancer_id))
 
-                dup.delete()
-                merged_count += 1
+        new_links = []
+        for link in dup_links:
+            if link not in existing:
+                existing.add(link)
+                new_links.append(DancerParticipation(participation_id=link[0], dancer_id=link[1]))
 
-        self.stdout.write(self.style.SUCCESS(f"Merged and removed {merged_count} duplicate Participation objects."))
+        if not dry_run:
+            DancerParticipation.objects.bulk_create(new_links)
+            Participation.objects.filter(id__in=list(primary_of)).delete()
+        return len(new_links)
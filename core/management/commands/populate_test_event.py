@@ -1,102 +1,163 @@
-from django.core.management.base import BaseCommand
+import random
+import time
+from datetime import date, time as dt_time, timedelta
+
 from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
 from core.models import (
-    Event, DanceClub, Dancer, StyleCategory,
+    Event, DanceClub, Dancer, StyleCategory, StartListSlot,
     Participation, DancerParticipation, JudgeScore
 )
-from datetime import date
-import random
+from core.forms import GROUP_DANCER_LIMITS
+from core.playback import invalidate_music_index
+from core.start_list import default_start_list_order
+
+STYLES = ["Hip Hop", "Jazz", "Ballet", "Show Dance", "Contemporary", "Disco"]
+
+# Productions are always Mixed Age and far larger than a test club; not generated
+GROUP_TYPES = [group_type for group_type in GROUP_DANCER_LIMITS if group_type != "Production"]
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding: 417-byte frames of 1152 samples.
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + b"\x00" * 413
+MP3_FRAME_SECONDS = 1152 / 44100
+
+
+def synthetic_mp3(seconds):
+    """Silent CBR MP3 that mutagen reads as `seconds` long."""
+    return MP3_FRAME * int(seconds / MP3_FRAME_SECONDS)
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class Command(BaseCommand):
-    help = "Populate a test event with 100-200 random participations and judges with scores."
+    help = (
+        "Populate a test event with clubs, dancers, participations, judges, scores, "
+        "ceremonies and optional synthetic music, using bulk inserts."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument('--entries', type=int, default=150, help="Number of participations to create")
+        parser.add_argument('--clubs', type=int, default=5, help="Number of clubs")
+        parser.add_argument('--dancers', type=int, default=60, help="Dancers per club")
+        parser.add_argument('--judges', type=int, default=5, help="Judge accounts (judge_<event>_j<n>)")
+        parser.add_argument('--categories', type=int, default=0,
+                            help="Distinct style/group/age/difficulty categories to use (0 = weighted mix of all)")
+        parser.add_argument('--ceremonies', type=int, default=0, help="Ceremony slots spread through the start list")
+        parser.add_argument('--mp3', type=int, default=0,
+                            help="Synthetic MP3 files (1:30–4:00) shared round-robin across entries")
+        parser.add_argument('--no-scores', action='store_true', help="Create judges but leave scoring empty")
+        parser.add_argument('--seed', type=int, default=None, help="Seed for a reproducible dataset")
+        parser.add_argument('--batch-size', type=int, default=2000, help="Rows per bulk insert and transaction")
+        parser.add_argument('--name', default="Test Event", help="Event name")
 
     def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
         num_entries = options['entries']
+        if options['clubs'] < 1 or options['dancers'] < 1:
+            raise CommandError("Need at least one club with one dancer.")
+        started = time.perf_counter()
+
+        # --- Event and style categories ---
+        with transaction.atomic():
+            event = Event.objects.create(
+                name=options['name'],
+                city="Stockholm",
+                location="Sports Hall",
+                date=date.today(),
+                start_time=dt_time(9, 0),
+                is_published=True,
+            )
+            style_objs = StyleCategory.objects.bulk_create([
+                StyleCategory(event=event, name=s) for s in STYLES
+            ])
+
+        # --- Clubs with their dancers ---
+        tag = f"{event.id}-{options['seed'] if options['seed'] is not None else 'r'}"
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f"testclub{tag}-{i}@example.com", email=f"testclub{tag}-{i}@example.com")
+                for i in range(options['clubs'])
+            ])
+            clubs = DanceClub.objects.bulk_create([
+                DanceClub(
+                    user=user,
+                    club_name=f"Test Club {i + 1}",
+                    country="SE",
+                    city="Stockholm",
+                    phone_number="123456",
+                    representative_name="Test Rep",
+                    confirmed=True,
+                )
+                for i, user in enumerate(users)
+            ])
 
-        # --- Create or get test club ---
-        user, _ = User.objects.get_or_create(
-            username="testclub@example.com",
-            defaults={"email": "testclub@example.com"}
-        )
-        club, _ = DanceClub.objects.get_or_create(user=user, defaults={
-            "club_name": "Test Club",
-            "country": "SE",
-            "city": "Stockholm",
-            "phone_number": "123456",
-            "representative_name": "Test Rep",
-            "confirmed": True,
-        })
-
-        # --- Create or get test event ---
-        event, _ = Event.objects.get_or_create(
-            name="Test Event",
-            city="Stockholm",
-            location="Sports Hall",
-            date=date.today(),
-        )
-
-        # --- Ensure style categories ---
-        styles = ["Hip Hop", "Jazz", "Ballet", "Show Dance", "Contemporary", "Disco"]
-        style_objs = []
-        for s in styles:
-            sc, _ = StyleCategory.objects.get_or_create(event=event, name=s)
-            style_objs.append(sc)
-
-        # --- Create dancers for the club ---
-        dancers = []
-        for i in range(60):
-            dancer, _ = Dancer.objects.get_or_create(
-                first_name=f"Dancer{i}",
+        today = date.today()
+        dancers = [
+            Dancer(
+                first_name=f"Dancer{c}-{i}",
                 last_name="Test",
-                date_of_birth=date(2005, 1, (i % 28) + 1),
-                club=club
+                date_of_birth=today - timedelta(days=rng.randint(5 * 365, 40 * 365)),
+                club=club,
             )
-            dancers.append(dancer)
-
-        # --- Group limits ---
-        group_limits = {
-            "Solo": (1, 1),
-            "Duo": (2, 2),
-            "Trio": (3, 3),
-            "Group": (4, 9),
-            "Formation": (10, 20),
-        }
-
-        # --- Weighted category pool ---
+            for c, club in enumerate(clubs)
+            for i in range(options['dancers'])
+        ]
+        for batch in chunked(dancers, batch_size):
+            with transaction.atomic():
+                Dancer.objects.bulk_create(batch)
+        dancers_by_club = [dancers[c * options['dancers']:(c + 1) * options['dancers']] for c in range(len(clubs))]
+
+        # --- Category pool ---
         age_groups = [c for c, _ in Participation.AGE_GROUP_CHOICES]
         difficulties = [c for c, _ in Participation.DIFFICULTY_CHOICES]
+        all_categories = [
+            (style, group_type, age, diff)
+            for style in style_objs
+            for group_type in GROUP_TYPES
+            for age in age_groups
+            for diff in difficulties
+        ]
+        if options['categories']:
+            category_pool = rng.sample(all_categories, min(options['categories'], len(all_categories)))
+        else:
+            # Weighted: common categories show up five times as often as rare ones
+            category_pool = list(all_categories)
+            for category in all_categories:
+                if category[1] in ("Solo", "Duo", "Trio", "Group") and category[2] in ("Teen", "Youth", "Adult"):
+                    category_pool.extend([category] * 4)
+
+        # --- Synthetic music ---
+        music_names = []
+        for i in range(options['mp3']):
+            seconds = rng.randint(90, 240)
+            name = default_storage.save(
+                f"music_uploads/test_{event.id}_{i + 1}.mp3",
+                ContentFile(synthetic_mp3(seconds)),
+            )
+            music_names.append(name)
 
-        common_category_pool = []
-        for style in style_objs:
-            for group_type in ["Solo", "Duo", "Trio", "Group"]:
-                for age in ["Teen", "Youth", "Adult"]:
-                    for diff in difficulties:
-                        common_category_pool.extend([(style, group_type, age, diff)] * 5)
-
-        rare_category_pool = []
-        for style in style_objs:
-            for group_type in group_limits.keys():
-                for age in age_groups:
-                    for diff in difficulties:
-                        rare_category_pool.append((style, group_type, age, diff))
-
-        # --- Create participations ---
-        created = 0
+        # --- Participations (built in memory, ordered, then inserted in batches) ---
         participations = []
+        crews = []
         for n in range(num_entries):
-            if random.random() < 0.75:
-                style, group_type, age_group, diff = random.choice(common_category_pool)
-            else:
-                style, group_type, age_group, diff = random.choice(rare_category_pool)
-
-            min_d, max_d = group_limits[group_type]
-            num_dancers = random.randint(min_d, min(max_d, len(dancers)))
+            style, group_type, age_group, diff = rng.choice(category_pool)
+            club_index = rng.randrange(len(clubs))
+            club_dancers = dancers_by_club[club_index]
+            min_d, max_d = GROUP_DANCER_LIMITS[group_type]
+            num_dancers = rng.randint(min(min_d, len(club_dancers)), min(max_d, len(club_dancers)))
 
-            part = Participation.objects.create(
+            participations.append(Participation(
                 event=event,
+                club=clubs[club_index],
                 style=style,
                 group_type=group_type,
                 age_group=age_group,
@@ -104,48 +165,70 @@ class Command(BaseCommand):
                 choreographer_name=f"Choreo {n}",
                 choreography_name=f"Routine {n}",
                 group_name=(f"Group{n}" if num_dancers >= 4 else ""),
-                display_order=n,
-                group_display_order=0,
-            )
-
-            chosen = random.sample(dancers, num_dancers)
-            for d in chosen:
-                DancerParticipation.objects.create(participation=part, dancer=d)
-
-            participations.append(part)
-            created += 1
-
-        # --- Create judges ---
-        judges = []
-        for i in range(1, 6):  # 5 judges
-            uname = f"judge{i}"
-            judge, _ = User.objects.get_or_create(
-                username=uname,
-                defaults={"email": f"{uname}@example.com"}
+                music_file=music_names[n % len(music_names)] if music_names else None,
+            ))
+            crews.append(rng.sample(club_dancers, num_dancers))
+
+        default_start_list_order(participations)
+
+        # --- Judges ---
+        judges = User.objects.bulk_create([
+            User(username=f"judge_{event.id}_j{i}", first_name=f"J{i}", last_name="Test")
+            for i in range(1, options['judges'] + 1)
+        ])
+        for judge in judges:
+            judge.set_password(judge.first_name)
+        User.objects.bulk_update(judges, ["password"])
+
+        now = timezone.now()
+        links = 0
+        scores = 0
+        for start in range(0, num_entries, batch_size):
+            batch = participations[start:start + batch_size]
+            with transaction.atomic():
+                Participation.objects.bulk_create(batch)
+                link_rows = [
+                    DancerParticipation(participation=part, dancer=d)
+                    for part, crew in zip(batch, crews[start:start + batch_size])
+                    for d in crew
+                ]
+                DancerParticipation.objects.bulk_create(link_rows, batch_size=batch_size)
+                links += len(link_rows)
+
+                if options['no_scores']:
+                    continue
+                score_rows = []
+                for part in batch:
+                    for judge in judges:
+                        score_rows.append(JudgeScore(
+                            participation=part,
+                            judge=judge,
+                            technique=round(rng.uniform(1, 10), 2),
+                            composition=round(rng.uniform(1, 10), 2),
+                            image=round(rng.uniform(1, 10), 2),
+                            show_value=round(rng.uniform(1, 10), 2) if part.style.name == "Show Dance" else None,
+                            updated_at=now,
+                        ))
+                JudgeScore.objects.bulk_create(score_rows, batch_size=batch_size)
+                scores += len(score_rows)
+
+        # --- Ceremonies, spread evenly between performances ---
+        StartListSlot.objects.bulk_create([
+            StartListSlot(
+                event=event,
+                title=f"Award Ceremony {i}",
+                duration_minutes=15,
+                display_order=(i * num_entries) // (options['ceremonies'] + 1),
+                is_ceremony=True,
             )
-            judges.append(judge)
-
-        # --- Give scores ---
-        for part in participations:
-            for judge in judges:
-                technique = round(random.uniform(1, 10), 2)
-                composition = round(random.uniform(1, 10), 2)
-                image = round(random.uniform(1, 10), 2)
-                show_value = None
-                if part.style.name == "Show Dance":
-                    show_value = round(random.uniform(1, 10), 2)
-
-                JudgeScore.objects.update_or_create(
-                    participation=part,
-                    judge=judge,
-                    defaults={
-                        "technique": technique,
-                        "composition": composition,
-                        "image": image,
-                        "show_value": show_value,
-                    }
-                )
+            for i in range(1, options['ceremonies'] + 1)
+        ])
 
+        invalidate_music_index(event.id)
+        elapsed = time.perf_counter() - started
+        total_rows = len(dancers) + num_entries + links + scores
         self.stdout.write(self.style.SUCCESS(
-            f"✅ Created {created} participations in {event.name}, with {len(judges)} judges and scores."
+            f"✅ Created event #{event.id} ({event.name}): {len(clubs)} clubs, {len(dancers)} dancers, "
+            f"{num_entries} participations, {links} dancer links, {len(judges)} judges, {scores} scores, "
+            f"{options['ceremonies']} ceremonies, {len(music_names)} MP3s — {total_rows} rows in {elapsed:.1f}s."
         ))
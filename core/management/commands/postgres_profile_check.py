@@ -0,0 +1,105 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections, connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.db import read_only_transaction, statement_timeout
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the PostgreSQL profile against the configured server: connection "
+        "reuse, the admin statement timeout and read-only public transactions."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING(
+                f"Skipped: default database is {connection.vendor}; run with USE_POSTGRES=1."
+            ))
+            return
+
+        failures = []
+        for name, check in (
+            ("connection reuse", self._check_reuse),
+            ("admin statement timeout", self._check_statement_timeout),
+            ("read-only public pages", self._check_read_only),
+        ):
+            try:
+                detail = check()
+            except AssertionError as exc:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"✗ {name}: {exc}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {name}: {detail}"))
+
+        if failures:
+            raise CommandError(f"{len(failures)} check(s) failed: {', '.join(failures)}")
+
+    def _backend_pid(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    def _check_reuse(self):
+        db = settings.DATABASES["default"]
+        pooled = bool(db.get("OPTIONS", {}).get("pool"))
+
+        # Two simulated request cycles: request_finished calls close_old_connections.
+        first = self._backend_pid()
+        close_old_connections()
+        second = self._backend_pid()
+        close_old_connections()
+
+        if pooled:
+            return f"psycopg pool {db['OPTIONS']['pool']}, backend pids {first} → {second}"
+        assert db.get("CONN_MAX_AGE"), "CONN_MAX_AGE is 0; every request opens a new connection"
+        assert first == second, f"backend changed between requests ({first} → {second})"
+        return f"persistent connection reused (pid {first}, CONN_MAX_AGE={db['CONN_MAX_AGE']})"
+
+    def _check_statement_timeout(self):
+        @statement_timeout(200)
+        def slow_view(request):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(2)")
+            return HttpResponse()
+
+        @statement_timeout()
+        def default_view(request):
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW statement_timeout")
+                return HttpResponse(cursor.fetchone()[0])
+
+        request = RequestFactory().get("/")
+        started = time.perf_counter()
+        try:
+            slow_view(request)
+        except DatabaseError:
+            elapsed = time.perf_counter() - started
+        else:
+            raise AssertionError("pg_sleep(2) finished; statement_timeout was not applied")
+        assert elapsed < 1.5, f"query was cancelled only after {elapsed:.2f}s"
+
+        applied = default_view(request).content.decode()
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            after = cursor.fetchone()[0]
+        return f"cancelled after {elapsed * 1000:.0f} ms; default {applied}, reset to {after} after the view"
+
+    def _check_read_only(self):
+        @read_only_transaction
+        def public_view(request):
+            with connection.cursor() as cursor:
+                cursor.execute("UPDATE core_event SET name = name WHERE FALSE")
+            return HttpResponse()
+
+        try:
+            public_view(RequestFactory().get("/"))
+        except DatabaseError as exc:
+            assert "read-only" in str(exc), f"unexpected error: {exc}"
+        else:
+            raise AssertionError("UPDATE succeeded inside a read-only view")
+        return "writes are rejected inside read_only_transaction"
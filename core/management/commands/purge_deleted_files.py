@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.cleanup import purge_pending_files
+from core.models import PendingFileDeletion
+
+
+class Command(BaseCommand):
+    help = "Remove files queued by event deletion from media storage (run from cron or a systemd timer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500, help="Files per pass")
+        parser.add_argument('--max-attempts', type=int, default=5, help="Give up on a file after this many failures")
+        parser.add_argument('--loop', type=int, default=0, metavar="SECONDS",
+                            help="Keep running, sleeping this long between passes")
+
+    def handle(self, *args, **options):
+        while True:
+            removed, failed = purge_pending_files(options['limit'], options['max_attempts'])
+            if removed or failed:
+                self.stdout.write(f"Removed {removed} file(s), {failed} failed.")
+            if not options['loop']:
+                break
+            if removed < options['limit']:
+                time.sleep(options['loop'])
+
+        stuck = PendingFileDeletion.objects.filter(attempts__gte=options['max_attempts']).count()
+        if stuck:
+            self.stdout.write(self.style.WARNING(
+                f"{stuck} file(s) exceeded the retry limit; their last_error says why."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ File deletion queue is clear."))
@@ -0,0 +1,46 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.age_groups import apply_age_group_changes, plan_age_group_changes, summarize_changes
+from core.models import Event
+from core.playback import invalidate_music_index
+from core.snapshots import schedule_snapshot_refresh
+
+
+class Command(BaseCommand):
+    help = "Recompute entries' age groups from their dancers' ages on the event date"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, action='append', dest='events',
+                            help="Only this event (repeatable); default is every upcoming event")
+        parser.add_argument('--on', type=date.fromisoformat, help="Reference date (YYYY-MM-DD) instead of the event date")
+        parser.add_argument('--apply', action='store_true', help="Write the changes; without it only a preview is printed")
+
+    def handle(self, *args, **options):
+        if options['events']:
+            events = list(Event.objects.filter(id__in=options['events']).order_by("id"))
+            missing = set(options['events']) - {e.id for e in events}
+            if missing:
+                raise CommandError(f"Unknown event(s): {', '.join(map(str, sorted(missing)))}")
+        else:
+            events = list(Event.objects.filter(date__gte=date.today()).order_by("date", "id"))
+
+        total = 0
+        for event in events:
+            changes = plan_age_group_changes(event, on=options['on'])
+            if not changes:
+                continue
+            self.stdout.write(f"Event #{event.id} {event.name} ({event.date}): {len(changes)} change(s)")
+            for style, group_type, difficulty, old, new, count in summarize_changes(changes):
+                self.stdout.write(f"  {style} | {group_type} | {difficulty}: {old} → {new} ({count})")
+            if options['apply']:
+                apply_age_group_changes(changes)
+                invalidate_music_index(event.id)
+                schedule_snapshot_refresh(event)
+            total += len(changes)
+
+        if options['apply']:
+            self.stdout.write(self.style.SUCCESS(f"✅ Updated {total} entries."))
+        else:
+            self.stdout.write(self.style.WARNING(f"Preview: {total} entries would change. Re-run with --apply to write."))
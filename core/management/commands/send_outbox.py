@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.error_alerts import queue_error_digests
+from core.models import OutboxEmail
+from core.outbox import prune_sent, send_pending
+
+# A --loop worker never exits, so sent mail is pruned from inside the loop
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue due server error digests, then deliver queued outbox emails over one SMTP "
+        "connection (run from cron, a systemd timer or with --loop)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500, help="Messages per pass")
+        parser.add_argument('--batch-size', type=int, default=50, help="Messages fetched from the queue at a time")
+        parser.add_argument('--max-attempts', type=int, default=5, help="Mark a message failed after this many errors")
+        parser.add_argument('--per-minute', type=int, default=None,
+                            help="Send rate limit (default EMAIL_OUTBOX_RATE_PER_MINUTE; 0 = unlimited)")
+        parser.add_argument('--keep-days', type=int, default=30, help="Delete sent messages older than this")
+        parser.add_argument('--loop', type=int, default=0, metavar="SECONDS",
+                            help="Keep running, sleeping this long between passes")
+
+    def handle(self, *args, **options):
+        last_pruned = None
+        while True:
+            digests = queue_error_digests()
+            if digests:
+                self.stdout.write(f"Queued {digests} server error digest(s).")
+            sent, failed = send_pending(
+                limit=options['limit'],
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+                per_minute=options['per_minute'],
+            )
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} email(s), {failed} failed.")
+            if last_pruned is None or time.monotonic() - last_pruned >= PRUNE_INTERVAL_SECONDS:
+                pruned = prune_sent(options['keep_days'])
+                last_pruned = time.monotonic()
+                if pruned:
+                    self.stdout.write(f"Pruned {pruned} sent email(s) older than {options['keep_days']} days.")
+            if not options['loop']:
+                break
+            if sent + failed < options['limit']:
+                time.sleep(options['loop'])
+
+        queued = OutboxEmail.objects.filter(status=OutboxEmail.PENDING).count()
+        if queued:
+            self.stdout.write(f"{queued} email(s) still queued.")
+        stuck = OutboxEmail.objects.filter(status=OutboxEmail.FAILED).count()
+        if stuck:
+            self.stdout.write(self.style.WARNING(
+                f"{stuck} email(s) exceeded the retry limit; their last_error says why."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ No failed emails in the outbox."))
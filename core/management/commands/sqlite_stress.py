@@ -0,0 +1,152 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection, connections
+from django.test import Client
+from django.urls import reverse
+
+from core.models import Event, JudgeScore, Participation, StyleCategory
+from core.testing import plain_static_storage
+
+
+def _judge_worker(args):
+    """
+    One judge tablet: log in and submit the whole category `requests` times
+    through judge_view, the same write path the live event uses.
+    """
+    event_id, judge_id, entry_ids, requests = args
+    close_old_connections()
+
+    client = Client(HTTP_HOST="localhost")
+    client.force_login(User.objects.get(id=judge_id))
+    url = f"{reverse('judge_view', args=[event_id])}?group=0"
+
+    ok = locked = failed = 0
+    latencies = []
+    for i in range(requests):
+        score = str(1 + (i + judge_id) % 10)
+        data = {"save_last": "1"}
+        for pid in entry_ids:
+            for field in ("technique", "composition", "image"):
+                data[f"{field}_{pid}"] = score
+
+        started = time.perf_counter()
+        try:
+            response = client.post(url, data)
+        except OperationalError as exc:
+            if "locked" in str(exc):
+                locked += 1
+            else:
+                failed += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        if response.status_code in (200, 302):
+            ok += 1
+        else:
+            failed += 1
+
+    connections.close_all()
+    return ok, locked, failed, latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress the SQLite write profile: several processes save judge scores "
+        "concurrently against a scratch copy of the schema and report lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--judges', type=int, default=5, help="Concurrent writer processes (one judge each)")
+        parser.add_argument('--requests', type=int, default=40, help="Score submissions per judge")
+        parser.add_argument('--entries', type=int, default=20, help="Entries in the judged category")
+        parser.add_argument('--keep', action='store_true', help="Keep the scratch database directory")
+
+    # Workers render judge_view; {% static %} must work without a collected manifest
+    @plain_static_storage()
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("sqlite_stress only runs against the SQLite backend.")
+
+        # Point the default connection at a scratch file, the way the test runner does.
+        scratch_dir = tempfile.mkdtemp(prefix="dp-sqlite-stress-")
+        scratch_db = os.path.join(scratch_dir, "stress.sqlite3")
+        connection.close()
+        connection.settings_dict["NAME"] = scratch_db
+        settings.DATABASES[connection.alias]["NAME"] = scratch_db
+
+        try:
+            call_command("migrate", verbosity=0, interactive=False)
+            event_id, judge_ids, entry_ids = self._seed(options['judges'], options['entries'])
+
+            journal_mode = self._pragma("journal_mode")
+            self.stdout.write(
+                f"journal_mode={journal_mode} synchronous={self._pragma('synchronous')} "
+                f"busy_timeout={self._pragma('busy_timeout')}ms"
+            )
+
+            # Children must not inherit an open SQLite handle.
+            connections.close_all()
+            jobs = [(event_id, judge_id, entry_ids, options['requests']) for judge_id in judge_ids]
+            started = time.perf_counter()
+            with multiprocessing.get_context("fork").Pool(len(jobs)) as pool:
+                results = pool.map(_judge_worker, jobs)
+            elapsed = time.perf_counter() - started
+
+            ok = sum(r[0] for r in results)
+            locked = sum(r[1] for r in results)
+            failed = sum(r[2] for r in results)
+            latencies = sorted(latency for r in results for latency in r[3])
+            saved = JudgeScore.objects.filter(participation__event_id=event_id).count()
+        finally:
+            connections.close_all()
+            if not options['keep']:
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        total = ok + locked + failed
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0
+        self.stdout.write(
+            f"{total} submissions in {elapsed:.2f}s ({total / elapsed:.1f}/s), "
+            f"p95 {p95:.0f} ms, {saved} score rows"
+        )
+        if options['keep']:
+            self.stdout.write(f"Scratch database kept at {scratch_db}")
+
+        if locked or failed:
+            raise CommandError(f"{locked} 'database is locked' errors, {failed} other failures.")
+        self.stdout.write(self.style.SUCCESS(f"✅ {ok} submissions saved without lock errors."))
+
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def _seed(self, num_judges, num_entries):
+        event = Event.objects.create(name="Stress Event", city="Stress", location="Hall", date=date.today())
+        style = StyleCategory.objects.create(event=event, name="Jazz")
+        entries = Participation.objects.bulk_create([
+            Participation(
+                event=event,
+                style=style,
+                group_type="Solo",
+                age_group="Teen",
+                difficulty="A",
+                choreographer_name=f"Choreo {n}",
+                choreography_name=f"Routine {n}",
+                display_order=n,
+                group_display_order=0,
+            )
+            for n in range(num_entries)
+        ])
+        judges = [
+            User.objects.create_user(username=f"judge_{event.id}_stress{i}", password=None)
+            for i in range(1, num_judges + 1)
+        ]
+        return event.id, [j.id for j in judges], [p.id for p in entries]
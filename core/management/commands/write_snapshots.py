@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from core.models import Event
+from core.snapshots import refresh_snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite the static results / start list snapshots of published events "
+        "(after a deploy that changed their templates, or edits made outside the views)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, help="Only this event id")
+
+    def handle(self, *args, **options):
+        events = Event.objects.filter(Q(results_published=True) | Q(start_list_published=True))
+        if options['event']:
+            events = Event.objects.filter(id=options['event'])
+            if not events.exists():
+                raise CommandError(f"Event {options['event']} does not exist.")
+
+        count = 0
+        for event_id in events.values_list("id", flat=True):
+            refresh_snapshots(event_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"✅ Snapshots refreshed for {count} event(s)."))
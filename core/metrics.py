@@ -0,0 +1,179 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger("core.metrics")
+
+# Upper bounds (seconds) of the request duration histogram.
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar("core_request_metrics", default=None)
+
+_lock = threading.Lock()
+_views = defaultdict(lambda: {
+    "requests": 0,
+    "duration": 0.0,
+    "queries": 0,
+    "db_time": 0.0,
+    "template_time": 0.0,
+    "response_bytes": 0,
+    "max_queries": 0,
+    "buckets": [0] * len(DURATION_BUCKETS),
+})
+_statuses = Counter()
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:%s|\?|NULL)\s*,?)+\)", re.IGNORECASE)
+
+
+def sql_shape(sql):
+    """Collapse literals and IN lists so repeated queries share one shape."""
+    shape = _STRING_RE.sub("?", sql)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("IN (…)", shape)
+    return " ".join(shape.split())
+
+
+class RequestMetrics:
+    """Counters for one request, filled by the DB wrapper and template timer."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.shapes = Counter()
+        self._template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def activate(self):
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current.reset(token)
+
+
+def install_template_timer():
+    """
+    Time top-level template renders for the active request.
+    Wraps the Django template backend once; includes count toward the outer render.
+    """
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, "_core_timed", False):
+        return
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return original(self, context, request)
+        metrics._template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            metrics._template_depth -= 1
+            if not metrics._template_depth:
+                metrics.template_time += time.perf_counter() - started
+
+    render._core_timed = True
+    Template.render = render
+
+
+def record(view, method, status, duration, response_bytes, metrics):
+    with _lock:
+        stats = _views[(view, method)]
+        stats["requests"] += 1
+        stats["duration"] += duration
+        stats["queries"] += metrics.queries
+        stats["db_time"] += metrics.db_time
+        stats["template_time"] += metrics.template_time
+        stats["response_bytes"] += response_bytes
+        stats["max_queries"] = max(stats["max_queries"], metrics.queries)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                stats["buckets"][i] += 1
+        _statuses[(view, method, status)] += 1
+
+    slow_ms = settings.REQUEST_METRICS_SLOW_MS
+    slow_queries = settings.REQUEST_METRICS_SLOW_QUERIES
+    if duration * 1000 >= slow_ms or metrics.queries >= slow_queries:
+        top = metrics.shapes.most_common(settings.REQUEST_METRICS_TOP_SHAPES)
+        logger.warning(
+            "Slow request %s %s: %.0f ms, %d queries (%.0f ms DB), %.0f ms templates, %d bytes\n%s",
+            method,
+            view,
+            duration * 1000,
+            metrics.queries,
+            metrics.db_time * 1000,
+            metrics.template_time * 1000,
+            response_bytes,
+            "\n".join(f"  {count}× {shape[:300]}" for shape, count in top),
+        )
+
+
+def _labels(**labels):
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def render_prometheus():
+    """Current worker's aggregates in the Prometheus text exposition format."""
+    with _lock:
+        views = {key: dict(stats, buckets=list(stats["buckets"])) for key, stats in _views.items()}
+        statuses = dict(_statuses)
+
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family("dance_portal_requests_total", "counter", "Requests by view, method and status.")
+    for (view, method, status), count in sorted(statuses.items()):
+        lines.append(f"dance_portal_requests_total{_labels(view=view, method=method, status=status)} {count}")
+
+    family("dance_portal_request_duration_seconds", "histogram", "Request wall time.")
+    for (view, method), stats in sorted(views.items()):
+        for bound, count in zip(DURATION_BUCKETS, stats["buckets"]):
+            lines.append(
+                f"dance_portal_request_duration_seconds_bucket"
+                f"{_labels(view=view, method=method, le=bound)} {count}"
+            )
+        lines.append(
+            f"dance_portal_request_duration_seconds_bucket"
+            f"{_labels(view=view, method=method, le='+Inf')} {stats['requests']}"
+        )
+        lines.append(f"dance_portal_request_duration_seconds_sum{_labels(view=view, method=method)} {stats['duration']:.6f}")
+        lines.append(f"dance_portal_request_duration_seconds_count{_labels(view=view, method=method)} {stats['requests']}")
+
+    for name, key, kind, help_text, fmt in (
+        ("dance_portal_db_queries_total", "queries", "counter", "SQL queries executed.", "{}"),
+        ("dance_portal_db_query_seconds_total", "db_time", "counter", "Time spent in SQL.", "{:.6f}"),
+        ("dance_portal_template_render_seconds_total", "template_time", "counter", "Time spent rendering templates.", "{:.6f}"),
+        ("dance_portal_response_bytes_total", "response_bytes", "counter", "Response body bytes (non-streaming).", "{}"),
+        ("dance_portal_db_queries_max", "max_queries", "gauge", "Most queries seen in one request.", "{}"),
+    ):
+        family(name, kind, help_text)
+        for (view, method), stats in sorted(views.items()):
+            lines.append(f"{name}{_labels(view=view, method=method)} {fmt.format(stats[key])}")
+
+    return "\n".join(lines) + "\n"
@@ -1,8 +1,14 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
 from django.http import HttpResponseForbidden
 from django.shortcuts import redirect
-from django.urls import reverse
+from django.urls import Resolver404, resolve, reverse
 
 from .auth_utils import is_judge_account, judge_event_id_from_username
+from .metrics import RequestMetrics, install_template_timer, record
 
 
 class JudgeAccessMiddleware:
@@ -11,7 +17,9 @@ class JudgeAccessMiddleware:
     This middleware only applies to users detected as judge accounts.
     """
 
-    allowed_url_names = {"judge_view", "logout", "set_language"}
+    allowed_url_names = {"judge_token_login", "logout", "set_language"}
+    # Judging URLs (per event) a judge may use directly, including the offline client's API.
+    judge_url_names = ("judge_view", "judge_event_data", "judge_sync_scores")
 
     def __init__(self, get_response):
         self.get_response = get_response
@@ -32,7 +40,13 @@ class JudgeAccessMiddleware:
         if request.path.startswith("/i18n/"):
             return self.get_response(request)
 
+        # URL resolution happens after middleware runs, so resolve the path here.
         resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            try:
+                resolver_match = resolve(request.path_info)
+            except Resolver404:
+                resolver_match = None
         current_url_name = getattr(resolver_match, "url_name", None)
         if current_url_name in self.allowed_url_names:
             return self.get_response(request)
@@ -44,8 +58,39 @@ class JudgeAccessMiddleware:
         target = f"{reverse('judge_view', args=[event_id])}?group=0"
 
         # Avoid loops and avoid mutating non-GET requests.
-        if request.path == reverse("judge_view", args=[event_id]):
+        if request.path in {reverse(name, args=[event_id]) for name in self.judge_url_names}:
             return self.get_response(request)
         if request.method not in {"GET", "HEAD"}:
             return HttpResponseForbidden("Judge accounts can only access the judging panel.")
         return redirect(target)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB time, template time and response size per URL name.
+    Aggregates live in this worker process (see core.metrics) and are served
+    to staff at the metrics endpoint; slow or chatty requests are logged.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        install_template_timer()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = metrics.activate()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        duration = time.perf_counter() - started
+
+        resolver_match = getattr(request, "resolver_match", None)
+        view = getattr(resolver_match, "view_name", None) or "<unresolved>"
+        response_bytes = 0 if response.streaming else len(response.content)
+        record(view, request.method, response.status_code, duration, response_bytes, metrics)
+        return response
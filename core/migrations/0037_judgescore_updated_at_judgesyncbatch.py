@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_alter_eventregistration_age_group_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='judgescore',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Updated At'),
+        ),
+        migrations.CreateModel(
+            name='JudgeSyncBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=64, verbose_name='Idempotency Key')),
+                ('response', models.JSONField(default=dict, verbose_name='Response')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('judge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Judge')),
+            ],
+            options={
+                'verbose_name': 'Judge Sync Batch',
+                'verbose_name_plural': 'Judge Sync Batches',
+                'unique_together': {('judge', 'idempotency_key')},
+            },
+        ),
+    ]
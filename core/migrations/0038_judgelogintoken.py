@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_judgescore_updated_at_judgesyncbatch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JudgeLoginToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nonce', models.CharField(max_length=64, unique=True, verbose_name='Nonce')),
+                ('expires_at', models.DateTimeField(verbose_name='Expires At')),
+                ('used_at', models.DateTimeField(blank=True, null=True, verbose_name='Used At')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.event', verbose_name='Event')),
+                ('judge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='judge_login_tokens', to=settings.AUTH_USER_MODEL, verbose_name='Judge')),
+            ],
+            options={
+                'verbose_name': 'Judge Login Token',
+                'verbose_name_plural': 'Judge Login Tokens',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_outboxemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServerErrorGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('exception_type', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, default='', max_length=255)),
+                ('path', models.CharField(blank=True, default='', max_length=255)),
+                ('sample', models.TextField(blank=True, default='', verbose_name='Latest occurrence')),
+                ('occurrences', models.PositiveIntegerField(default=0)),
+                ('notified_occurrences', models.PositiveIntegerField(default=0)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('last_notified_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Server Error Group',
+                'verbose_name_plural': 'Server Error Groups',
+            },
+        ),
+    ]
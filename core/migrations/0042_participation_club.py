@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_participation_clubs(apps, schema_editor):
+    """Each entry's club is the club of its first dancer, as the participant list showed it."""
+    Participation = apps.get_model('core', 'Participation')
+    DancerParticipation = apps.get_model('core', 'DancerParticipation')
+
+    club_by_entry = {}
+    links = DancerParticipation.objects.order_by('participation_id', 'id').values_list(
+        'participation_id', 'dancer__club_id'
+    )
+    for participation_id, club_id in links.iterator(chunk_size=2000):
+        club_by_entry.setdefault(participation_id, club_id)
+
+    Participation.objects.bulk_update(
+        [Participation(id=pid, club_id=club_id) for pid, club_id in club_by_entry.items()],
+        ['club'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_servererrorgroup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participation',
+            name='club',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='participations', to='core.danceclub', verbose_name='Club'),
+        ),
+        migrations.RunPython(set_participation_clubs, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['event', 'club', 'id'], name='participation_event_club_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['event', 'group_type', 'age_group', 'difficulty'], name='participation_category_idx'),
+        ),
+    ]
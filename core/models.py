@@ -124,6 +124,12 @@ class Participation(models.Model):
     ]
 
     event = models.ForeignKey(Event, on_delete=models.CASCADE, verbose_name=_("Event"))
+    # Club that registered the entry (its dancers' club); kept on the row so
+    # participant lists can filter and page by club without joining dancers.
+    club = models.ForeignKey(
+        DanceClub, on_delete=models.SET_NULL, null=True, blank=True, related_name="participations",
+        verbose_name=_("Club")
+    )
     group_type = models.CharField(max_length=20, choices=CHOREO_TYPE_CHOICES, verbose_name=_("Group Type"))
     age_group = models.CharField(max_length=20, choices=AGE_GROUP_CHOICES, verbose_name=_("Age Group"))
     style = models.ForeignKey("StyleCategory", on_delete=models.CASCADE, verbose_name=_("Style"))
@@ -141,6 +147,11 @@ class Participation(models.Model):
     class Meta:
         verbose_name = _("Participation")
         verbose_name_plural = _("Participations")
+        indexes = [
+            # Keyset pages of list_event_participants: WHERE event = ? ORDER BY club, id
+            models.Index(fields=["event", "club", "id"], name="participation_event_club_idx"),
+            models.Index(fields=["event", "group_type", "age_group", "difficulty"], name="participation_category_idx"),
+        ]
 
 
 class EventRegistration(models.Model):
@@ -203,12 +214,44 @@ class JudgeScore(models.Model):
     composition = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
     image = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
     show_value = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)  # only for Show Dance
+    # When the judge last changed this score (client time for offline sync).
+    updated_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Updated At"))
 
     class Meta:
         unique_together = ('participation', 'judge')
         verbose_name = _("Judge Score")
         verbose_name_plural = _("Judge Scores")
 
+
+class JudgeSyncBatch(models.Model):
+    """A processed offline score batch, kept so retried uploads are answered without re-applying."""
+    judge = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name=_("Judge"))
+    idempotency_key = models.CharField(max_length=64, verbose_name=_("Idempotency Key"))
+    response = models.JSONField(default=dict, verbose_name=_("Response"))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('judge', 'idempotency_key')
+        verbose_name = _("Judge Sync Batch")
+        verbose_name_plural = _("Judge Sync Batches")
+
+class JudgeLoginToken(models.Model):
+    """One-time login link for a judge account, valid until the end of the event day."""
+    judge = models.ForeignKey(User, on_delete=models.CASCADE, related_name="judge_login_tokens", verbose_name=_("Judge"))
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, verbose_name=_("Event"))
+    nonce = models.CharField(max_length=64, unique=True, verbose_name=_("Nonce"))
+    expires_at = models.DateTimeField(verbose_name=_("Expires At"))
+    used_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Used At"))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Judge Login Token")
+        verbose_name_plural = _("Judge Login Tokens")
+
+    def __str__(self):
+        return f"{self.judge.username} ({self.expires_at:%Y-%m-%d})"
+
+
 class Diploma(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, verbose_name=_("Event"))
     dancer = models.ForeignKey(Dancer, on_delete=models.CASCADE, verbose_name=_("Dancer"))
@@ -243,3 +286,76 @@ class StartListSlot(models.Model):
 
     def __str__(self):
         return f"{self.title} ({self.age_group}, {self.duration_minutes} min)"
+
+
+class PendingFileDeletion(models.Model):
+    """A stored file whose owner row is gone; removed from storage by purge_deleted_files."""
+    name = models.CharField(max_length=500, verbose_name=_("File Name"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        verbose_name = _("Pending File Deletion")
+        verbose_name_plural = _("Pending File Deletions")
+
+    def __str__(self):
+        return self.name
+
+
+class OutboxEmail(models.Model):
+    """One message to one recipient, delivered by the send_outbox worker."""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, _("Pending")),
+        (SENT, _("Sent")),
+        (FAILED, _("Failed")),
+    ]
+
+    subject = models.CharField(max_length=255, verbose_name=_("Subject"))
+    body = models.TextField(verbose_name=_("Body"))
+    from_email = models.CharField(max_length=254, blank=True, default="", verbose_name=_("From"))
+    to_email = models.EmailField(verbose_name=_("To"))
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name=_("Status"))
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name=_("Next Attempt At"))
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Sent At"))
+
+    class Meta:
+        verbose_name = _("Outbox Email")
+        verbose_name_plural = _("Outbox Emails")
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email}: {self.subject}"
+
+
+class ServerErrorGroup(models.Model):
+    """
+    500 errors sharing a fingerprint (exception type, code location, URL route).
+    Views only record sightings; the send_outbox worker mails one digest per
+    group per ERROR_ALERT_WINDOW_MINUTES.
+    """
+    fingerprint = models.CharField(max_length=40, unique=True)
+    exception_type = models.CharField(max_length=255)
+    location = models.CharField(max_length=255, blank=True, default="")
+    path = models.CharField(max_length=255, blank=True, default="")
+    sample = models.TextField(blank=True, default="", verbose_name=_("Latest occurrence"))
+    occurrences = models.PositiveIntegerField(default=0)
+    notified_occurrences = models.PositiveIntegerField(default=0)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(default=timezone.now, db_index=True)
+    last_notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Server Error Group")
+        verbose_name_plural = _("Server Error Groups")
+
+    def __str__(self):
+        return f"{self.exception_type} at {self.location} ({self.path})"
@@ -0,0 +1,112 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# Retry delays grow from RETRY_BASE_SECONDS, doubling per attempt, up to RETRY_MAX_SECONDS.
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 3600
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    """
+    Queue one message per recipient (so nobody sees the other addresses) for
+    the send_outbox worker. Blank and repeated addresses are dropped; returns
+    how many messages were queued.
+    """
+    seen = set()
+    rows = []
+    for address in recipients:
+        address = (address or "").strip()
+        if not address or address.lower() in seen:
+            continue
+        seen.add(address.lower())
+        rows.append(OutboxEmail(
+            subject=subject[:255],
+            body=body,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL or "",
+            to_email=address,
+        ))
+    OutboxEmail.objects.bulk_create(rows)
+    return len(rows)
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def send_pending(limit=500, batch_size=50, max_attempts=5, per_minute=None, connection=None):
+    """
+    Deliver due outbox messages over one reused mail connection; returns
+    (sent, failed). Messages go out at most `per_minute` a minute; a failure
+    is retried later with backoff until `max_attempts`, then marked failed.
+    """
+    per_minute = settings.EMAIL_OUTBOX_RATE_PER_MINUTE if per_minute is None else per_minute
+    interval = 60 / per_minute if per_minute else 0
+    connection = connection or get_connection()
+    sent = failed = 0
+    last_sent = None
+
+    try:
+        while sent + failed < limit:
+            batch = list(
+                OutboxEmail.objects.filter(status=OutboxEmail.PENDING, next_attempt_at__lte=timezone.now())
+                .order_by("next_attempt_at", "id")[:min(batch_size, limit - sent - failed)]
+            )
+            if not batch:
+                break
+
+            for item in batch:
+                try:
+                    connection.open()  # no-op while the session is up
+                except Exception as exc:
+                    # Server unreachable: leave the queue untouched for the next pass
+                    logger.warning("Mail server unavailable, %d outbox email(s) left queued: %s", len(batch), exc)
+                    return sent, failed
+                if last_sent is not None and interval:
+                    time.sleep(max(0.0, interval - (time.monotonic() - last_sent)))
+                message = EmailMessage(
+                    subject=item.subject,
+                    body=item.body,
+                    from_email=item.from_email or None,
+                    to=[item.to_email],
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as exc:
+                    logger.warning("Could not send outbox email #%s to %s: %s", item.id, item.to_email, exc)
+                    item.attempts += 1
+                    item.last_error = str(exc)[:1000]
+                    if item.attempts >= max_attempts:
+                        item.status = OutboxEmail.FAILED
+                    else:
+                        item.next_attempt_at = timezone.now() + _retry_delay(item.attempts)
+                    item.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+                    failed += 1
+                    # A broken session would fail every following message too
+                    connection.close()
+                else:
+                    item.status = OutboxEmail.SENT
+                    item.sent_at = timezone.now()
+                    item.attempts += 1
+                    item.save(update_fields=["status", "sent_at", "attempts"])
+                    sent += 1
+                last_sent = time.monotonic()
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def prune_sent(days):
+    """Delete messages sent more than `days` ago; returns how many."""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _per_model = OutboxEmail.objects.filter(status=OutboxEmail.SENT, sent_at__lt=cutoff).delete()
+    return deleted
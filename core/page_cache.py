@@ -0,0 +1,73 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.translation import get_language
+
+# Bumped whenever an Event is saved or deleted; it is part of every page key,
+# so one increment retires all cached public pages at once.
+EVENTS_VERSION_KEY = "page-cache:events-version"
+PAGE_KEY = "page-cache:{view}:{version}:{language}:{day}:{path}"
+
+
+def events_version():
+    version = cache.get(EVENTS_VERSION_KEY)
+    if version is None:
+        # Start from the clock, not 1, so pages cached under a version that
+        # was evicted can never be picked up again
+        cache.add(EVENTS_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(EVENTS_VERSION_KEY)
+    return version
+
+
+def bump_events_version(**kwargs):
+    """post_save / post_delete receiver for Event."""
+    def bump():
+        try:
+            cache.incr(EVENTS_VERSION_KEY)
+        except ValueError:
+            cache.set(EVENTS_VERSION_KEY, time.time_ns(), timeout=None)
+
+    # After commit, so a page rendered in between cannot cache the old rows
+    transaction.on_commit(bump)
+
+
+def cache_public_page(view_func):
+    """
+    Serve anonymous GETs of a public page from the cache, keyed by language,
+    day and events version, with a short s-maxage so nginx can micro-cache it.
+    Signed-in users and visitors with pending messages get a fresh, private page.
+    """
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or request.user.is_authenticated or get_messages(request):
+            response = view_func(request, *args, **kwargs)
+            patch_cache_control(response, private=True)
+            return response
+
+        key = PAGE_KEY.format(
+            view=view_func.__name__,
+            version=events_version(),
+            language=get_language(),
+            day=timezone.localdate().isoformat(),
+            path=hashlib.md5(request.get_full_path().encode()).hexdigest(),
+        )
+        cached = cache.get(key)
+        if cached is None:
+            response = view_func(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+            cache.set(key, (response.content, response["Content-Type"]), settings.PUBLIC_PAGE_CACHE_SECONDS)
+        else:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        patch_cache_control(response, public=True, max_age=0, s_maxage=settings.PUBLIC_PAGE_MAX_AGE)
+        return response
+    return _wrapped
@@ -0,0 +1,197 @@
+import hashlib
+from collections import OrderedDict, defaultdict
+
+from django.core.cache import cache
+
+from .models import DancerParticipation, EventPlaybackState, Participation
+
+# The music index is invalidated explicitly whenever entries change; the
+# timeout only bounds staleness for edits made outside the portal views
+# (Django admin, shell, management commands).
+MUSIC_INDEX_TIMEOUT = 300
+
+
+def _music_index_cache_key(event_id):
+    return f"event_music_index:{event_id}"
+
+
+def category_key_str(group_key):
+    return "|".join(str(part) for part in group_key)
+
+
+def build_music_index(event):
+    """
+    Return the ordered list of start-list categories for the music booth.
+    Each category is a plain dict (key, key_str, entries) so it can be cached
+    and serialized to JSON as-is.
+    """
+    participations = (
+        Participation.objects.filter(event=event)
+        .select_related("style")
+        .order_by("group_display_order", "display_order", "id")
+    )
+
+    dancer_participations = (
+        DancerParticipation.objects.filter(participation__event=event)
+        .select_related("dancer", "dancer__club")
+        .order_by("id")
+    )
+
+    dancer_map = defaultdict(list)
+    club_map = {}
+    for dp in dancer_participations:
+        dancer_map[dp.participation_id].append({
+            "first_name": dp.dancer.first_name,
+            "last_name": dp.dancer.last_name,
+        })
+        club_map.setdefault(dp.participation_id, dp.dancer.club)
+
+    grouped = OrderedDict()
+    for p in participations:
+        dancers = dancer_map.get(p.id, [])
+        club = club_map.get(p.id)
+
+        group_key = (p.style.name, p.group_type, p.age_group, p.difficulty)
+        grouped.setdefault(group_key, []).append({
+            "id": p.id,
+            "style": p.style.name,
+            "difficulty": p.difficulty,
+            "group_type": p.group_type,
+            "age_group": p.age_group,
+            "dancers": dancers,
+            "group_name": p.group_name,
+            "num_dancers": len(dancers),
+            "choreographer": p.choreographer_name,
+            "choreography_name": p.choreography_name,
+            "club_name": club.club_name if club else "–",
+            "club_city": club.city if club else "–",
+            "music_file_url": p.music_file.url if p.music_file else None,
+            "music_file_name": p.music_file.name.split("/")[-1] if p.music_file else "default.mp3",
+        })
+
+    return [
+        {"key": list(group_key), "key_str": category_key_str(group_key), "entries": entries}
+        for group_key, entries in grouped.items()
+    ]
+
+
+def get_music_index(event):
+    key = _music_index_cache_key(event.id)
+    index = cache.get(key)
+    if index is None:
+        index = build_music_index(event)
+        cache.set(key, index, MUSIC_INDEX_TIMEOUT)
+    return index
+
+
+def invalidate_music_index(event_id):
+    cache.delete(_music_index_cache_key(event_id))
+
+
+def set_playback_highlight(event, highlight_key):
+    """
+    Store the highlighted category for live playback.
+    Only writes when the key actually changes; returns True if it did.
+    """
+    current = (
+        EventPlaybackState.objects.filter(event=event)
+        .values_list("current_highlight_key", flat=True)
+        .first()
+    )
+    if current == highlight_key:
+        return False
+
+    updated = EventPlaybackState.objects.filter(event=event).update(current_highlight_key=highlight_key)
+    if not updated:
+        EventPlaybackState.objects.create(event=event, current_highlight_key=highlight_key)
+    return True
+
+
+def _music_digest_cache_key(name, size):
+    return f"music_digest:{name}:{size}"
+
+
+def music_file_digest(field_file):
+    """
+    Return (size, sha256 hex) for an uploaded music file.
+    Uploaded names are unique per upload, so the digest is cached by name+size.
+    """
+    storage = field_file.storage
+    try:
+        size = storage.size(field_file.name)
+    except OSError:
+        return None, None
+
+    key = _music_digest_cache_key(field_file.name, size)
+    digest = cache.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        try:
+            with storage.open(field_file.name, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                    sha.update(chunk)
+        except OSError:
+            return size, None
+        digest = sha.hexdigest()
+        cache.set(key, digest, None)
+    return size, digest
+
+
+def build_playlist_manifest(event):
+    """
+    Start-list ordered playlist for the music booth's offline mode: the cached
+    category index plus one track per uploaded file with size and SHA-256.
+    """
+    categories = get_music_index(event)
+    music_files = {
+        p.id: p.music_file
+        for p in Participation.objects.filter(event=event).exclude(music_file="").exclude(music_file__isnull=True)
+    }
+
+    tracks = []
+    for index, category in enumerate(categories):
+        for entry in category["entries"]:
+            field_file = music_files.get(entry["id"])
+            if not field_file:
+                continue
+            size, digest = music_file_digest(field_file)
+            if digest is None:
+                continue
+            tracks.append({
+                "participation_id": entry["id"],
+                "category_index": index,
+                "url": field_file.url,
+                "name": entry["music_file_name"],
+                "size": size,
+                "sha256": digest,
+            })
+
+    return {
+        "event_id": event.id,
+        "categories": categories,
+        "tracks": tracks,
+    }
+
+
+def get_music_duration(p):
+    # Use uploaded music length + 30s transition buffer.
+    # If no music is uploaded (or unreadable), fall back to 3 minutes.
+    default_seconds = 180
+
+    if not p.music_file:
+        return default_seconds
+
+    try:
+        from mutagen.mp3 import MP3  # only start-list timing reads audio headers
+
+        p.music_file.open("rb")
+        audio = MP3(p.music_file)
+        base_duration = int(audio.info.length)
+        return base_duration + 30
+    except Exception:
+        return default_seconds
+    finally:
+        try:
+            p.music_file.close()
+        except Exception:
+            pass
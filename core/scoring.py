@@ -0,0 +1,24 @@
+def compute_final_score(participation, scores, discard_extremes=True):
+    """
+    Average of all judges' criterion marks, rounded to 2 places, or None when
+    nothing is scored. With `discard_extremes`, each criterion scored by three
+    or more judges drops its highest and lowest mark.
+    """
+    criterion_fields = ["technique", "composition", "image"]
+    if participation.style.name == "Show Dance":
+        criterion_fields.append("show_value")
+
+    total_points = 0
+    total_counts = 0
+
+    for f in criterion_fields:
+        values = [getattr(s, f) for s in scores if getattr(s, f) is not None]
+        if discard_extremes and len(values) >= 3:
+            values = sorted(values)[1:-1]  # drop high + low
+        total_points += sum(values)
+        total_counts += len(values)
+
+    if total_counts == 0:
+        return None
+
+    return round(total_points / total_counts, 2)
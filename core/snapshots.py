@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+from itertools import groupby
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone, translation
+from django.utils.crypto import salted_hmac
+
+from . import exports
+from .models import Event
+
+# Pre-rendered copies of published pages under MEDIA_ROOT, served by nginx as
+# plain files: <SNAPSHOT_DIR>/<event id>-<token>/{results,start-list}.{html,json}
+SNAPSHOT_DIR = "snapshots"
+RESULTS = "results"
+START_LIST = "start-list"
+
+
+def snapshot_dir(event):
+    """Event folder, relative to MEDIA_ROOT. The token keeps it from being guessed from the id."""
+    token = salted_hmac("core.snapshots", str(event.pk)).hexdigest()[:20]
+    return f"{SNAPSHOT_DIR}/{event.pk}-{token}"
+
+
+def _file(event, name, extension):
+    return Path(settings.MEDIA_ROOT) / snapshot_dir(event) / f"{name}.{extension}"
+
+
+def snapshot_url(event, name, extension="html"):
+    """URL of a snapshot file, or None while it has not been written."""
+    if not _file(event, name, extension).exists():
+        return None
+    return f"{settings.MEDIA_URL}{snapshot_dir(event)}/{name}.{extension}"
+
+
+def serves_snapshots():
+    """Snapshots are rendered in LANGUAGE_CODE; other languages get the live page."""
+    return translation.get_language() == settings.LANGUAGE_CODE
+
+
+def snapshot_file_names(event):
+    """Storage names (relative to MEDIA_ROOT) of the event's snapshot files on disk."""
+    folder = Path(settings.MEDIA_ROOT) / snapshot_dir(event)
+    if not folder.is_dir():
+        return []
+    return sorted(f"{snapshot_dir(event)}/{path.name}" for path in folder.iterdir() if path.is_file())
+
+
+def _write_atomic(path, text):
+    """Readers see the old file or the new one, never a partial write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; nginx must read it
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _remove(event, name):
+    for extension in ("json", "html"):
+        _file(event, name, extension).unlink(missing_ok=True)
+
+
+def _event_info(event):
+    return {
+        "id": event.pk,
+        "name": event.name,
+        "date": event.date,
+        "city": event.city,
+        "location": event.location,
+    }
+
+
+def _write(event, name, template, data):
+    data = {"event": _event_info(event), "generated_at": timezone.now(), **data}
+    # Same language for every visitor; JSON first, the page links to it
+    with translation.override(settings.LANGUAGE_CODE):
+        html = render_to_string(template, {**data, "json_url": f"{name}.json"})
+    _write_atomic(_file(event, name, "json"), json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False))
+    _write_atomic(_file(event, name, "html"), html)
+
+
+def write_results_snapshot(event):
+    """Ranked results per category, as export_results_csv computes them."""
+    fields = exports.RESULTS_HEADER[4:]
+    categories = []
+    for key, rows in groupby(exports.results_rows(event), key=lambda row: tuple(row[:4])):
+        style, group_type, age_group, difficulty = key
+        categories.append({
+            "style": style,
+            "group_type": group_type,
+            "age_group": age_group,
+            "difficulty": difficulty,
+            "results": [dict(zip(fields, row[4:])) for row in rows],
+        })
+    _write(event, RESULTS, "core/snapshots/results.html", {"categories": categories})
+
+
+def write_start_list_snapshot(event):
+    """The start list as visitors see it (group names for groups of four or more)."""
+    fields = exports.START_LIST_HEADER
+    slots = [dict(zip(fields, row)) for row in exports.start_list_rows(event, is_admin=False)]
+    _write(event, START_LIST, "core/snapshots/start_list.html", {"slots": slots})
+
+
+def refresh_snapshots(event_id, names=(RESULTS, START_LIST)):
+    """Rewrite the named snapshots while their page is published, delete them otherwise."""
+    event = Event.objects.filter(pk=event_id).first()
+    if event is None:
+        return
+    writers = {
+        RESULTS: (event.results_published, write_results_snapshot),
+        START_LIST: (event.start_list_published, write_start_list_snapshot),
+    }
+    for name in names:
+        published, write = writers[name]
+        if published:
+            write(event)
+        else:
+            _remove(event, name)
+
+
+def schedule_snapshot_refresh(event, names=(RESULTS, START_LIST)):
+    """Refresh once the current transaction commits, so the files match what was saved."""
+    transaction.on_commit(lambda: refresh_snapshots(event.pk, names))
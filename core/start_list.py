@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+# Order definitions
+DEFAULT_STYLES = ['Show Dance', 'Contemporary/Modern Dance', 'Lyrical Jazz', 'Jazz Performance', 'Open',
+               'Ballet Repertiore', 'Ballet Open', 'Tap', 'Musical Theater Performance', 'Acro',
+               'Commercial Performance', 'Heels', 'Frame Up Strip', 'Latin Performance', 'Ballroom/Round Dancing',
+               'Street Dance/ Open Freestyle', 'Hip-Hop', 'Break Dance', 'Shuffle Dance', 'Disco Dance', 'Dance Fitness',
+               'K-Pop', 'Oriental Dance', 'Indian Classical', 'Bollywood', 'Character Ethnic', 'Majorette', 'Pom-Pom']
+
+STYLE_ORDER = DEFAULT_STYLES
+AGE_GROUP_ORDER = ['Baby', 'Mini Kids', 'Kids', 'Teen', 'Youth', 'Adult', 'Mixed Age']
+GROUP_TYPE_ORDER = ['Solo', 'Duo', 'Trio', 'Group', 'Formation', 'Production']
+
+def get_order_index(value, order_list):
+    try:
+        return order_list.index(value)
+    except ValueError:
+        return len(order_list)
+
+
+def default_start_list_order(participations):
+    """
+    Assign the default start-list order in place: categories by age group, group
+    type, style, then B before A; entries keep their relative order inside a
+    category. Returns the participations in their new running order.
+    """
+    group_map = defaultdict(list)
+    for p in participations:
+        key = (p.style.name, p.group_type, p.age_group, p.difficulty)
+        group_map[key].append(p)
+
+    sorted_keys = sorted(group_map.keys(), key=lambda key: (
+        get_order_index(key[2], AGE_GROUP_ORDER),
+        get_order_index(key[1], GROUP_TYPE_ORDER),
+        get_order_index(key[0], STYLE_ORDER),
+        0 if key[3] == 'B' else 1,   # 🔄 B before A
+    ))
+
+    ordered = []
+    for group_index, group_key in enumerate(sorted_keys):
+        for p in group_map[group_key]:
+            p.group_display_order = group_index
+            p.display_order = len(ordered)
+            ordered.append(p)
+    return ordered
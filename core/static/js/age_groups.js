@@ -0,0 +1,53 @@
+/*
+ * Age-group preview for the registration forms.
+ * Mirrors calculate_age_group() in core/age_groups.py; both are checked against
+ * core/age_group_vectors.json by `manage.py check_age_groups`.
+ */
+(function (root) {
+  'use strict';
+
+  // Upper bounds (inclusive) on the average age, as in calculate_age_group
+  var BOUNDS = [[6, 'Baby'], [8, 'Mini Kids'], [11, 'Kids'], [14, 'Teen'], [17, 'Youth']];
+
+  function parseDate(iso) {
+    var parts = iso.split('-');
+    return [parseInt(parts[0], 10), parseInt(parts[1], 10), parseInt(parts[2], 10)];
+  }
+
+  function ageOn(birth, on) {
+    var age = on[0] - birth[0];
+    if (on[1] < birth[1] || (on[1] === birth[1] && on[2] < birth[2])) age -= 1;
+    return age;
+  }
+
+  // birthDates: ISO "YYYY-MM-DD" strings (blanks ignored); onDate: ISO reference date.
+  // Returns {ageGroup, avgAge} with avgAge rounded half-up to one decimal, or null.
+  function calculate(birthDates, onDate, groupType) {
+    if (groupType === 'Production') return { ageGroup: 'Mixed Age', avgAge: null };
+
+    var on = parseDate(onDate);
+    var ages = [];
+    for (var i = 0; i < birthDates.length; i++) {
+      if (birthDates[i]) ages.push(ageOn(parseDate(birthDates[i]), on));
+    }
+    if (!ages.length) return { ageGroup: 'Adult', avgAge: null };
+
+    var sum = 0;
+    for (var j = 0; j < ages.length; j++) sum += ages[j];
+    var avg = sum / ages.length;
+
+    var group = 'Adult';
+    for (var k = 0; k < BOUNDS.length; k++) {
+      if (avg <= BOUNDS[k][0]) { group = BOUNDS[k][1]; break; }
+    }
+    var n = ages.length;
+    return { ageGroup: group, avgAge: Math.floor((sum * 20 + n) / (2 * n)) / 10 };
+  }
+
+  var api = { calculate: calculate };
+  if (typeof module !== 'undefined' && module.exports) {
+    module.exports = api;
+  } else {
+    root.DanceAgeGroups = api;
+  }
+})(this);
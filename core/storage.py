@@ -0,0 +1,56 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+# Text formats worth compressing; images and fonts are already compressed.
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".json", ".map", ".svg", ".txt", ".webmanifest", ".ico", ".ttf"}
+
+# Smaller files are sent as they are (same threshold as nginx's gzip_min_length default).
+MIN_COMPRESS_SIZE = 256
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes a .gz copy (and a .br copy when the
+    brotli package is installed) next to every compressible file collectstatic
+    produces, so nginx can serve them with gzip_static / brotli_static instead
+    of compressing on every request.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # CSS can be rewritten (and renamed) over several passes, so compress
+        # only once the final names are in the manifest.
+        for name in paths:
+            self._write_compressed(name)
+            hashed_name = self.hashed_files.get(self.hash_key(self.clean_name(name)))
+            if hashed_name and hashed_name != name:
+                self._write_compressed(hashed_name)
+
+    def _write_compressed(self, name):
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as source:
+            content = source.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+
+        # mtime=0 keeps the .gz bytes identical between deploys
+        self._save_if_smaller(name + ".gz", content, gzip.compress(content, compresslevel=9, mtime=0))
+        try:
+            import brotli  # optional; only collectstatic needs it
+        except ImportError:
+            return
+        self._save_if_smaller(name + ".br", content, brotli.compress(content))
+
+    def _save_if_smaller(self, name, original, compressed):
+        if len(compressed) >= len(original):
+            return
+        path = self.path(name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(compressed)
+        os.replace(tmp_path, path)
@@ -0,0 +1,148 @@
+// Music booth service worker: keeps verified copies of the event's tracks
+// and the music page itself so playback survives venue network drops.
+// Only music uploads and the music pages are intercepted; everything else
+// goes straight to the network.
+
+const TRACK_CACHE = "dp-music-tracks-v1";
+const PAGE_CACHE = "dp-music-pages-v1";
+const MUSIC_PREFIX = "/media/music_uploads/";
+const MUSIC_PAGE_RE = /^\/events\/\d+\/music\/(playlist\/)?$/;
+const PREFETCH_CONCURRENCY = 2;
+
+self.addEventListener("install", () => self.skipWaiting());
+self.addEventListener("activate", (event) => event.waitUntil(self.clients.claim()));
+
+self.addEventListener("fetch", (event) => {
+  const request = event.request;
+  if (request.method !== "GET") return;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+
+  if (url.pathname.startsWith(MUSIC_PREFIX)) {
+    event.respondWith(serveTrack(request, url));
+  } else if (MUSIC_PAGE_RE.test(url.pathname)) {
+    event.respondWith(networkFirst(request));
+  }
+});
+
+async function networkFirst(request) {
+  const cache = await caches.open(PAGE_CACHE);
+  try {
+    const response = await fetch(request);
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+  } catch (err) {
+    const cached = await cache.match(request) || await cache.match(request, { ignoreSearch: true });
+    if (cached) return cached;
+    throw err;
+  }
+}
+
+async function serveTrack(request, url) {
+  const cache = await caches.open(TRACK_CACHE);
+  const cached = await cache.match(url.pathname);
+  if (!cached) return fetch(request);
+
+  const range = request.headers.get("Range");
+  if (!range) return cached;
+
+  // <audio> asks for byte ranges; answer them from the cached body.
+  const blob = await cached.blob();
+  const match = /bytes=(\d*)-(\d*)/.exec(range);
+  let start = match && match[1] ? parseInt(match[1], 10) : 0;
+  let end = match && match[2] ? parseInt(match[2], 10) : blob.size - 1;
+  if (match && !match[1] && match[2]) {
+    start = Math.max(0, blob.size - parseInt(match[2], 10));
+    end = blob.size - 1;
+  }
+  end = Math.min(end, blob.size - 1);
+  if (start > end) {
+    return new Response(null, { status: 416, headers: { "Content-Range": `bytes */${blob.size}` } });
+  }
+  return new Response(blob.slice(start, end + 1), {
+    status: 206,
+    headers: {
+      "Content-Type": cached.headers.get("Content-Type") || "audio/mpeg",
+      "Content-Length": String(end - start + 1),
+      "Content-Range": `bytes ${start}-${end}/${blob.size}`,
+      "Accept-Ranges": "bytes",
+    },
+  });
+}
+
+async function sha256Hex(buffer) {
+  const digest = await crypto.subtle.digest("SHA-256", buffer);
+  return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, "0")).join("");
+}
+
+async function cacheTrack(cache, track) {
+  const path = new URL(track.url, self.location.origin).pathname;
+  const existing = await cache.match(path);
+  if (existing && existing.headers.get("X-Content-SHA256") === track.sha256) return true;
+
+  const response = await fetch(path, { credentials: "same-origin", cache: "no-store" });
+  if (!response.ok) return false;
+  const buffer = await response.arrayBuffer();
+  if (await sha256Hex(buffer) !== track.sha256) return false;
+
+  await cache.put(path, new Response(buffer, {
+    headers: {
+      "Content-Type": response.headers.get("Content-Type") || "audio/mpeg",
+      "Content-Length": String(buffer.byteLength),
+      "X-Content-SHA256": track.sha256,
+    },
+  }));
+  return true;
+}
+
+async function cachedTrackCount(tracks) {
+  const cache = await caches.open(TRACK_CACHE);
+  let count = 0;
+  for (const track of tracks) {
+    const hit = await cache.match(new URL(track.url, self.location.origin).pathname);
+    if (hit && hit.headers.get("X-Content-SHA256") === track.sha256) count += 1;
+  }
+  return count;
+}
+
+async function prefetchTracks(tracks, reply) {
+  const cache = await caches.open(TRACK_CACHE);
+  const queue = tracks.slice();
+  let done = 0;
+  let failed = 0;
+
+  async function worker() {
+    while (queue.length) {
+      const track = queue.shift();
+      let ok = false;
+      try {
+        ok = await cacheTrack(cache, track);
+      } catch (err) {
+        ok = false;
+      }
+      if (ok) done += 1; else failed += 1;
+      reply({ type: "progress", done, failed, total: tracks.length });
+    }
+  }
+
+  const workers = [];
+  for (let i = 0; i < PREFETCH_CONCURRENCY; i += 1) workers.push(worker());
+  await Promise.all(workers);
+  reply({ type: "prefetch-done", done, failed, total: tracks.length });
+}
+
+self.addEventListener("message", (event) => {
+  const data = event.data || {};
+  const source = event.source;
+  const reply = (message) => source && source.postMessage(message);
+
+  if (data.type === "prefetch") {
+    event.waitUntil(prefetchTracks(data.tracks || [], reply));
+  } else if (data.type === "status") {
+    event.waitUntil(cachedTrackCount(data.tracks || []).then((cached) => {
+      reply({ type: "status", cached, total: (data.tracks || []).length });
+    }));
+  } else if (data.type === "clear") {
+    event.waitUntil(caches.delete(TRACK_CACHE).then(() => reply({ type: "status", cached: 0, total: 0 })));
+  }
+});
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.test.utils import override_settings
+
+PLAIN_STATIC_STORAGE = {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}
+
+
+def plain_static_storage():
+    """
+    override_settings() for code that renders pages outside a deployment
+    (the test suite, sqlite_stress): {% static %} returns unhashed names, so
+    no collectstatic manifest is needed. Works as a decorator or a `with` block.
+    """
+    return override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC_STORAGE})
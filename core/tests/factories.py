@@ -0,0 +1,101 @@
+import random
+from datetime import date
+
+from django.contrib.auth.models import User
+
+from core.models import (
+    DanceClub, Dancer, DancerParticipation, Event, JudgeScore,
+    Participation, StartListSlot, StyleCategory,
+)
+
+JUDGES_PER_EVENT = 3
+DANCERS_BY_GROUP_TYPE = {"Solo": 1, "Duo": 2, "Group": 4}
+AGE_GROUPS = ["Teen", "Youth", "Adult"]
+
+
+def build_event(entries, seed=0):
+    """
+    Create a scored event with `entries` participations spread over clubs,
+    styles and categories, plus judges and two ceremonies.
+    Returns (event, admin, club_user, judge).
+    """
+    rng = random.Random(seed)
+    tag = f"{entries}-{seed}"
+
+    admin = User.objects.create_superuser(f"admin-{tag}", f"admin-{tag}@example.com", None)
+    event = Event.objects.create(
+        name=f"Budget {tag}", city="Novi Sad", location="Spens", date=date(2030, 1, 1),
+        is_published=True, start_list_published=True, results_published=True,
+    )
+    styles = [
+        StyleCategory.objects.create(event=event, name="Jazz"),
+        StyleCategory.objects.create(event=event, name="Show Dance"),
+    ]
+
+    num_clubs = max(2, entries // 20)
+    club_users = User.objects.bulk_create([
+        User(username=f"club-{tag}-{i}@example.com", email=f"club-{tag}-{i}@example.com")
+        for i in range(num_clubs)
+    ])
+    clubs = DanceClub.objects.bulk_create([
+        DanceClub(
+            user=user, club_name=f"Club {i}", country="RS", city="Novi Sad",
+            phone_number="123", representative_name="Rep", confirmed=True,
+        )
+        for i, user in enumerate(club_users)
+    ])
+
+    group_types = list(DANCERS_BY_GROUP_TYPE)
+    plans = []
+    dancers = []
+    for n in range(entries):
+        group_type = group_types[n % len(group_types)]
+        club = clubs[n % num_clubs]
+        crew = [
+            Dancer(first_name=f"D{n}-{k}", last_name=f"L{rng.randint(0, 999)}",
+                   date_of_birth=date(2008, 1, 1), club=club)
+            for k in range(DANCERS_BY_GROUP_TYPE[group_type])
+        ]
+        dancers.extend(crew)
+        plans.append((group_type, crew))
+    Dancer.objects.bulk_create(dancers)
+
+    category_index = {}
+    participations = []
+    for n, (group_type, crew) in enumerate(plans):
+        style = styles[n % 2]
+        age_group = AGE_GROUPS[(n // 6) % len(AGE_GROUPS)]
+        difficulty = "AB"[(n // 18) % 2]
+        key = (style.name, group_type, age_group, difficulty)
+        participations.append(Participation(
+            event=event, club=crew[0].club, style=style, group_type=group_type, age_group=age_group,
+            difficulty=difficulty, choreographer_name=f"Choreo {n}",
+            choreography_name=f"Routine {n}", group_name=f"Crew {n}" if len(crew) > 2 else "",
+            display_order=n, group_display_order=category_index.setdefault(key, len(category_index)),
+        ))
+    Participation.objects.bulk_create(participations)
+    DancerParticipation.objects.bulk_create([
+        DancerParticipation(participation=p, dancer=d)
+        for p, (_group_type, crew) in zip(participations, plans)
+        for d in crew
+    ])
+
+    judges = [
+        User.objects.create_user(f"judge_{event.id}_j{k}", password=None)
+        for k in range(JUDGES_PER_EVENT)
+    ]
+    JudgeScore.objects.bulk_create([
+        JudgeScore(
+            participation=p, judge=judge,
+            technique=rng.randint(50, 100) / 10, composition=rng.randint(50, 100) / 10,
+            image=rng.randint(50, 100) / 10,
+            show_value=rng.randint(50, 100) / 10 if p.style.name == "Show Dance" else None,
+        )
+        for p in participations
+        for judge in judges
+    ])
+    StartListSlot.objects.bulk_create([
+        StartListSlot(event=event, title="Opening", duration_minutes=5, display_order=0),
+        StartListSlot(event=event, title="Awards", duration_minutes=15, display_order=entries // 2, is_ceremony=True),
+    ])
+    return event, admin, club_users[0], judges[0]
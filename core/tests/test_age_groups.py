@@ -0,0 +1,44 @@
+import shutil
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from core.management.commands.check_age_groups import (
+    bulk_mismatches, js_mismatches, load_cases, python_mismatches,
+)
+
+NODE = shutil.which("node")
+
+
+class AgeGroupVectorTests(SimpleTestCase):
+    """Every implementation of the age-group rules agrees with core/age_group_vectors.json."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cases = load_cases()
+
+    def test_vectors_are_loaded(self):
+        self.assertTrue(self.cases)
+        self.assertIn("Production", {case["group_type"] for case in self.cases})
+
+    def test_calculate_age_group(self):
+        self.assertEqual(python_mismatches(self.cases), [])
+
+    def test_bulk_age_groups_on(self):
+        self.assertEqual(bulk_mismatches(self.cases), [])
+
+    def test_mismatches_are_reported(self):
+        wrong = [{**case, "age_group": "Senior"} for case in self.cases if case["group_type"] != "Production"]
+        self.assertEqual(len(python_mismatches(wrong)), len(wrong))
+
+    @skipUnless(NODE, "Node.js is not installed")
+    def test_browser_copy(self):
+        self.assertEqual(js_mismatches(self.cases, NODE), [])
+
+    def test_command_without_node(self):
+        out = StringIO()
+        call_command("check_age_groups", skip_js=True, stdout=out)
+        self.assertIn(f"{len(self.cases)} age-group vectors agree", out.getvalue())
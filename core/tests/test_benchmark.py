@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from core.management.commands.benchmark import Fixture
+
+SMALL = {"entries": 20, "dancers": 40, "judges": 3, "repeat": 2}
+
+
+class BenchmarkCommandTests(SimpleTestCase):
+    """The harness runs without a database and reports every benchmark as JSON."""
+
+    def run_benchmark(self, **options):
+        out = StringIO()
+        call_command("benchmark", stdout=out, **{**SMALL, **options})
+        return json.loads(out.getvalue())
+
+    def test_reports_every_benchmark(self):
+        report = self.run_benchmark()
+        self.assertEqual(set(report["benchmarks"]), {
+            "compute_final_score_event", "start_list_timeline", "calculate_age_group",
+            "publish_start_list_default_order", "diploma_render",
+        })
+        self.assertEqual(report["params"], {**SMALL, "seed": 0})
+        for name, result in report["benchmarks"].items():
+            with self.subTest(benchmark=name):
+                self.assertEqual(result["rounds"], 2)
+                self.assertLessEqual(result["min_s"], result["median_s"])
+                self.assertGreater(result["per_op_us"], 0)
+        self.assertEqual(report["benchmarks"]["compute_final_score_event"]["ops_per_round"], 20)
+
+    def test_only_runs_the_selected_benchmarks(self):
+        report = self.run_benchmark(only=["start_list_timeline"])
+        self.assertEqual(list(report["benchmarks"]), ["start_list_timeline"])
+
+    def test_unknown_benchmark_is_an_error(self):
+        with self.assertRaisesMessage(CommandError, "Unknown benchmark(s): nope"):
+            call_command("benchmark", only=["nope"], stdout=StringIO(), **SMALL)
+
+    def test_output_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.json")
+            out = StringIO()
+            call_command("benchmark", only=["calculate_age_group"], output=path, stdout=out, **SMALL)
+            with open(path, encoding="utf-8") as fh:
+                report = json.load(fh)
+        self.assertIn("calculate_age_group", report["benchmarks"])
+        self.assertIn(path, out.getvalue())
+
+    def test_fixture_is_reproducible_from_its_seed(self):
+        def shape(fx):
+            return [
+                (p.style.name, p.group_type, p.age_group, [d.id for d in fx.dancer_map[p.id]])
+                for p in fx.participations
+            ]
+
+        self.assertEqual(shape(Fixture(20, 40, 3, seed=1)), shape(Fixture(20, 40, 3, seed=1)))
+        self.assertNotEqual(shape(Fixture(20, 40, 3, seed=1)), shape(Fixture(20, 40, 3, seed=2)))
@@ -0,0 +1,58 @@
+import csv
+import io
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from core.bulk_import import PARTICIPATION_COLUMNS, import_participations
+from core.models import DanceClub, Dancer, Event, Participation, StyleCategory
+
+
+def _sheet(*rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=PARTICIPATION_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({"style": "Jazz", "difficulty": "A", "choreography_name": "Routine", **row})
+    return SimpleUploadedFile("entries.csv", out.getvalue().encode("utf-8"))
+
+
+class ImportParticipationsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.club = DanceClub.objects.create(
+            user=User.objects.create_user("club@example.com"), club_name="Club", country="RS",
+            city="Novi Sad", phone_number="1", representative_name="Rep", confirmed=True,
+        )
+        cls.dancers = [
+            Dancer.objects.create(first_name=f"D{i}", last_name="L", date_of_birth=date(2012, 1, 1), club=cls.club)
+            for i in range(4)
+        ]
+        cls.event = Event.objects.create(name="E", city="Novi Sad", location="Spens", date=date(2030, 1, 1))
+        StyleCategory.objects.create(event=cls.event, name="Jazz")
+
+    def solo(self, **row):
+        return {"group_type": "Solo", "choreographer_name": "Ana", "dancers": str(self.dancers[0].id), **row}
+
+    def test_valid_rows_are_imported(self):
+        report = import_participations(self.event, self.club, _sheet(self.solo(), self.solo(choreography_name="Two")))
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.created, 2)
+        self.assertEqual(Participation.objects.filter(event=self.event).count(), 2)
+
+    def test_overlong_text_is_a_row_error(self):
+        crew = ";".join(str(d.id) for d in self.dancers)
+        report = import_participations(self.event, self.club, _sheet(
+            self.solo(),
+            self.solo(choreographer_name="A" * 256),
+            self.solo(choreography_name="R" * 256),
+            {"group_type": "Group", "choreographer_name": "Ana", "dancers": crew, "group_name": "G" * 256},
+            self.solo(choreographer_name="A" * 255),
+        ))
+        self.assertEqual([number for number, _message in report.errors], [3, 4, 5])
+        self.assertIn("choreographer_name is limited to 255 characters", report.errors[0][1])
+        self.assertIn("choreography_name is limited to 255 characters", report.errors[1][1])
+        self.assertIn("group_name is limited to 255 characters", report.errors[2][1])
+        self.assertFalse(Participation.objects.exists())
@@ -0,0 +1,115 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import OperationalError, connection
+from django.test import RequestFactory, TestCase, override_settings
+
+from core import error_alerts
+from core.db import lock_wait_timeout
+from core.models import OutboxEmail, ServerErrorGroup
+
+
+class SlowReadCache(LocMemCache):
+    """Reads take a moment, as over a network: a get-then-set counter loses updates."""
+
+    def get(self, *args, **kwargs):
+        value = super().get(*args, **kwargs)
+        time.sleep(0.001)
+        return value
+
+
+def _exc_info():
+    try:
+        raise ZeroDivisionError("division by zero")
+    except ZeroDivisionError:
+        return sys.exc_info()
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "core.tests.test_error_alerts.SlowReadCache", "LOCATION": "error-alerts"}},
+    DEVELOPER_ALERT_EMAIL="dev@example.com",
+)
+class ErrorAlertTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/events/12/")
+        self.exc_info = _exc_info()
+
+    def record(self):
+        return error_alerts.record_server_error(self.request, self.exc_info, "Path: /events/12/")
+
+    def count(self, key):
+        return cache.get(error_alerts.COUNT_KEY.format(key))
+
+    def test_errors_are_grouped_and_the_row_written_once_per_window(self):
+        key = self.record()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.record(), key)
+        group = ServerErrorGroup.objects.get()
+        self.assertEqual(group.fingerprint, key)
+        self.assertEqual(group.path, "/events/<n>/")
+        self.assertEqual(group.exception_type, "builtins.ZeroDivisionError")
+        self.assertEqual(self.count(key), 2)
+
+    def test_concurrent_errors_are_all_counted(self):
+        key = self.record()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _n: self.record(), range(200)))
+        self.assertEqual(self.count(key), 201)
+
+    def test_digest_takes_the_counted_errors(self):
+        key = self.record()
+        self.record()
+        self.assertEqual(error_alerts.queue_error_digests(), 1)
+        self.assertEqual(self.count(key), 0)
+        group = ServerErrorGroup.objects.get()
+        self.assertEqual((group.occurrences, group.notified_occurrences), (2, 2))
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to_email, "dev@example.com")
+        self.assertIn("x2", email.subject)
+        self.assertEqual(len(mail.outbox), 0)
+
+        # Within the window nothing more is queued; the new error waits for the next digest
+        self.record()
+        self.assertEqual(error_alerts.queue_error_digests(), 0)
+        self.assertEqual(self.count(key), 1)
+
+    def test_busy_database_does_not_hold_up_the_error_page(self):
+        locked = OperationalError("database is locked")
+        with mock.patch.object(ServerErrorGroup.objects, "update_or_create", side_effect=locked) as write, \
+                self.assertLogs("core.error_alerts", "WARNING"):
+            key = self.record()
+        write.assert_called_once()
+        self.assertEqual(self.count(key), 1)
+        self.assertFalse(ServerErrorGroup.objects.exists())
+
+        # The next occurrence writes the row rather than waiting out the window
+        self.record()
+        self.assertTrue(ServerErrorGroup.objects.filter(fingerprint=key).exists())
+        self.assertEqual(self.count(key), 2)
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite busy timeout")
+class LockWaitTimeoutTests(TestCase):
+    def busy_timeout(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            return cursor.fetchone()[0]
+
+    def test_busy_timeout_is_shortened_inside_the_block_only(self):
+        before = self.busy_timeout()
+        with lock_wait_timeout(error_alerts.WRITE_WAIT_MS):
+            self.assertEqual(self.busy_timeout(), error_alerts.WRITE_WAIT_MS)
+        self.assertEqual(self.busy_timeout(), before)
+
+    def test_busy_timeout_is_restored_after_an_error(self):
+        before = self.busy_timeout()
+        with self.assertRaises(OperationalError):
+            with lock_wait_timeout(50):
+                raise OperationalError("database is locked")
+        self.assertEqual(self.busy_timeout(), before)
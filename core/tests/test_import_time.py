@@ -0,0 +1,39 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from core.management.commands.check_import_time import IMPORT_LINE, LAZY_MODULES, measure_startup
+
+
+class StartupImportTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.total_us, cls.packages, cls.loaded = measure_startup()
+
+    def test_heavy_libraries_are_not_imported_at_startup(self):
+        self.assertEqual([name for name in LAZY_MODULES if name in self.loaded], [])
+
+    def test_startup_loads_the_project(self):
+        self.assertIn("core.views", self.loaded)
+        self.assertIn("dance_portal.urls", self.loaded)
+        self.assertGreater(self.total_us, 0)
+        self.assertIn("django", self.packages)
+
+    def test_import_lines_are_parsed(self):
+        match = IMPORT_LINE.match("import time:       120 |       4512 |   core.views.awards")
+        self.assertEqual(match.groups(), ("120", "4512", "   ", "core.views.awards"))
+        self.assertIsNone(IMPORT_LINE.match("import time: self [us] | cumulative | imported package"))
+
+
+class CheckImportTimeCommandTests(SimpleTestCase):
+    def test_passes_within_budget(self):
+        out = StringIO()
+        call_command("check_import_time", runs=1, budget_ms=60000, stdout=out)
+        self.assertIn("Start-up imports took", out.getvalue())
+
+    def test_fails_over_budget(self):
+        with self.assertRaisesMessage(CommandError, "budget is 0 ms"):
+            call_command("check_import_time", runs=1, budget_ms=0.001, stdout=StringIO())
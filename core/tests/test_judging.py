@@ -0,0 +1,193 @@
+import json
+from decimal import Decimal
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import (
+    DanceClub, Dancer, DancerParticipation, Event, EventPlaybackState, JudgeScore, JudgeSyncBatch,
+    Participation, StartListSlot, StyleCategory,
+)
+from core.testing import plain_static_storage
+
+# judge_view page load for any category size: session, user, event, the
+# judge-ordered entries, playback state (ceremony lock), this category's
+# scores, its dancers, and the club lookup of the base template.
+JUDGE_VIEW_QUERIES = 8
+
+
+class JudgingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = Event.objects.create(name="Judged", city="Novi Sad", location="Spens", date=date(2030, 1, 1))
+        jazz = StyleCategory.objects.create(event=cls.event, name="Jazz")
+        show = StyleCategory.objects.create(event=cls.event, name="Show Dance")
+        clubs = [
+            DanceClub.objects.create(
+                user=User.objects.create_user(f"club{i}@example.com"), club_name=f"Club {i}",
+                country="RS", city="Novi Sad", phone_number="1", representative_name="Rep", confirmed=True,
+            )
+            for i in range(3)
+        ]
+
+        # Category 0: thirty groups of four; category 1: three solos
+        cls.groups = []
+        for n in range(30):
+            club = clubs[n % len(clubs)]
+            p = Participation.objects.create(
+                event=cls.event, club=club, style=jazz, group_type="Group", age_group="Teen", difficulty="A",
+                choreographer_name=f"Choreo {n}", choreography_name=f"Routine {n}", group_name=f"Crew {n}",
+                display_order=n, group_display_order=0,
+            )
+            for k in range(4):
+                dancer = Dancer.objects.create(
+                    first_name=f"D{n}", last_name=f"L{k}", date_of_birth=date(2012, 1, 1), club=club,
+                )
+                DancerParticipation.objects.create(participation=p, dancer=dancer)
+            cls.groups.append(p)
+        cls.solos = [
+            Participation.objects.create(
+                event=cls.event, club=clubs[0], style=show, group_type="Solo", age_group="Teen", difficulty="A",
+                choreographer_name="Choreo", choreography_name=f"Solo {n}", display_order=30 + n,
+                group_display_order=1,
+            )
+            for n in range(3)
+        ]
+
+        cls.judge = User.objects.create_user(f"judge_{cls.event.id}_j1")
+        other_judge = User.objects.create_user(f"judge_{cls.event.id}_j2")
+        JudgeScore.objects.create(participation=cls.groups[0], judge=cls.judge, technique=8, composition=7, image=9)
+        JudgeScore.objects.create(participation=cls.groups[1], judge=other_judge, technique=5, composition=5, image=5)
+        JudgeScore.objects.create(participation=cls.solos[0], judge=cls.judge, technique=6, composition=6, image=6)
+
+
+
+@plain_static_storage()
+class JudgeViewTests(JudgingTestCase):
+    def setUp(self):
+        self.client.force_login(self.judge)
+        self.url = reverse("judge_view", args=[self.event.id])
+
+    def test_thirty_entry_category_query_count(self):
+        with self.assertNumQueries(JUDGE_VIEW_QUERIES):
+            response = self.client.get(self.url, {"group": 0})
+        self.assertEqual(len(response.context["current_entries"]), 30)
+
+    def test_query_count_does_not_depend_on_category_size(self):
+        with self.assertNumQueries(JUDGE_VIEW_QUERIES):
+            response = self.client.get(self.url, {"group": 1})
+        self.assertEqual(len(response.context["current_entries"]), 3)
+
+    def test_entries_carry_club_dancers_and_group_name(self):
+        entries = self.client.get(self.url, {"group": 0}).context["current_entries"]
+        first = entries[0]
+        self.assertEqual(first["id"], self.groups[0].id)
+        self.assertEqual(first["club_name"], "Club 0")
+        self.assertEqual(first["dancers"], ["D0 L0", "D0 L1", "D0 L2", "D0 L3"])
+        self.assertEqual(first["group_name"], "Crew 0")
+        self.assertEqual(first["fields"], ["technique", "composition", "image"])
+
+    def test_scores_are_this_judges_for_the_current_category(self):
+        response = self.client.get(self.url, {"group": 0})
+        self.assertEqual(set(response.context["existing_scores"]), {self.groups[0].id})
+        self.assertEqual(response.context["current_entries"][0]["scores"]["technique"], 8)
+
+
+def _ms(moment):
+    return moment.timestamp() * 1000
+
+
+class JudgeSyncTests(JudgingTestCase):
+    """Offline score batches: idempotent replays, last write wins, ceremony lock, bad input."""
+
+    def setUp(self):
+        self.client.force_login(self.judge)
+        self.url = reverse("judge_sync_scores", args=[self.event.id])
+
+    def sync(self, body):
+        return self.client.post(self.url, body if isinstance(body, str) else json.dumps(body),
+                                content_type="application/json")
+
+    def send(self, *scores, batch_id="b1"):
+        response = self.sync({"batch_id": batch_id, "scores": list(scores)})
+        self.assertEqual(response.status_code, 200)
+        return [r["status"] for r in response.json()["results"]]
+
+    def item(self, participation, value=7, **extra):
+        return {"participation_id": participation.id, "technique": value, "composition": value,
+                "image": value, **extra}
+
+    def stored(self, participation):
+        return JudgeScore.objects.get(participation=participation, judge=self.judge)
+
+    def test_new_scores_are_saved(self):
+        self.assertEqual(self.send(self.item(self.groups[2], 8.5)), ["saved"])
+        self.assertEqual(self.stored(self.groups[2]).technique, Decimal("8.50"))
+
+    def test_replayed_batch_gets_the_stored_answer(self):
+        first = self.sync({"batch_id": "b1", "scores": [self.item(self.groups[2], 8)]}).json()
+        replay = self.sync({"batch_id": "b1", "scores": [self.item(self.groups[2], 3)]})
+        self.assertEqual(replay.json(), first)
+        self.assertEqual(self.stored(self.groups[2]).technique, 8)
+        self.assertEqual(JudgeSyncBatch.objects.filter(judge=self.judge).count(), 1)
+
+    def test_last_write_wins(self):
+        changed = timezone.now() - timedelta(minutes=5)
+        JudgeScore.objects.filter(participation=self.groups[0], judge=self.judge).update(updated_at=changed)
+
+        older = self.item(self.groups[0], 2, updated_at=_ms(changed - timedelta(minutes=1)))
+        self.assertEqual(self.send(older), ["stale"])
+        self.assertEqual(self.stored(self.groups[0]).technique, 8)
+
+        newer = self.item(self.groups[0], 4, updated_at=_ms(changed + timedelta(minutes=1)))
+        self.assertEqual(self.send(newer, batch_id="b2"), ["saved"])
+        self.assertEqual(self.stored(self.groups[0]).technique, 4)
+
+    def test_categories_before_the_last_ceremony_are_locked(self):
+        StartListSlot.objects.create(event=self.event, title="Awards", duration_minutes=15, display_order=30, is_ceremony=True)
+        EventPlaybackState.objects.create(event=self.event, current_highlight_key="Show Dance|Solo|Teen|A")
+        statuses = self.send(self.item(self.groups[0], 2), self.item(self.solos[1], 2) | {"show_value": 2})
+        self.assertEqual(statuses, ["locked", "saved"])
+        self.assertEqual(self.stored(self.groups[0]).technique, 8)
+
+    def test_malformed_bodies_are_rejected(self):
+        for body in ("not json", "[]", "[1, 2]", "42", '"b1"', "null", {"scores": []}, {"batch_id": "b1"},
+                     {"batch_id": "b1", "scores": {}}):
+            with self.subTest(body=body):
+                self.assertEqual(self.sync(body).status_code, 400)
+        self.assertFalse(JudgeSyncBatch.objects.exists())
+
+    def test_malformed_scores_are_invalid(self):
+        statuses = self.send(
+            "not an item",
+            {"participation_id": "x", "technique": 5},
+            {"participation_id": self.solos[0].id + 1000, "technique": 5},
+            self.item(self.groups[2], float("nan")),
+            self.item(self.groups[2], float("inf")),
+            self.item(self.groups[2], "NaN"),
+            self.item(self.groups[2], "sNaN"),
+            self.item(self.groups[2], 11),
+            self.item(self.groups[2], "seven"),
+            {"participation_id": self.groups[2].id},
+        )
+        self.assertEqual(set(statuses), {"invalid"})
+        self.assertFalse(JudgeScore.objects.filter(participation=self.groups[2]).exists())
+
+    def test_unusable_timestamps_fall_back_to_the_server_clock(self):
+        before = timezone.now()
+        stamps = [1e20, float("nan"), float("inf"), -1e15, "yesterday", _ms(before + timedelta(days=1))]
+        for n, stamp in enumerate(stamps):
+            with self.subTest(updated_at=stamp):
+                item = self.item(self.groups[2], 5, updated_at=stamp)
+                self.assertEqual(self.send(item, batch_id=f"t{n}"), ["saved"])
+                self.assertTrue(before <= self.stored(self.groups[2]).updated_at <= timezone.now())
+
+    def test_client_timestamps_are_kept(self):
+        changed = datetime(2025, 12, 31, 18, 30, tzinfo=dt_timezone.utc)
+        self.send(self.item(self.groups[2], updated_at=_ms(changed)),
+                  self.item(self.groups[3], updated_at="2025-12-31T18:30:00Z"))
+        self.assertEqual(self.stored(self.groups[2]).updated_at, changed)
+        self.assertEqual(self.stored(self.groups[3]).updated_at, changed)
@@ -0,0 +1,67 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.management.commands.merge_participations import duplicate_pairs
+from core.models import DanceClub, Dancer, DancerParticipation, Event, Participation, StyleCategory
+
+
+class MergeParticipationsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        club = DanceClub.objects.create(
+            user=User.objects.create_user("club@example.com"), club_name="Club", country="RS",
+            city="Novi Sad", phone_number="1", representative_name="Rep", confirmed=True,
+        )
+        cls.dancers = [
+            Dancer.objects.create(first_name=f"D{i}", last_name="L", date_of_birth=date(2012, 1, 1), club=club)
+            for i in range(3)
+        ]
+        cls.event = Event.objects.create(name="E", city="Novi Sad", location="Spens", date=date(2030, 1, 1))
+        cls.other_event = Event.objects.create(name="F", city="Novi Sad", location="Spens", date=date(2030, 2, 1))
+        cls.jazz = StyleCategory.objects.create(event=cls.event, name="Jazz")
+        cls.show = StyleCategory.objects.create(event=cls.event, name="Show Dance")
+        other_jazz = StyleCategory.objects.create(event=cls.other_event, name="Jazz")
+
+        cls.primary = cls.entry(cls.event, cls.jazz, "Ana Čolić", cls.dancers[0])
+        cls.duplicate = cls.entry(cls.event, cls.jazz, "  ANA ČOLIĆ ", cls.dancers[1], cls.dancers[0])
+        cls.other_style = cls.entry(cls.event, cls.show, "Ana Čolić", cls.dancers[2])
+        cls.other_event_entry = cls.entry(cls.other_event, other_jazz, "ana čolić", cls.dancers[2])
+
+    @classmethod
+    def entry(cls, event, style, choreographer, *dancers):
+        p = Participation.objects.create(
+            event=event, style=style, group_type="Duo", age_group="Teen", difficulty="A",
+            choreographer_name=choreographer,
+        )
+        for dancer in dancers:
+            DancerParticipation.objects.create(participation=p, dancer=dancer)
+        return p
+
+    def test_non_ascii_names_match_case_insensitively(self):
+        pairs = duplicate_pairs([self.event.id, self.other_event.id])
+        self.assertEqual(pairs, [(self.duplicate.id, self.primary.id, self.event.id)])
+
+    def test_merge_moves_dancers_onto_the_primary(self):
+        call_command("merge_participations", stdout=StringIO())
+        self.assertFalse(Participation.objects.filter(id=self.duplicate.id).exists())
+        self.assertEqual(
+            sorted(DancerParticipation.objects.filter(participation=self.primary).values_list("dancer_id", flat=True)),
+            [self.dancers[0].id, self.dancers[1].id],
+        )
+        self.assertTrue(Participation.objects.filter(id=self.other_style.id).exists())
+        self.assertTrue(Participation.objects.filter(id=self.other_event_entry.id).exists())
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command("merge_participations", "--dry-run", stdout=out)
+        self.assertIn("Would merge 1 duplicate(s)", out.getvalue())
+        self.assertTrue(Participation.objects.filter(id=self.duplicate.id).exists())
+        self.assertEqual(DancerParticipation.objects.filter(participation=self.primary).count(), 1)
+
+    def test_event_option_limits_the_merge(self):
+        call_command("merge_participations", "--event", str(self.other_event.id), stdout=StringIO())
+        self.assertTrue(Participation.objects.filter(id=self.duplicate.id).exists())
@@ -0,0 +1,136 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPRecipientsRefused
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import OutboxEmail
+from core.outbox import RETRY_BASE_SECONDS, enqueue_email, prune_sent, send_pending
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that refuses some recipients, or the whole connection."""
+
+    def __init__(self, refuse=(), down=False, **kwargs):
+        super().__init__(**kwargs)
+        self.refuse = set(refuse)
+        self.down = down
+
+    def open(self):
+        if self.down:
+            raise ConnectionRefusedError("Connection refused")
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & self.refuse:
+                raise SMTPRecipientsRefused({message.to[0]: (550, b"No such user")})
+        return super().send_messages(messages)
+
+
+@override_settings(DEFAULT_FROM_EMAIL="office@example.com", EMAIL_OUTBOX_RATE_PER_MINUTE=0)
+class OutboxTests(TestCase):
+    def test_enqueue_queues_one_message_per_distinct_recipient(self):
+        queued = enqueue_email("Hello", "Body", ["a@example.com", "", " A@example.com ", "b@example.com", None])
+        self.assertEqual(queued, 2)
+        rows = OutboxEmail.objects.order_by("id")
+        self.assertEqual([r.to_email for r in rows], ["a@example.com", "b@example.com"])
+        self.assertTrue(all(r.status == OutboxEmail.PENDING and r.from_email == "office@example.com" for r in rows))
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_pending_delivers_due_messages(self):
+        enqueue_email("Hello", "Body", ["a@example.com", "b@example.com"])
+        later = OutboxEmail.objects.create(
+            subject="Later", body="Body", to_email="c@example.com",
+            next_attempt_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        self.assertEqual(send_pending(), (2, 0))
+        self.assertEqual([m.to for m in mail.outbox], [["a@example.com"], ["b@example.com"]])
+        sent = OutboxEmail.objects.filter(status=OutboxEmail.SENT)
+        self.assertEqual(sent.count(), 2)
+        self.assertTrue(all(r.sent_at and r.attempts == 1 for r in sent))
+        later.refresh_from_db()
+        self.assertEqual(later.status, OutboxEmail.PENDING)
+
+    def test_failed_message_is_retried_with_backoff(self):
+        enqueue_email("Hello", "Body", ["bad@example.com", "good@example.com"])
+        before = timezone.now()
+
+        with self.assertLogs("core.outbox", "WARNING") as logs:
+            self.assertEqual(send_pending(connection=FlakyBackend(refuse={"bad@example.com"})), (1, 1))
+        self.assertIn("bad@example.com", logs.output[0])
+        bad = OutboxEmail.objects.get(to_email="bad@example.com")
+        self.assertEqual(bad.status, OutboxEmail.PENDING)
+        self.assertEqual(bad.attempts, 1)
+        self.assertIn("No such user", bad.last_error)
+        self.assertGreaterEqual(bad.next_attempt_at, before + timedelta(seconds=RETRY_BASE_SECONDS))
+        self.assertEqual(OutboxEmail.objects.get(to_email="good@example.com").status, OutboxEmail.SENT)
+
+        # Not due yet: the next pass leaves it alone
+        self.assertEqual(send_pending(connection=FlakyBackend(refuse={"bad@example.com"})), (0, 0))
+
+    def test_message_is_marked_failed_after_max_attempts(self):
+        enqueue_email("Hello", "Body", ["bad@example.com"])
+        for _attempt in range(3):
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            with self.assertLogs("core.outbox", "WARNING"):
+                send_pending(max_attempts=3, connection=FlakyBackend(refuse={"bad@example.com"}))
+        bad = OutboxEmail.objects.get()
+        self.assertEqual(bad.status, OutboxEmail.FAILED)
+        self.assertEqual(bad.attempts, 3)
+
+    def test_unreachable_server_leaves_the_queue_untouched(self):
+        enqueue_email("Hello", "Body", ["a@example.com"])
+        with self.assertLogs("core.outbox", "WARNING") as logs:
+            self.assertEqual(send_pending(connection=FlakyBackend(down=True)), (0, 0))
+        self.assertIn("left queued", logs.output[0])
+        queued = OutboxEmail.objects.get()
+        self.assertEqual((queued.status, queued.attempts), (OutboxEmail.PENDING, 0))
+
+    def test_prune_sent_keeps_recent_and_unsent_messages(self):
+        old = timezone.now() - timedelta(days=40)
+        OutboxEmail.objects.create(subject="Old", body="", to_email="a@example.com",
+                                   status=OutboxEmail.SENT, sent_at=old)
+        OutboxEmail.objects.create(subject="New", body="", to_email="a@example.com",
+                                   status=OutboxEmail.SENT, sent_at=timezone.now())
+        OutboxEmail.objects.create(subject="Failed", body="", to_email="a@example.com", status=OutboxEmail.FAILED)
+        self.assertEqual(prune_sent(30), 1)
+        self.assertEqual(sorted(OutboxEmail.objects.values_list("subject", flat=True)), ["Failed", "New"])
+
+
+class StopLoop(Exception):
+    pass
+
+
+@override_settings(DEFAULT_FROM_EMAIL="office@example.com", EMAIL_OUTBOX_RATE_PER_MINUTE=0)
+class SendOutboxLoopTests(TestCase):
+    def old_sent(self, subject):
+        return OutboxEmail.objects.create(subject=subject, body="", to_email="a@example.com",
+                                          status=OutboxEmail.SENT, sent_at=timezone.now() - timedelta(days=40))
+
+    def test_loop_prunes_once_per_interval(self):
+        self.old_sent("Old")
+        enqueue_email("Hello", "Body", ["a@example.com"])
+
+        def sleep_once(_seconds):
+            # Another old message appears before the second pass; the second sleep ends the worker
+            if sleep.call_count > 1:
+                raise StopLoop
+            self.old_sent("Old again")
+
+        out = StringIO()
+        with mock.patch("core.management.commands.send_outbox.time.sleep", side_effect=sleep_once) as sleep, \
+                self.assertRaises(StopLoop):
+            call_command("send_outbox", loop=10, keep_days=30, stdout=out)
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertIn("Sent 1 email(s)", out.getvalue())
+        self.assertIn("Pruned 1 sent email(s) older than 30 days.", out.getvalue())
+        # The second pass fell within the prune interval
+        self.assertEqual(sorted(OutboxEmail.objects.values_list("subject", flat=True)), ["Hello", "Old again"])
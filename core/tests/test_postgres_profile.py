@@ -0,0 +1,68 @@
+import time
+from io import StringIO
+from unittest import skipIf, skipUnless
+
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.db import read_only_transaction, statement_timeout
+from core.models import Event
+
+POSTGRES = connection.vendor == "postgresql"
+
+
+def _write_view(request):
+    Event.objects.filter(pk=0).update(name="x")
+    return HttpResponse("ok")
+
+
+@skipIf(POSTGRES, "behaviour on the other backends")
+class OtherBackendTests(TestCase):
+    def test_decorators_leave_the_view_unchanged(self):
+        request = RequestFactory().get("/")
+        for decorated in (statement_timeout(200)(_write_view), read_only_transaction(_write_view)):
+            with CaptureQueriesContext(connection) as queries:
+                response = decorated(request)
+            self.assertEqual(response.content, b"ok")
+            self.assertEqual(len(queries), 1)
+
+    def test_profile_check_is_skipped(self):
+        out = StringIO()
+        call_command("postgres_profile_check", stdout=out)
+        self.assertIn("Skipped", out.getvalue())
+
+
+@skipUnless(POSTGRES, "PostgreSQL profile")
+class PostgresProfileTests(TransactionTestCase):
+    def test_statement_timeout_cancels_slow_queries(self):
+        @statement_timeout(200)
+        def slow_view(request):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(2)")
+            return HttpResponse()
+
+        started = time.perf_counter()
+        with self.assertRaises(DatabaseError):
+            slow_view(RequestFactory().get("/"))
+        self.assertLess(time.perf_counter() - started, 1.5)
+
+    def test_statement_timeout_is_reset_after_the_view(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            before = cursor.fetchone()[0]
+        statement_timeout(200)(_write_view)(RequestFactory().get("/"))
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], before)
+
+    def test_read_only_transaction_rejects_writes(self):
+        with self.assertRaisesMessage(DatabaseError, "read-only"):
+            read_only_transaction(_write_view)(RequestFactory().get("/"))
+
+    def test_profile_check_passes(self):
+        out = StringIO()
+        call_command("postgres_profile_check", stdout=out)
+        self.assertNotIn("✗", out.getvalue())
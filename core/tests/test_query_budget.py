@@ -0,0 +1,113 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Participation
+from core.testing import plain_static_storage
+
+from .factories import build_event
+
+SIZES = (10, 100, 1000)
+
+# Queries per page load, the same for every event size. A new query in a
+# template loop shows up here as a count that grows with the event.
+QUERY_BUDGETS = {
+    "start_list": 10,
+    "start_list (club)": 11,
+    "manage_start_list": 10,
+    "judge_view": 8,
+    "event_awards_view": 9,
+    "category_results": 9,
+    "list_event_participants": 11,
+    "list_event_participants (summary)": 8,
+    "list_event_participants (club)": 12,
+    "event_music_view": 11,
+    "club_dashboard": 6,
+    "event_list": 7,
+    "event_list (club)": 8,
+}
+
+
+def view_requests(event, admin, club_user, judge):
+    """{label: (user, url)} for every view whose query count is pinned."""
+    first = Participation.objects.filter(event=event).select_related("style").order_by("id").first()
+    group_key = f"{first.style.name}|{first.group_type}|{first.age_group}|{first.difficulty}"
+    participants = reverse("list_event_participants", args=[event.id])
+    return {
+        "start_list": (admin, reverse("start_list", args=[event.id])),
+        "start_list (club)": (club_user, reverse("start_list", args=[event.id])),
+        "manage_start_list": (admin, reverse("manage_start_list", args=[event.id])),
+        "judge_view": (judge, f"{reverse('judge_view', args=[event.id])}?group=0"),
+        "event_awards_view": (admin, reverse("event_awards", args=[event.id])),
+        "category_results": (admin, reverse("category_results", args=[event.id, group_key])),
+        "list_event_participants": (admin, participants),
+        "list_event_participants (summary)": (admin, f"{participants}?view=summary"),
+        "list_event_participants (club)": (club_user, participants),
+        "event_music_view": (admin, reverse("event_music", args=[event.id])),
+        "club_dashboard": (admin, reverse("club_dashboard")),
+        "event_list": (admin, reverse("event_list")),
+        "event_list (club)": (club_user, reverse("event_list")),
+    }
+
+
+@plain_static_storage()
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "query-budget"}},
+    REQUEST_METRICS_SLOW_QUERIES=10 ** 9,
+    REQUEST_METRICS_SLOW_MS=10 ** 9,
+)
+class QueryBudgetTests(TestCase):
+    """Every core view runs QUERY_BUDGETS[view] queries for events of 10, 100 and 1,000 entries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.requests = {size: view_requests(*build_event(size)) for size in SIZES}
+
+    def assertWithinBudget(self, label):
+        for size in SIZES:
+            user, url = self.requests[size][label]
+            with self.subTest(entries=size):
+                self.client.force_login(user)
+                cache.clear()
+                with self.assertNumQueries(QUERY_BUDGETS[label]):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_start_list(self):
+        self.assertWithinBudget("start_list")
+
+    def test_start_list_club(self):
+        self.assertWithinBudget("start_list (club)")
+
+    def test_manage_start_list(self):
+        self.assertWithinBudget("manage_start_list")
+
+    def test_judge_view(self):
+        self.assertWithinBudget("judge_view")
+
+    def test_event_awards_view(self):
+        self.assertWithinBudget("event_awards_view")
+
+    def test_category_results(self):
+        self.assertWithinBudget("category_results")
+
+    def test_list_event_participants(self):
+        self.assertWithinBudget("list_event_participants")
+
+    def test_list_event_participants_summary(self):
+        self.assertWithinBudget("list_event_participants (summary)")
+
+    def test_list_event_participants_club(self):
+        self.assertWithinBudget("list_event_participants (club)")
+
+    def test_event_music_view(self):
+        self.assertWithinBudget("event_music_view")
+
+    def test_club_dashboard(self):
+        self.assertWithinBudget("club_dashboard")
+
+    def test_event_list(self):
+        self.assertWithinBudget("event_list")
+
+    def test_event_list_club(self):
+        self.assertWithinBudget("event_list (club)")
@@ -0,0 +1,114 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.cleanup import delete_event_fast, purge_pending_files
+from core.models import DancerParticipation, Participation, PendingFileDeletion
+from core.snapshots import (
+    RESULTS, START_LIST, refresh_snapshots, snapshot_dir, snapshot_file_names, snapshot_url,
+)
+from core.testing import plain_static_storage
+
+from .factories import build_event
+
+
+@plain_static_storage()
+class SnapshotTestCase(TestCase):
+    """Snapshots are written under a throwaway MEDIA_ROOT."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp(prefix="dp-snapshots-")
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.event, self.admin, self.club_user, self.judge = build_event(10)
+
+    def snapshot(self, name):
+        path = Path(settings.MEDIA_ROOT) / snapshot_dir(self.event) / f"{name}.json"
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def start_list_titles(self):
+        return [slot["title"] for slot in self.snapshot(START_LIST)["slots"] if slot["kind"] != "ceremony"]
+
+    def result_entry_ids(self):
+        return sorted(r["entry_id"] for c in self.snapshot(RESULTS)["categories"] for r in c["results"])
+
+
+class SnapshotDeletionTests(SnapshotTestCase):
+    def test_event_deletion_queues_its_snapshots(self):
+        refresh_snapshots(self.event.id)
+        names = snapshot_file_names(self.event)
+        self.assertEqual(len(names), 4)
+
+        delete_event_fast(self.event)
+        queued = set(PendingFileDeletion.objects.values_list("name", flat=True))
+        self.assertTrue(set(names) <= queued)
+
+        purge_pending_files()
+        self.assertEqual(snapshot_file_names(self.event), [])
+        self.assertIsNone(snapshot_url(self.event, RESULTS))
+        self.assertIsNone(snapshot_url(self.event, START_LIST))
+
+
+class SnapshotRefreshTests(SnapshotTestCase):
+    """Entry edits made outside the start list and awards pages reach the published snapshots."""
+
+    def setUp(self):
+        super().setUp()
+        refresh_snapshots(self.event.id)
+        self.client.force_login(self.admin)
+        self.entry = Participation.objects.filter(event=self.event, group_type="Solo").order_by("id").first()
+
+    def test_editing_an_entry(self):
+        dancer = DancerParticipation.objects.filter(participation=self.entry).first().dancer
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("edit_participation", args=[self.entry.id]), {
+                "dancers": [dancer.id],
+                "style": self.entry.style_id,
+                "group_type": "Solo",
+                "difficulty": self.entry.difficulty,
+                "choreographer_name": self.entry.choreographer_name,
+                "choreography_name": "Renamed Routine",
+            })
+        self.assertIn("Renamed Routine", self.start_list_titles())
+
+    def test_deleting_an_entry(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("delete_participation", args=[self.entry.id]))
+        self.assertNotIn(self.entry.choreography_name, self.start_list_titles())
+        self.assertNotIn(self.entry.id, self.result_entry_ids())
+
+    def test_recomputing_age_groups(self):
+        # Every dancer was born in 2008: all entries are Adult on the 2030 event date
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("recompute_age_groups", args=[self.event.id]))
+        self.assertEqual({c["age_group"] for c in self.snapshot(RESULTS)["categories"]}, {"Adult"})
+
+
+class SnapshotLanguageTests(SnapshotTestCase):
+    """Snapshots exist in LANGUAGE_CODE only; other languages stay on the live pages."""
+
+    def setUp(self):
+        super().setUp()
+        refresh_snapshots(self.event.id)
+        self.client.force_login(self.club_user)
+
+    def test_default_language_is_sent_to_the_snapshot(self):
+        response = self.client.get(reverse("event_awards", args=[self.event.id]))
+        self.assertRedirects(response, snapshot_url(self.event, RESULTS), fetch_redirect_response=False)
+        response = self.client.get(reverse("start_list", args=[self.event.id]))
+        self.assertEqual(response.context["snapshot_url"], snapshot_url(self.event, START_LIST))
+
+    def test_other_languages_get_the_live_page(self):
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = "sr-Latn"
+        response = self.client.get(reverse("event_awards", args=[self.event.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "core/event_awards.html")
+        response = self.client.get(reverse("start_list", args=[self.event.id]))
+        self.assertIsNone(response.context["snapshot_url"])
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.db import write_transaction
+from core.models import Event
+
+
+def _begins(queries):
+    return [q["sql"] for q in queries if q["sql"].startswith("BEGIN")]
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite write profile")
+class WriteTransactionTests(TransactionTestCase):
+    def test_write_paths_take_the_lock_at_begin(self):
+        with CaptureQueriesContext(connection) as queries:
+            with write_transaction():
+                Event.objects.count()
+        self.assertEqual(_begins(queries), ["BEGIN IMMEDIATE"])
+
+    def test_other_transactions_stay_deferred(self):
+        with write_transaction():
+            pass
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                Event.objects.count()
+        self.assertEqual(_begins(queries), ["BEGIN"])
+
+    def test_nested_block_joins_the_outer_transaction(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                with write_transaction():
+                    Event.objects.count()
+        self.assertEqual(_begins(queries), ["BEGIN"])
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite write profile")
+class JudgeSaveStressTests(SimpleTestCase):
+    def test_concurrent_judges_never_hit_a_lock_error(self):
+        # sqlite_stress forks its writers against a scratch database of its own,
+        # so it runs in a fresh interpreter rather than on the test database.
+        proc = subprocess.run(
+            [sys.executable, "manage.py", "sqlite_stress", "--judges", "4", "--requests", "10", "--entries", "10"],
+            cwd=settings.BASE_DIR, env={**os.environ, "USE_POSTGRES": "0"},
+            capture_output=True, text=True, timeout=300,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        self.assertIn("40 submissions saved without lock errors", proc.stdout)
@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from core.forms import GROUP_DANCER_LIMITS
+from core.models import Event, Participation, StyleCategory
+from core.start_list import default_start_list_order
+
+
+def _entry(style, group_type, age_group, difficulty):
+    return Participation(style=StyleCategory(name=style), group_type=group_type,
+                         age_group=age_group, difficulty=difficulty)
+
+
+class DefaultStartListOrderTests(TestCase):
+    def test_categories_by_age_group_type_style_then_b_before_a(self):
+        adult_solo_jazz_a = _entry("Lyrical Jazz", "Solo", "Adult", "A")
+        kids_duo_show_a = _entry("Show Dance", "Duo", "Kids", "A")
+        kids_solo_jazz_a = _entry("Lyrical Jazz", "Solo", "Kids", "A")
+        kids_solo_show_a = _entry("Show Dance", "Solo", "Kids", "A")
+        kids_solo_show_b = _entry("Show Dance", "Solo", "Kids", "B")
+        kids_solo_show_b2 = _entry("Show Dance", "Solo", "Kids", "B")
+        entries = [adult_solo_jazz_a, kids_duo_show_a, kids_solo_show_b, kids_solo_jazz_a,
+                   kids_solo_show_a, kids_solo_show_b2]
+
+        ordered = default_start_list_order(entries)
+        self.assertEqual(ordered, [kids_solo_show_b, kids_solo_show_b2, kids_solo_show_a, kids_solo_jazz_a,
+                                   kids_duo_show_a, adult_solo_jazz_a])
+        self.assertEqual([p.display_order for p in ordered], list(range(6)))
+        self.assertEqual([p.group_display_order for p in ordered], [0, 0, 1, 2, 3, 4])
+
+
+class PopulateTestEventTests(TestCase):
+    def test_group_sizes_follow_the_registration_limits(self):
+        call_command("populate_test_event", entries=200, clubs=2, dancers=40, judges=1, seed=3,
+                     no_scores=True, stdout=StringIO())
+        event = Event.objects.get()
+        entries = Participation.objects.filter(event=event).annotate(crew=Count("dancer_links"))
+        self.assertEqual(entries.count(), 200)
+        self.assertIn("Formation", {p.group_type for p in entries})
+        for p in entries:
+            low, high = GROUP_DANCER_LIMITS[p.group_type]
+            self.assertTrue(low <= p.crew <= high, (p.group_type, p.crew))
+        orders = list(entries.order_by("display_order").values_list("display_order", flat=True))
+        self.assertEqual(orders, list(range(200)))
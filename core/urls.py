@@ -19,11 +19,13 @@ urlpatterns = [
     path('add/', views.add_dancer, name='add_dancer'),
     path('clubs/<int:club_id>/dancers/add/', views.add_dancer, name='admin_add_dancer'),
     path('list/', views.list_dancers, name='list_dancers'),
+    path('dancers/import/', views.import_dancers, name='import_dancers'),
     path('dancers/delete/<int:dancer_id>/', views.delete_dancer, name='delete_dancer'),
 
     # Superuser: Dancer management by club
     path('clubs/<int:club_id>/dancers/', views.list_dancers, name='admin_list_dancers'),
     path('clubs/<int:club_id>/dancers/add/', views.add_dancer, name='add_dancer_by_club'),
+    path('clubs/<int:club_id>/dancers/import/', views.import_dancers, name='admin_import_dancers'),
     path('clubs/<int:club_id>/dancers/<int:dancer_id>/delete/', views.delete_dancer, name='delete_dancer_by_club'),
 
     # Club management (admin)
@@ -37,9 +39,12 @@ urlpatterns = [
     # Event registration (by club or admin)
     path('events/<int:event_id>/register/', views.register_dancer, name='register_dancer'),
     path('events/<int:event_id>/register/<int:club_id>/', views.register_dancer, name='admin_register_dancer'),
+    path('events/<int:event_id>/register/import/', views.import_participations, name='import_participations'),
 
     # View participants for an event
     path('events/<int:event_id>/participants/', views.list_event_participants, name='list_event_participants'),
+    path('events/<int:event_id>/participants/rows.json', views.list_event_participants_rows, name='list_event_participants_rows'),
+    path('events/<int:event_id>/participants/export.csv', views.export_registrations_csv, name='export_registrations_csv'),
     path('my/participants/', views.my_participants_redirect, name='my_participants_redirect'),
 
     path('events/<int:event_id>/styles/manage/', views.manage_styles, name='manage_styles'),
@@ -51,7 +56,9 @@ urlpatterns = [
     path('participation/<int:participation_id>/delete/', views.delete_participation, name='delete_participation'),
     path('participation/delete/', views.delete_participation_group, name='delete_participation_group'),
 
+    path('events/<int:event_id>/age-groups/', views.recompute_age_groups, name='recompute_age_groups'),
     path('events/<int:event_id>/startlist/', views.start_list, name='start_list'),
+    path('events/<int:event_id>/startlist/export.csv', views.export_start_list_csv, name='export_start_list_csv'),
     path('events/<int:event_id>/startlist/manage/', views.manage_start_list, name='manage_start_list'),
     path('public/events/', views.event_list_public, name='event_list_public'),
 
@@ -59,21 +66,31 @@ urlpatterns = [
     path('events/<int:event_id>/startlist/unpublish/', views.unpublish_start_list, name='unpublish_start_list'),
     
     path("events/<int:event_id>/music/", views.event_music_view, name="event_music"),
+    path("events/<int:event_id>/music/state/", views.event_music_state, name="event_music_state"),
+    path("events/<int:event_id>/music/playlist/", views.event_music_playlist, name="event_music_playlist"),
+    path("music-sw.js", views.music_service_worker, name="music_service_worker"),
     path("events/<int:event_id>/music/download-all/", views.download_event_music, name="download_event_music"),
 
     path('manage/clubs/pending/', views.pending_club_requests, name='pending_club_requests'),
 
     path('events/<int:event_id>/create_judges/', views.create_judges_for_event, name='create_judges'),
     path('events/<int:event_id>/judge/', views.judge_view, name='judge_view'),
+    path('events/<int:event_id>/judge/data/', views.judge_event_data, name='judge_event_data'),
+    path('events/<int:event_id>/judge/sync/', views.judge_sync_scores, name='judge_sync_scores'),
     path('events/<int:event_id>/delete_judges/', views.delete_judges_for_event, name='delete_judges'),
 
     path("events/<int:event_id>/awards/generate/", views.generate_diploma, name="generate_diploma"),
     path("events/<int:event_id>/awards/", event_awards_view, name="event_awards"),
+    path("events/<int:event_id>/awards/export.csv", views.export_results_csv, name="export_results_csv"),
     
     path("events/<int:event_id>/results/publish/", views.publish_event_results, name="publish_event_results"),
     path("events/<int:event_id>/results/<str:group_key>/", views.category_results, name="category_results"),
 
     path("events/<int:event_id>/judges/", views.manage_judges, name="manage_judges"),
+    path("events/<int:event_id>/judges/progress/", views.judging_progress, name="judging_progress"),
+    path("events/<int:event_id>/judges/progress/data/", views.judging_progress_data, name="judging_progress_data"),
+    path("events/<int:event_id>/judges/login-links/", views.judge_login_links, name="judge_login_links"),
+    path("judge-login/<str:token>/", views.judge_token_login, name="judge_token_login"),
 
     path("events/<int:event_id>/edit/", views.edit_event, name="edit_event"),
     path("events/<int:event_id>/publish_awards/", views.publish_awards, name="publish_awards"),
@@ -99,6 +116,8 @@ urlpatterns = [
         name="list_event_participants_by_category",
         ),
 
+    path("metrics/", views.request_metrics, name="request_metrics"),
+
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,39 @@
+"""
+Views grouped by feature. URLconfs import them from here; heavy libraries
+(Pillow, mutagen, zipfile) are imported inside the views that need them so
+worker start-up stays cheap (see `manage.py check_import_time`).
+"""
+
+from .monitoring import custom_server_error, request_metrics
+from .accounts import (
+    CustomLoginView, club_dashboard, custom_logout_view, delete_club, edit_club, home,
+    my_participants_redirect, pending_club_requests, register_club,
+)
+from .dancers import add_dancer, delete_dancer, edit_dancer, import_dancers, list_dancers
+from .events import (
+    create_event, delete_event, edit_event, event_list, event_list_public, manage_styles,
+    notify_clubs_of_event, recompute_age_groups,
+)
+from .registrations import (
+    calculate_age_group_view, delete_participation, delete_participation_group, edit_participation,
+    export_registrations_csv, import_participations, list_event_participants,
+    list_event_participants_by_category, list_event_participants_rows, register_dancer,
+)
+from .start_list import (
+    add_ceremony, delete_ceremony, edit_ceremony, export_start_list_csv, manage_start_list,
+    publish_start_list, start_list, unpublish_start_list,
+)
+from .music import (
+    download_event_music, event_music_playlist, event_music_state, event_music_view,
+    music_service_worker,
+)
+from .judging import (
+    create_judges_for_event, delete_judges_for_event, delete_single_judge, judge_event_data,
+    judge_login_links, judge_sync_scores, judge_token_login, judge_view, judging_progress,
+    judging_progress_data, manage_judges,
+)
+from .awards import (
+    category_results, event_awards_view, export_results_csv, participation_scores, publish_awards,
+    publish_event_results, set_awards_score_mode,
+)
+from .diplomas import diploma_list, generate_diploma
@@ -0,0 +1,199 @@
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth import logout
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import LoginView
+from django.db.models import Count
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from ..db import read_only_transaction
+from ..forms import ClubLoginForm, DanceClubRegistrationForm
+from ..models import DanceClub, Event
+from ..page_cache import cache_public_page
+
+
+@cache_public_page
+@read_only_transaction
+def home(request):
+    event_choices = []
+    user = getattr(request, "user", None)
+    if getattr(user, "is_authenticated", False):
+        # Show the full event list in the chooser; the participants view will scope to the club if needed.
+        event_choices = list(Event.objects.all().order_by("-date"))
+
+    today = timezone.now().date()
+    upcoming_qs = Event.objects.filter(date__gte=today).order_by("date")
+    if not (getattr(user, "is_authenticated", False) and (user.is_superuser or user.is_staff)):
+        upcoming_qs = upcoming_qs.filter(is_published=True)
+    upcoming_events = list(upcoming_qs)
+
+    return render(
+        request,
+        "core/home.html",
+        {
+            "event_choices": event_choices,
+            "upcoming_events": upcoming_events,
+        },
+    )
+
+
+@login_required
+def my_participants_redirect(request):
+    """
+    Home-page helper: send club users directly to their most relevant "View Registered" page.
+    Falls back to the event list if nothing is found.
+    """
+    user = request.user
+    if user.is_superuser or user.is_staff:
+        return redirect("event_list")
+
+    club = DanceClub.objects.filter(user=user).first()
+    if not club:
+        return redirect("event_list")
+
+    # Prefer the nearest upcoming event where this club already has participations.
+    today = timezone.now().date()
+    events = list(
+        Event.objects.filter(participation__dancer_links__dancer__club=club)
+        .distinct()
+        .order_by("date")
+    )
+
+    upcoming = [e for e in events if e.date and e.date >= today]
+    chosen = (upcoming[0] if upcoming else (events[-1] if events else None))
+
+    if not chosen:
+        messages.info(request, _("No registered entries found yet. Please choose an event first."))
+        return redirect("event_list")
+
+    return redirect("list_event_participants", event_id=chosen.id)
+
+
+def register_club(request):
+    if request.method == 'POST':
+        form = DanceClubRegistrationForm(request.POST)
+        if form.is_valid():
+            form.save(commit=True)
+            messages.success(request, _("Club registered successfully. Awaiting admin approval."))
+            return redirect('login')
+    else:
+        form = DanceClubRegistrationForm()
+
+    # 👇 change label only when registering
+    if 'password' in form.fields:
+        form.fields['password'].label = _("Password")
+
+    return render(request, 'core/register_club.html', {'form': form})
+
+
+@staff_member_required
+def delete_club(request, club_id):
+    club = get_object_or_404(DanceClub, id=club_id)
+    user = club.user  # get the associated User
+    club.delete()     # delete the club
+    user.delete()     # delete the User
+    messages.success(request, _("Club deleted successfully."))
+    return redirect('club_dashboard')
+
+
+@login_required
+def club_dashboard(request):
+
+    def add_pending_club_count(request):
+        from .models import DanceClub
+        if request.user.is_authenticated and request.user.is_superuser:
+            return {
+                'clubs_pending_count': DanceClub.objects.filter(confirmed=False).count()
+            }
+        return {}
+    user = request.user
+    if user.is_superuser:
+        clubs = DanceClub.objects.select_related("user").annotate(dancer_count=Count("dancers"))
+        return render(request, 'core/dashboard.html', {'clubs': clubs})
+    else:
+        try:
+            club = DanceClub.objects.get(user=user)
+            if not club.confirmed:
+                return render(request, 'core/awaiting_confirmation.html')
+            return render(request, 'core/dashboard.html', {'club': club})
+        except DanceClub.DoesNotExist:
+            logout(request)
+            return redirect('login')
+
+@staff_member_required
+def pending_club_requests(request):
+    pending_clubs = DanceClub.objects.filter(confirmed=False)
+
+    if request.method == "POST":
+        club_id = request.POST.get("club_id")
+        action = request.POST.get("action")
+
+        club = get_object_or_404(DanceClub, id=club_id)
+        if action == "accept":
+            club.confirmed = True
+            club.save()
+            messages.success(request, _("Club approved successfully."))
+        elif action == "decline":
+            user = club.user
+            club.delete()
+            user.delete()
+            messages.info(request, _("Club declined and removed."))
+        return redirect('pending_club_requests')
+
+    return render(request, "core/pending_club_requests.html", {
+        "pending_clubs": pending_clubs
+    })
+
+class CustomLoginView(LoginView):
+    template_name = 'registration/login.html'
+    authentication_form = ClubLoginForm
+
+    def get_success_url(self):
+        user = self.request.user
+
+        if user.username.startswith("judge_"):
+            try:
+                event_id = user.username.split("_")[1]
+                return reverse('judge_view', args=[int(event_id)])
+            except (IndexError, ValueError):
+                return reverse('home')
+
+        elif user.is_superuser:
+            return reverse('event_list')
+
+        else:
+            return reverse('club_dashboard')
+
+
+def custom_logout_view(request):
+    logout(request)
+    return redirect('home')
+
+@login_required
+def edit_club(request, club_id=None):
+    # Superuser can edit any club, normal user only their own
+    if request.user.is_superuser and club_id:
+        club = get_object_or_404(DanceClub, id=club_id)
+    else:
+        club = get_object_or_404(DanceClub, user=request.user)
+
+    if request.method == 'POST':
+        form = DanceClubRegistrationForm(request.POST, instance=club)
+        if form.is_valid():
+            form.save(commit=True)  # form now updates both DanceClub + linked User
+            messages.success(request, _("Club details updated successfully."))
+            return redirect('club_dashboard')
+    else:
+        # Pre-fill email from linked user
+        form = DanceClubRegistrationForm(
+            instance=club,
+            initial={'email': club.user.email}
+        )
+
+    return render(request, 'core/edit_club.html', {
+        'form': form,
+        'club': club,
+    })
@@ -0,0 +1,203 @@
+from collections import OrderedDict, defaultdict, namedtuple
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
+
+from .. import exports
+from ..db import read_only_transaction
+from ..models import Dancer, DancerParticipation, Event, JudgeScore, Participation
+from ..scoring import compute_final_score
+from ..snapshots import RESULTS, schedule_snapshot_refresh, serves_snapshots, snapshot_url
+from .common import _export_filename
+
+
+AwardResult = namedtuple("AwardResult", ["participation", "dancers", "score"])
+
+
+def _award_results(event, participations):
+    """
+    Ranked AwardResults per category, in start-list category order.
+    Scores and dancers are loaded with one query each, whatever the event size.
+    """
+    participations = list(participations)
+
+    scores_by_participation = defaultdict(list)
+    for s in JudgeScore.objects.filter(participation__in=participations):
+        scores_by_participation[s.participation_id].append(s)
+
+    # Build dancer map
+    dancer_map = defaultdict(list)
+    for dp in DancerParticipation.objects.filter(participation__in=participations).select_related("dancer__club"):
+        dancer_map[dp.participation_id].append(dp.dancer)
+
+    results_by_category = defaultdict(list)
+
+    for p in participations:
+        category_key = (p.style.name, p.group_type, p.age_group, p.difficulty)
+        final_score = compute_final_score(
+            p,
+            scores_by_participation.get(p.id, []),
+            discard_extremes=event.discard_extreme_scores,
+        )
+
+        if final_score is not None:
+            result = AwardResult(
+                participation=p,
+                dancers=dancer_map.get(p.id, []),
+                score=final_score,
+            )
+            results_by_category[category_key].append(result)
+
+    # Sort participants within each category by score (descending)
+    for category in results_by_category:
+        results_by_category[category].sort(key=lambda r: r.score, reverse=True)
+
+    # Preserve category order from start list
+    group_display_order_map = {
+        (p.style.name, p.group_type, p.age_group, p.difficulty): p.group_display_order or 0
+        for p in participations
+    }
+
+    sorted_keys = sorted(results_by_category.keys(), key=lambda k: group_display_order_map.get(k, 0))
+
+    # Build grouped_results in correct order
+    grouped_results = OrderedDict()
+    for key in sorted_keys:
+        grouped_results[key] = results_by_category[key]
+    return grouped_results
+
+
+@login_required
+@read_only_transaction
+def event_awards_view(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    if event.results_published and not request.user.is_superuser and serves_snapshots():
+        # Published results are served as a pre-rendered file, in the default language only
+        url = snapshot_url(event, RESULTS)
+        if url:
+            return redirect(url)
+    participations = Participation.objects.filter(event=event).select_related("style")
+    grouped_results = _award_results(event, participations)
+
+    return render(request, "core/event_awards.html", {
+        "event": event,
+        "grouped_results": grouped_results,
+    })
+
+
+@login_required
+def export_results_csv(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    if not (event.results_published or request.user.is_superuser):
+        raise Http404
+    return exports.csv_response(
+        _export_filename(event, "results"),
+        exports.RESULTS_HEADER,
+        exports.results_rows(event),
+    )
+
+
+@login_required
+@read_only_transaction
+def category_results(request, event_id, group_key):
+    event = get_object_or_404(Event, id=event_id)
+
+    # group_key is "style|group_type|age_group|difficulty", as posted for diplomas
+    parts = group_key.split("|")
+    if len(parts) != 4:
+        raise Http404
+    style_name, group_type, age_group, difficulty = parts
+
+    participations = (
+        Participation.objects.filter(
+            event=event,
+            style__name=style_name,
+            group_type=group_type,
+            age_group=age_group,
+            difficulty=difficulty,
+        )
+        .select_related("style")
+        .order_by("group_display_order", "display_order", "id")
+    )
+
+    return render(request, "core/event_awards.html", {
+        "event": event,
+        "grouped_results": _award_results(event, participations),
+    })
+
+@staff_member_required
+@require_POST
+def publish_event_results(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    event.results_published = True
+    event.save()
+    schedule_snapshot_refresh(event, [RESULTS])
+    return redirect("event_awards", event_id=event.id)  # ✅ Redirect back to awards
+
+@staff_member_required
+@require_POST
+def publish_awards(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    event.results_published = not event.results_published
+    event.save()
+    schedule_snapshot_refresh(event, [RESULTS])
+    return redirect("event_awards", event_id=event.id)
+
+@staff_member_required
+@require_POST
+def set_awards_score_mode(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    event.discard_extreme_scores = request.POST.get("discard_extreme_scores") == "on"
+    event.save(update_fields=["discard_extreme_scores"])
+    if event.results_published:
+        schedule_snapshot_refresh(event, [RESULTS])
+    return redirect("event_awards", event_id=event.id)
+
+@login_required
+def participation_scores(request, participation_id):
+    participation = get_object_or_404(Participation, id=participation_id)
+    event = participation.event
+
+    dancers = Dancer.objects.filter(dancerparticipation__participation=participation).select_related("club")
+    club = dancers[0].club if dancers else None
+
+    judge_scores = list(JudgeScore.objects.filter(participation=participation).select_related("judge"))
+
+    criterion_fields = ["technique", "composition", "image"]
+    if participation.style.name == "Show Dance":
+        criterion_fields.append("show_value")
+
+    discarded_ids = {f: set() for f in criterion_fields}
+    if event.discard_extreme_scores:
+        for f in criterion_fields:
+            vals = sorted([js for js in judge_scores if getattr(js, f) is not None], key=lambda js: getattr(js, f))
+            if len(vals) > 2:
+                discarded_ids[f].add(vals[0].id)
+                discarded_ids[f].add(vals[-1].id)
+
+    total_points = 0
+    total_counts = 0
+    for f in criterion_fields:
+        vals = [getattr(js, f) for js in judge_scores if getattr(js, f) is not None and js.id not in discarded_ids[f]]
+        total_points += sum(vals)
+        total_counts += len(vals)
+
+    final_score = round(total_points / total_counts, 2) if total_counts else 0
+
+    # NEW: remember which category index we came from
+    group_index = request.GET.get("group", 0)
+
+    return render(request, "core/participation_scores.html", {
+        "event": event,
+        "participation": participation,
+        "dancers": dancers,
+        "club": club,
+        "judge_scores": judge_scores,
+        "discarded_ids": discarded_ids,
+        "final_score": final_score,
+        "group_index": group_index,
+        "discard_extreme_scores": event.discard_extreme_scores,
+    })
@@ -0,0 +1,5 @@
+from django.utils import timezone
+
+
+def _export_filename(event, kind):
+    return f"event-{event.id}-{kind}-{timezone.localdate():%Y%m%d}.csv"
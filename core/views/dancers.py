@@ -0,0 +1,126 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.translation import gettext as _
+
+from .. import bulk_import
+from ..forms import DancerForm, DancerImportForm
+from ..models import DanceClub, Dancer
+
+
+@login_required
+def add_dancer(request, club_id=None):
+    if request.user.is_superuser and club_id:
+        club = get_object_or_404(DanceClub, id=club_id)
+    else:
+        club = get_object_or_404(DanceClub, user=request.user)
+
+    if request.method == 'POST':
+        form = DancerForm(request.POST)
+        if form.is_valid():
+            dancer = form.save(commit=False)
+            dancer.club = club
+            dancer.save()
+            messages.success(request, _("Dancer added successfully."))
+            if request.user.is_superuser:
+                return redirect('admin_list_dancers', club_id=club.id)
+            else:
+                return redirect('list_dancers')
+    else:
+        form = DancerForm()
+
+    return render(request, 'core/add_dancer.html', {
+        'form': form,
+        'club': club,
+        'is_superuser': request.user.is_superuser,
+    })
+
+@login_required
+def import_dancers(request, club_id=None):
+    if request.user.is_superuser and club_id:
+        club = get_object_or_404(DanceClub, id=club_id)
+    else:
+        club = get_object_or_404(DanceClub, user=request.user)
+
+    report = None
+    if request.method == 'POST':
+        form = DancerImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                report = bulk_import.import_dancers(club, form.cleaned_data['sheet'])
+            except bulk_import.SheetError as exc:
+                form.add_error('sheet', str(exc))
+            else:
+                if not report.errors:
+                    messages.success(request, _("Imported %(created)d dancer(s); %(skipped)d were already listed.") % {
+                        "created": report.created, "skipped": report.skipped,
+                    })
+                    if request.user.is_superuser:
+                        return redirect('admin_list_dancers', club_id=club.id)
+                    return redirect('list_dancers')
+    else:
+        form = DancerImportForm()
+
+    return render(request, 'core/import_dancers.html', {
+        'form': form,
+        'club': club,
+        'report': report,
+        'columns': bulk_import.DANCER_COLUMNS,
+        'is_superuser': request.user.is_superuser,
+    })
+
+@login_required
+def list_dancers(request, club_id=None):
+    if request.user.is_superuser and club_id:
+        club = get_object_or_404(DanceClub, id=club_id)
+    else:
+        club = get_object_or_404(DanceClub, user=request.user)
+
+    dancers = Dancer.objects.filter(club=club)
+    return render(request, 'core/list_dancers.html', {
+        'dancers': dancers,
+        'club': club,
+        'is_superuser': request.user.is_superuser,
+    })
+
+
+@login_required
+def delete_dancer(request, dancer_id, club_id=None):
+    if request.user.is_superuser and club_id:
+        club = get_object_or_404(DanceClub, id=club_id)
+    else:
+        club = get_object_or_404(DanceClub, user=request.user)
+
+    dancer = get_object_or_404(Dancer, id=dancer_id, club=club)
+    dancer.delete()
+    messages.success(request, _("Dancer deleted successfully."))
+
+    if request.user.is_superuser:
+        return redirect('admin_list_dancers', club_id=club.id)
+    else:
+        return redirect('list_dancers')
+
+@login_required
+def edit_dancer(request, dancer_id):
+    dancer = get_object_or_404(Dancer, id=dancer_id)
+
+    if request.user.is_superuser or dancer.club.user == request.user:
+        if request.method == 'POST':
+            form = DancerForm(request.POST, instance=dancer)
+            if form.is_valid():
+                form.save()
+                messages.success(request, _("Dancer updated successfully."))
+                if request.user.is_superuser:
+                    return redirect('admin_list_dancers', club_id=dancer.club.id)
+                else:
+                    return redirect('list_dancers')
+        else:
+            form = DancerForm(instance=dancer)
+
+        return render(request, 'core/edit_dancer.html', {
+            'form': form,
+            'dancer': dancer,
+            'is_superuser': request.user.is_superuser
+        })
+    else:
+        return redirect('club_dashboard')
@@ -0,0 +1,234 @@
+import logging
+import os
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.translation import gettext as _
+
+from ..db import statement_timeout
+from ..models import DancerParticipation, Diploma, Event, JudgeScore, Participation
+
+
+logger = logging.getLogger(__name__)
+
+
+DIPLOMA_FONT_PATH = os.path.join(settings.BASE_DIR, "core/static/fonts/BebasNeue-Regular.ttf")
+
+
+def _ordinal(n):
+    return "%d%s" % (n, "tsnrhtdd"[(n // 10 % 10 != 1) * (n % 10 < 4) * n % 10::4])
+
+
+def _diploma_fonts(height):
+    """(bold, regular) Bebas Neue fonts sized for a template `height` pixels tall."""
+    from PIL import ImageFont  # Pillow is only loaded when diplomas are drawn
+
+    return (
+        ImageFont.truetype(DIPLOMA_FONT_PATH, int(height * 0.045)),
+        ImageFont.truetype(DIPLOMA_FONT_PATH, int(height * 0.03)),
+    )
+
+
+def _draw_centered_with_spacing(draw, width, text, y, font, spacing=2, fill="black"):
+    """Draw text centered with custom letter spacing"""
+    if not text:
+        return
+    total_w = sum(font.getbbox(ch)[2] for ch in text) + spacing * (len(text) - 1)
+    x = (width - total_w) / 2
+    for ch in text:
+        draw.text((x, y), ch, font=font, fill=fill)
+        x += font.getbbox(ch)[2] + spacing
+
+
+def _render_diploma(template, lines, fonts):
+    """Return a copy of the RGBA `template` with `lines` drawn in the lower block."""
+    from PIL import ImageDraw
+
+    img = template.copy()
+    draw = ImageDraw.Draw(img)
+    W, H = img.size
+    font_bold, font_regular = fonts
+
+    # dynamic line spacing
+    start_y = int(H * 0.65)  # top of the block
+    line_height = int(H * 0.055)  # spacing between lines
+
+    for i, text in enumerate(lines):
+        font = font_bold if i == 0 else font_regular
+        spacing = 3 if i == 0 else 2
+        y = start_y + i * line_height
+        _draw_centered_with_spacing(draw, W, text, y, font, spacing=spacing)
+    return img
+
+
+@staff_member_required
+@statement_timeout()
+def generate_diploma(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    if request.method == "POST":
+        category_raw = request.POST.get("category", "")
+        try:
+            style, group_type, age_group, difficulty = [x.strip() for x in category_raw.split("|", 3)]
+        except Exception:
+            messages.error(request, _("Invalid category payload for diploma preview."))
+            logger.warning(
+                "Invalid diploma category payload",
+                extra={"event_id": event_id, "category_raw": category_raw, "user_id": getattr(request.user, "id", None)},
+            )
+            return redirect("event_awards", event_id=event_id)
+
+        participations = Participation.objects.filter(
+            event=event,
+            style__name=style.strip(),
+            group_type=group_type.strip(),
+            age_group=age_group.strip(),
+            difficulty=difficulty.strip(),
+        )
+
+        # ✅ use event template if available, otherwise fallback
+        if event.diploma_template:
+            base_path = event.diploma_template.path
+        else:
+            base_path = os.path.join(settings.MEDIA_ROOT, "diploma_template.jpg")
+
+        if not os.path.isfile(base_path):
+            messages.error(request, _("Diploma template image is missing. Please upload an event template first."))
+            logger.error(
+                "Diploma template missing",
+                extra={"event_id": event_id, "base_path": base_path, "user_id": getattr(request.user, "id", None)},
+            )
+            return redirect("event_awards", event_id=event_id)
+
+        # calculate average scores for placements
+        results = []
+        for p in participations:
+            scores = JudgeScore.objects.filter(participation=p)
+            fields = ["technique", "composition", "image"]
+            if p.style.name == "Show Dance":
+                fields.append("show_value")
+
+            total = Decimal(0)
+            count = 0
+            for f in fields:
+                values = [getattr(s, f) for s in scores if getattr(s, f) is not None]
+                if event.discard_extreme_scores and len(values) >= 3:
+                    values = sorted(values)[1:-1]  # drop high + low
+                if values:
+                    total += sum(values)
+                    count += len(values)
+
+            avg_score = float(total / Decimal(count)) if count else 0.0
+            results.append((p, avg_score))
+
+        results.sort(key=lambda x: x[1], reverse=True)
+
+        category_text = " – ".join([style, group_type, age_group, difficulty])
+
+        # ✅ cleanup old diplomas (DB + files) for this event & category
+        old_diplomas = Diploma.objects.filter(event=event, category=category_text)
+        for d in old_diplomas:
+            if d.image and os.path.isfile(d.image.path):
+                try:
+                    os.remove(d.image.path)
+                except Exception:
+                    pass
+        old_diplomas.delete()
+
+        try:
+            from PIL import Image
+
+            # Template and fonts are loaded once; each diploma draws on a copy
+            template = Image.open(base_path).convert("RGBA")
+            fonts = _diploma_fonts(template.size[1])
+
+            # generate diplomas
+            for placement, (p, score) in enumerate(results, start=1):
+                dancers = DancerParticipation.objects.filter(
+                    participation=p
+                ).select_related("dancer", "dancer__club")
+
+                for dp in dancers:
+                    dancer = dp.dancer
+                    club_name = dancer.club.club_name if dancer.club else "–"
+                    choreo = p.choreography_name or ""
+
+                    # ✅ different display logic
+                    if p.group_name and len(dancers) >= 4:
+                        lines = [
+                            f"{_ordinal(placement)} Place",
+                            category_text,
+                            p.group_name,
+                            f"{dancer.first_name} {dancer.last_name}",
+                            club_name,
+                            choreo,
+                        ]
+                    else:
+                        lines = [
+                            f"{_ordinal(placement)} Place",
+                            category_text,
+                            f"{dancer.first_name} {dancer.last_name}",
+                            club_name,
+                            choreo,
+                        ]
+
+                    img = _render_diploma(template, lines, fonts)
+
+                    # ✅ ensure unique filename
+                    filename = f"diplomas/{event.id}_{p.id}_{dancer.id}_{placement}.png"
+                    full_path = os.path.join(settings.MEDIA_ROOT, filename)
+                    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                    img.save(full_path)
+
+                    Diploma.objects.create(
+                        event=event,
+                        dancer=dancer,
+                        category=category_text,
+                        placement=placement,
+                        image=filename,
+                    )
+        except Exception:
+            logger.exception(
+                "Failed generating diplomas",
+                extra={"event_id": event_id, "category": category_raw, "user_id": getattr(request.user, "id", None)},
+            )
+            messages.error(request, _("Failed to generate diploma preview. Please try again or contact support."))
+            return redirect("event_awards", event_id=event_id)
+
+        messages.success(request, _("Diplomas generated successfully."))
+
+        diplomas_qs = Diploma.objects.filter(
+            event=event,
+            category=category_text,
+        )
+
+        return render(request, "core/diploma_list.html", {
+            "event": event,
+            "diplomas": diplomas_qs,
+        })
+
+    return redirect("event_awards", event_id=event_id)
+
+
+@staff_member_required
+def diploma_list(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    diplomas = Diploma.objects.filter(event=event)
+
+    # filter diplomas if category query param exists
+    category_str = request.GET.get("category")
+    if category_str:
+        style, group_type, age_group, difficulty = category_str.split("|")
+        diplomas = diplomas.filter(
+            category=" – ".join([style.strip(), group_type.strip(), age_group.strip(), difficulty.strip()])
+        )
+
+    diplomas = diplomas.select_related("dancer").order_by("category", "placement")
+    return render(
+        request,
+        "core/diploma_list.html",
+        {"event": event, "diplomas": diplomas, "category": category_str},
+    )
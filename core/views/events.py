@@ -0,0 +1,190 @@
+from django import forms
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from ..age_groups import apply_age_group_changes, plan_age_group_changes, summarize_changes
+from ..auth_utils import judge_event_id_from_username
+from ..cleanup import delete_event_fast
+from ..db import read_only_transaction, statement_timeout
+from ..forms import EventForm
+from ..models import DanceClub, Event, Participation, StyleCategory
+from ..outbox import enqueue_email
+from ..page_cache import cache_public_page
+from ..playback import invalidate_music_index
+from ..snapshots import schedule_snapshot_refresh
+from ..start_list import DEFAULT_STYLES
+
+
+class NotifyClubsForm(forms.Form):
+    clubs = forms.ModelMultipleChoiceField(
+        queryset=DanceClub.objects.filter(confirmed=True),
+        widget=forms.CheckboxSelectMultiple
+    )
+    subject = forms.CharField(max_length=200, initial="New Dance Event Announcement")
+    message = forms.CharField(widget=forms.Textarea)
+
+@staff_member_required
+def notify_clubs_of_event(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    if request.method == "POST":
+        form = NotifyClubsForm(request.POST)
+        if form.is_valid():
+            selected_clubs = form.cleaned_data["clubs"]
+            subject = form.cleaned_data["subject"]
+            message = form.cleaned_data["message"]
+
+            recipients = [club.user.email for club in selected_clubs.select_related("user")]
+            queued = enqueue_email(subject, message, recipients)
+
+            messages.success(request, f"Email queued for {queued} clubs.")
+            return redirect("event_list")
+    else:
+        # Default message with event details
+        default_message = (
+            f"We are excited to announce a new event!\n\n"
+            f"Event: {event.name}\n"
+            f"Location: {event.location}, {event.city}\n"
+            f"Date: {event.date}\n\n"
+            f"We hope to see your dancers participating!"
+        )
+        form = NotifyClubsForm(initial={"message": default_message})
+
+    return render(request, "core/notify_clubs.html", {"form": form, "event": event})
+
+@staff_member_required
+@statement_timeout()
+def delete_event(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    if request.method == "POST":
+        # One DELETE per table in a single transaction; files are purged later
+        delete_event_fast(event)
+        invalidate_music_index(event_id)
+
+        messages.success(request, _("Event and all related data deleted successfully."))
+        return redirect("event_list")
+
+    return redirect("event_list")
+
+
+@staff_member_required
+def create_event(request):
+    if request.method == 'POST':
+        # IMPORTANT: include request.FILES
+        form = EventForm(request.POST, request.FILES)
+        if form.is_valid():
+            event = form.save()
+
+            # Add default styles for this event
+            for style_name in DEFAULT_STYLES:
+                StyleCategory.objects.get_or_create(event=event, name=style_name)
+
+            messages.success(request, _("Event created successfully."))
+            return redirect('event_list')
+    else:
+        form = EventForm()
+
+    return render(request, 'core/create_event.html', {'form': form})
+
+
+@staff_member_required
+def edit_event(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    if request.method == 'POST':
+        form = EventForm(request.POST, request.FILES, instance=event)
+        if form.is_valid():
+            form.save()
+            messages.success(request, _("Event updated successfully."))
+            # Age groups are frozen at registration; offer to redo them for the new date
+            if "date" in form.changed_data and Participation.objects.filter(event=event).exists():
+                return redirect('recompute_age_groups', event_id=event.id)
+            return redirect('event_list')
+        else:
+            messages.error(request, _("Please correct the errors below."))
+            print(form.errors)  # Optional: see in console/logs
+    else:
+        form = EventForm(instance=event)
+
+    return render(request, 'core/edit_event.html', {'form': form, 'event': event})
+
+@staff_member_required
+@statement_timeout()
+def recompute_age_groups(request, event_id):
+    """Preview (GET) or apply (POST) age groups recomputed for the event date."""
+    event = get_object_or_404(Event, id=event_id)
+    changes = plan_age_group_changes(event)
+
+    if request.method == 'POST':
+        updated = apply_age_group_changes(changes)
+        if updated:
+            invalidate_music_index(event.id)
+            schedule_snapshot_refresh(event)
+        messages.success(request, _("Updated the age group of %(count)d entries.") % {"count": updated})
+        return redirect('event_list')
+
+    return render(request, 'core/recompute_age_groups.html', {
+        'event': event,
+        'summary': summarize_changes(changes),
+        'change_count': len(changes),
+    })
+
+
+@login_required
+def event_list(request):
+    user = getattr(request, "user", None)
+    is_admin = bool(getattr(user, "is_authenticated", False) and (user.is_superuser or user.is_staff))
+    base_events = Event.objects.all() if is_admin else Event.objects.filter(is_published=True)
+    events = base_events.order_by("date", "id")
+    today = timezone.localdate()
+
+    # Attach a flag to each event indicating if its judge accounts exist
+    judged_event_ids = {
+        judge_event_id_from_username(username)
+        for username in User.objects.filter(username__startswith="judge_").values_list("username", flat=True)
+    }
+    for event in events:
+        event.has_judges = event.id in judged_event_ids
+
+    upcoming_events = [e for e in events if e.date and e.date >= today]
+    previous_events = [e for e in events if e.date and e.date < today]
+
+    return render(request, 'core/event_list.html', {
+        'upcoming_events': upcoming_events,
+        'previous_events': previous_events,
+    })
+
+
+@staff_member_required
+def manage_styles(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    all_style_names = StyleCategory.objects.values_list('name', flat=True).distinct()
+
+    if request.method == 'POST':
+        if 'delete_style_id' in request.POST:
+            style_id = request.POST.get('delete_style_id')
+            StyleCategory.objects.filter(id=style_id, event=event).delete()
+        else:
+            style_name = request.POST.get('style_name')
+            if style_name and not StyleCategory.objects.filter(event=event, name=style_name).exists():
+                StyleCategory.objects.create(event=event, name=style_name)
+        return redirect('manage_styles', event_id=event.id)
+
+    styles = event.style_categories.all()
+    return render(request, 'core/manage_styles.html', {
+        'event': event,
+        'styles': styles,
+        'all_style_names': all_style_names
+    })
+
+@cache_public_page
+@read_only_transaction
+def event_list_public(request):
+    events = Event.objects.all().order_by('date')
+    return render(request, 'core/event_list_public.html', {'events': events})
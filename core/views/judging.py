@@ -0,0 +1,684 @@
+import json
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth import login, logout
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.db.models import Count, Max, Min
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_POST
+
+from ..auth_utils import judge_login_expiry, make_judge_login_token, redeem_judge_login_token
+from ..db import statement_timeout, write_transaction
+from ..forms import JudgeCreationFormSet, SingleJudgeForm
+from ..models import (
+    DancerParticipation, Event, EventPlaybackState, JudgeLoginToken, JudgeScore, JudgeSyncBatch,
+    Participation, StartListSlot,
+)
+from ..snapshots import RESULTS, schedule_snapshot_refresh
+
+
+def _get_ceremony_lock_cutoff(event):
+    """
+    Return a display_order cutoff from the most recent ceremony at/behind
+    the currently highlighted category in live playback.
+    Categories with participation display_order below this cutoff are locked.
+    """
+    state = EventPlaybackState.objects.filter(event=event).first()
+    if not state or not state.current_highlight_key:
+        return None
+
+    parts = state.current_highlight_key.split("|")
+    if len(parts) != 4:
+        return None
+
+    style_name, group_type, age_group, difficulty = [p.strip() for p in parts]
+    highlighted = (
+        Participation.objects.filter(
+            event=event,
+            style__name=style_name,
+            group_type=group_type,
+            age_group=age_group,
+            difficulty=difficulty,
+        )
+        .exclude(display_order__isnull=True)
+        .order_by("display_order")
+        .first()
+    )
+    if not highlighted:
+        return None
+
+    ceremony = (
+        StartListSlot.objects.filter(
+            event=event,
+            is_ceremony=True,
+            display_order__lte=highlighted.display_order or 0,
+        )
+        .order_by("-display_order")
+        .first()
+    )
+    return ceremony.display_order if ceremony else None
+
+@staff_member_required
+def create_judges_for_event(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    if request.method == "POST":
+        formset = JudgeCreationFormSet(request.POST)
+        if formset.is_valid():
+            created = []
+            for form in formset:
+                first_name = form.cleaned_data['first_name']
+                last_name = form.cleaned_data['last_name']
+
+                username = f"judge_{event.id}_{first_name.lower().replace(' ', '').replace('.', '')}"
+
+                if not User.objects.filter(username=username).exists():
+                    user = User.objects.create_user(
+                        username=username,
+                        password=first_name,  # Simplified password
+                        first_name=first_name,
+                        last_name=last_name,
+                        is_staff=False,
+                        is_active=True
+                    )
+                    created.append(username)
+
+            if created:
+                messages.success(request, f"Judges created: {', '.join(created)}")
+            else:
+                messages.info(request, "No new judges created (maybe they already exist).")
+
+            return redirect('event_list')
+    else:
+        formset = JudgeCreationFormSet()
+
+    existing_judges = User.objects.filter(username__startswith=f"judge_{event.id}_")
+
+    return render(request, "core/manage_judges.html", {
+    "event": event,
+    "form": form,
+    "judges": existing_judges,
+})
+
+
+SCORE_FIELDS = ["technique", "composition", "image", "show_value"]
+SCORE_MIN = Decimal("1")
+SCORE_MAX = Decimal("10")
+MAX_SYNC_BATCH = 500
+
+
+def _judge_participations(event):
+    return (
+        Participation.objects.filter(event=event)
+        .select_related("style")
+        .order_by("group_display_order", "display_order", "id")
+    )
+
+
+def _judge_entries(participations, event=None):
+    """
+    Per-entry view models for judging (club, dancer names, group name, score
+    fields), built from a single DancerParticipation query so templates never
+    touch related managers. Pass ``event`` when covering the whole event.
+    """
+    links = DancerParticipation.objects.select_related("dancer__club").order_by("id")
+    if event is not None:
+        links = links.filter(participation__event=event)
+    else:
+        links = links.filter(participation_id__in=[p.id for p in participations])
+
+    dancer_map = defaultdict(list)
+    for dp in links:
+        dancer_map[dp.participation_id].append(dp.dancer)
+
+    entries = []
+    for p in participations:
+        dancers = dancer_map.get(p.id, [])
+        entries.append({
+            "id": p.id,
+            "choreography_name": p.choreography_name,
+            "choreographer_name": p.choreographer_name,
+            "club_name": dancers[0].club.club_name if dancers else "",
+            "dancers": [f"{d.first_name} {d.last_name}" for d in dancers],
+            "group_name": p.group_name or "",
+            "fields": _score_fields_for(p),
+        })
+    return entries
+
+
+def _judge_categories(participations):
+    """
+    Group judge-ordered participations by category.
+    Returns (sorted_keys, grouped, category_order_map); the order map holds the
+    display_order of each category's first entry, which the ceremony lock compares against.
+    """
+    grouped = OrderedDict()
+    group_order_map = {}
+    category_order_map = {}
+    for p in participations:
+        group_key = (p.style.name, p.group_type, p.age_group, p.difficulty)
+        if group_key not in grouped:
+            grouped[group_key] = []
+            group_order_map[group_key] = p.group_display_order or 0
+            category_order_map[group_key] = p.display_order or 0
+        grouped[group_key].append(p)
+
+    sorted_keys = sorted(grouped.keys(), key=lambda k: group_order_map[k])
+    return sorted_keys, grouped, category_order_map
+
+
+def _is_category_locked(lock_cutoff, category_order):
+    return lock_cutoff is not None and category_order < lock_cutoff
+
+
+def _score_fields_for(participation):
+    fields = ["technique", "composition", "image"]
+    if participation.style.name == "Show Dance":
+        fields.append("show_value")
+    return fields
+
+
+@login_required
+def judge_view(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    # Grouping only needs style; dancers are loaded for the current category alone
+    participations = _judge_participations(event)
+    sorted_keys, grouped, category_order_map = _judge_categories(participations)
+
+    current_index = int(request.GET.get("group", 0))
+    if current_index >= len(sorted_keys):
+        current_index = len(sorted_keys) - 1
+    if current_index < 0:
+        current_index = 0
+
+    current_key = sorted_keys[current_index] if sorted_keys else None
+    current_entries = grouped.get(current_key, [])
+    lock_cutoff = _get_ceremony_lock_cutoff(event)
+    current_category_order = category_order_map.get(current_key, 0) if current_key else 0
+    current_category_locked = bool(
+        current_key is not None and _is_category_locked(lock_cutoff, current_category_order)
+    )
+
+    all_scored = False
+
+    if request.method == "POST":
+        if "review" in request.POST:
+            return redirect(f"{reverse('judge_view', args=[event.id])}?group=0")
+        if not current_category_locked:
+            # Save multi-criteria scores in one write transaction
+            with write_transaction():
+                for p in current_entries:
+                    data = {}
+                    for f in _score_fields_for(p):
+                        val = request.POST.get(f"{f}_{p.id}")
+                        if val:
+                            data[f] = float(val)
+
+                    if data:
+                        data["updated_at"] = timezone.now()
+                        JudgeScore.objects.update_or_create(
+                            participation=p,
+                            judge=request.user,
+                            defaults=data,
+                        )
+                if event.results_published:
+                    schedule_snapshot_refresh(event, [RESULTS])
+        else:
+            if "save_last" in request.POST:
+                messages.warning(
+                    request,
+                    _("This category is locked because ceremony handout has started for earlier categories."),
+                )
+
+        if "next" in request.POST and current_index + 1 < len(sorted_keys):
+            return redirect(f"{reverse('judge_view', args=[event.id])}?group={current_index+1}")
+        elif "prev" in request.POST and current_index > 0:
+            return redirect(f"{reverse('judge_view', args=[event.id])}?group={current_index-1}")
+        elif current_index == len(sorted_keys) - 1:
+            all_scored = True
+        else:
+            return redirect(f"{reverse('judge_view', args=[event.id])}?group={current_index}")
+
+    # View models and existing scores for the current category only
+    existing_scores = {}
+    entries = []
+    if current_entries and not all_scored:
+        existing_scores = {
+            s.participation_id: {
+                "technique": s.technique,
+                "composition": s.composition,
+                "image": s.image,
+                "show_value": s.show_value,
+            }
+            for s in JudgeScore.objects.filter(
+                participation_id__in=[p.id for p in current_entries], judge=request.user
+            )
+        }
+        entries = _judge_entries(current_entries)
+        for entry in entries:
+            entry["scores"] = existing_scores.get(entry["id"], {})
+
+    context = {
+        "event": event,
+        "current_key": current_key,
+        "current_entries": entries,
+        "current_index": current_index,
+        "total_categories": len(sorted_keys),
+        "has_next": current_index + 1 < len(sorted_keys),
+        "has_prev": current_index > 0,
+        "existing_scores": existing_scores,
+        "all_scored": all_scored,
+        "current_category_locked": current_category_locked,
+    }
+    return render(request, "core/judge_view.html", context)
+
+
+def _score_value_json(value):
+    return float(value) if value is not None else None
+
+
+@login_required
+def judge_event_data(request, event_id):
+    """
+    Whole-event payload for the offline judging client: every category in
+    start-list order, its entries and this judge's existing scores.
+    """
+    event = get_object_or_404(Event, id=event_id)
+
+    participations = _judge_participations(event)
+    sorted_keys, grouped, category_order_map = _judge_categories(participations)
+    lock_cutoff = _get_ceremony_lock_cutoff(event)
+
+    entries_by_id = {entry["id"]: entry for entry in _judge_entries(participations, event=event)}
+
+    categories = []
+    for index, key in enumerate(sorted_keys):
+        categories.append({
+            "index": index,
+            "key": list(key),
+            "locked": _is_category_locked(lock_cutoff, category_order_map[key]),
+            "entries": [entries_by_id[p.id] for p in grouped[key]],
+        })
+
+    scores = {
+        str(s.participation_id): {
+            "technique": _score_value_json(s.technique),
+            "composition": _score_value_json(s.composition),
+            "image": _score_value_json(s.image),
+            "show_value": _score_value_json(s.show_value),
+            "updated_at": s.updated_at.isoformat() if s.updated_at else None,
+        }
+        for s in JudgeScore.objects.filter(participation__event=event, judge=request.user)
+    }
+
+    return JsonResponse({
+        "event": {"id": event.id, "name": event.name},
+        "categories": categories,
+        "scores": scores,
+        "server_time": timezone.now().isoformat(),
+    })
+
+
+def _parse_client_timestamp(raw, now):
+    """Client change time for last-write-wins; never later than the server clock."""
+    parsed = None
+    if isinstance(raw, (int, float)):
+        try:
+            parsed = datetime.fromtimestamp(raw / 1000, tz=dt_timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            parsed = None
+    elif isinstance(raw, str) and raw:
+        try:
+            parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            parsed = None
+        if parsed is not None and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    if parsed is None or parsed > now:
+        return now
+    return parsed
+
+
+def _apply_score_batch(event, judge, items):
+    now = timezone.now()
+    lock_cutoff = _get_ceremony_lock_cutoff(event)
+
+    participation_ids = []
+    for item in items:
+        try:
+            participation_ids.append(int(item.get("participation_id")))
+        except (AttributeError, TypeError, ValueError):
+            continue
+
+    participations = {
+        p.id: p
+        for p in Participation.objects.filter(event=event, id__in=participation_ids).select_related("style")
+    }
+    # Lock rules compare each category's first display_order with the ceremony cutoff.
+    category_order_map = _judge_categories(
+        Participation.objects.filter(event=event)
+        .select_related("style")
+        .order_by("group_display_order", "display_order", "id")
+    )[2]
+    existing = {
+        s.participation_id: s
+        for s in JudgeScore.objects.filter(judge=judge, participation_id__in=participations.keys())
+    }
+
+    results = []
+    for item in items:
+        try:
+            pid = int(item.get("participation_id"))
+        except (AttributeError, TypeError, ValueError):
+            results.append({"participation_id": None, "status": "invalid"})
+            continue
+
+        p = participations.get(pid)
+        if p is None:
+            results.append({"participation_id": pid, "status": "invalid"})
+            continue
+
+        group_key = (p.style.name, p.group_type, p.age_group, p.difficulty)
+        if _is_category_locked(lock_cutoff, category_order_map.get(group_key, 0)):
+            results.append({"participation_id": pid, "status": "locked"})
+            continue
+
+        data = {}
+        valid = True
+        for f in _score_fields_for(p):
+            raw = item.get(f)
+            if raw in (None, ""):
+                continue
+            try:
+                value = Decimal(str(raw)).quantize(Decimal("0.01"))
+                # NaN survives quantize; comparing it raises InvalidOperation
+                if not (SCORE_MIN <= value <= SCORE_MAX):
+                    raise ValueError(raw)
+            except (ArithmeticError, ValueError):
+                valid = False
+                break
+            data[f] = value
+        if not valid or not data:
+            results.append({"participation_id": pid, "status": "invalid"})
+            continue
+
+        updated_at = _parse_client_timestamp(item.get("updated_at"), now)
+        score = existing.get(pid)
+        if score and score.updated_at and score.updated_at > updated_at:
+            results.append({"participation_id": pid, "status": "stale"})
+            continue
+
+        if score is None:
+            score = JudgeScore(participation=p, judge=judge)
+            existing[pid] = score
+        for f, value in data.items():
+            setattr(score, f, value)
+        score.updated_at = updated_at
+        score.save()
+        results.append({"participation_id": pid, "status": "saved"})
+
+    return results
+
+
+@login_required
+@require_POST
+def judge_sync_scores(request, event_id):
+    """
+    Batched score upload from the offline judging client.
+    Each batch carries an idempotency key; a retried batch gets the stored
+    answer instead of being applied twice. Per-score timestamps resolve
+    conflicts (last write wins) and the ceremony lock is enforced per entry.
+    """
+    event = get_object_or_404(Event, id=event_id)
+
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON."}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "batch_id and scores are required."}, status=400)
+
+    batch_key = str(payload.get("batch_id") or "").strip()[:64]
+    items = payload.get("scores")
+    if not batch_key or not isinstance(items, list):
+        return JsonResponse({"error": "batch_id and scores are required."}, status=400)
+    if len(items) > MAX_SYNC_BATCH:
+        return JsonResponse({"error": "Batch too large."}, status=400)
+
+    previous = JudgeSyncBatch.objects.filter(judge=request.user, idempotency_key=batch_key).first()
+    if previous:
+        return JsonResponse(previous.response)
+
+    try:
+        with write_transaction():
+            response = {"batch_id": batch_key, "results": _apply_score_batch(event, request.user, items)}
+            JudgeSyncBatch.objects.create(judge=request.user, idempotency_key=batch_key, response=response)
+            if event.results_published:
+                schedule_snapshot_refresh(event, [RESULTS])
+    except IntegrityError:
+        # The same batch raced in from another request; answer with its result.
+        previous = get_object_or_404(JudgeSyncBatch, judge=request.user, idempotency_key=batch_key)
+        response = previous.response
+
+    return JsonResponse(response)
+
+
+def _judging_progress_version(event):
+    stats = JudgeScore.objects.filter(participation__event=event).aggregate(
+        count=Count("id"), last=Max("updated_at"),
+    )
+    last = stats["last"].isoformat() if stats["last"] else ""
+    entries = Participation.objects.filter(event=event).count()
+    judges = User.objects.filter(username__startswith=f"judge_{event.id}_").count()
+    return f"{stats['count']}:{last}:{entries}:{judges}"
+
+
+def _judging_progress(event):
+    """
+    Judges x categories completion matrix from grouped aggregations: one over
+    the event's entries (category totals and order) and one over JudgeScore
+    (scored count and latest change per judge and category).
+    """
+    categories = list(
+        Participation.objects.filter(event=event)
+        .values("style__name", "group_type", "age_group", "difficulty")
+        .annotate(
+            total=Count("id"),
+            group_order=Min("group_display_order"),
+            first_order=Min("display_order"),
+        )
+        .order_by("group_order", "first_order")
+    )
+    category_index = {}
+    for index, c in enumerate(categories):
+        category_index[(c["style__name"], c["group_type"], c["age_group"], c["difficulty"])] = index
+
+    judges = list(
+        User.objects.filter(username__startswith=f"judge_{event.id}_")
+        .order_by("first_name", "username")
+        .values("id", "username", "first_name", "last_name")
+    )
+
+    rows = (
+        JudgeScore.objects.filter(participation__event=event, judge__username__startswith=f"judge_{event.id}_")
+        .values(
+            "judge_id",
+            "participation__style__name",
+            "participation__group_type",
+            "participation__age_group",
+            "participation__difficulty",
+        )
+        .annotate(scored=Count("id"), last_at=Max("updated_at"))
+    )
+
+    total_entries = sum(c["total"] for c in categories)
+    matrix = {j["id"]: [0] * len(categories) for j in judges}
+    summary = {j["id"]: {"scored": 0, "last_category": None, "last_at": None} for j in judges}
+    for row in rows:
+        key = (
+            row["participation__style__name"],
+            row["participation__group_type"],
+            row["participation__age_group"],
+            row["participation__difficulty"],
+        )
+        index = category_index.get(key)
+        judge_summary = summary.get(row["judge_id"])
+        if index is None or judge_summary is None:
+            continue
+        matrix[row["judge_id"]][index] = row["scored"]
+        judge_summary["scored"] += row["scored"]
+        if row["last_at"] and (judge_summary["last_at"] is None or row["last_at"] > judge_summary["last_at"]):
+            judge_summary["last_at"] = row["last_at"]
+            judge_summary["last_category"] = index
+
+    return {
+        "categories": [
+            {
+                "index": index,
+                "key": [c["style__name"], c["group_type"], c["age_group"], c["difficulty"]],
+                "total": c["total"],
+            }
+            for index, c in enumerate(categories)
+        ],
+        "judges": [
+            {
+                "id": j["id"],
+                "name": f"{j['first_name']} {j['last_name']}".strip() or j["username"],
+                "scored": summary[j["id"]]["scored"],
+                "total": total_entries,
+                "last_category": summary[j["id"]]["last_category"],
+                "last_at": summary[j["id"]]["last_at"].isoformat() if summary[j["id"]]["last_at"] else None,
+                "cells": matrix[j["id"]],
+            }
+            for j in judges
+        ],
+    }
+
+
+@staff_member_required
+def judging_progress(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    return render(request, "core/judging_progress.html", {"event": event})
+
+
+@staff_member_required
+@statement_timeout()
+def judging_progress_data(request, event_id):
+    """
+    Polled by the progress dashboard. Clients send back the version they
+    have; while no score changed the answer is a single aggregate query.
+    """
+    event = get_object_or_404(Event, id=event_id)
+    version = _judging_progress_version(event)
+    if request.GET.get("version") == version:
+        return JsonResponse({"version": version, "unchanged": True})
+
+    data = _judging_progress(event)
+    data["version"] = version
+    data["unchanged"] = False
+    return JsonResponse(data)
+
+
+@staff_member_required
+def manage_judges(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    existing_judges = User.objects.filter(username__startswith=f"judge_{event.id}_")
+
+    if request.method == "POST":
+        form = SingleJudgeForm(request.POST)
+        if form.is_valid():
+            first_name = form.cleaned_data['first_name']
+            last_name = form.cleaned_data['last_name']
+            username = f"judge_{event.id}_{first_name.lower().replace(' ', '').replace('.', '')}"
+
+            if not User.objects.filter(username=username).exists():
+                User.objects.create_user(
+                    username=username,
+                    password=first_name,
+                    first_name=first_name,
+                    last_name=last_name,
+                    is_staff=False,
+                    is_active=True
+                )
+                messages.success(request, f"Judge {first_name} {last_name} added.")
+                return redirect('manage_judges', event_id=event.id)
+            else:
+                messages.warning(request, "Judge already exists.")
+    else:
+        form = SingleJudgeForm()
+
+    return render(request, "core/manage_judges.html", {
+        "event": event,
+        "form": form,
+        "judges": existing_judges,
+    })
+
+@staff_member_required
+@require_POST
+def judge_login_links(request, event_id):
+    """Issue fresh one-time login links for every judge of the event."""
+    event = get_object_or_404(Event, id=event_id)
+    existing_judges = User.objects.filter(username__startswith=f"judge_{event.id}_")
+
+    # Links handed out earlier stop working once new ones are generated.
+    JudgeLoginToken.objects.filter(judge__in=existing_judges, used_at__isnull=True).delete()
+
+    login_links = []
+    for judge in existing_judges:
+        token = make_judge_login_token(judge, event)
+        login_links.append({
+            "judge": judge,
+            "url": request.build_absolute_uri(reverse("judge_token_login", args=[token])),
+        })
+
+    if judge_login_expiry(event) <= timezone.now():
+        messages.warning(request, _("This event is over; the generated links are already expired."))
+
+    return render(request, "core/manage_judges.html", {
+        "event": event,
+        "form": SingleJudgeForm(),
+        "judges": existing_judges,
+        "login_links": login_links,
+        "login_links_expire": judge_login_expiry(event),
+    })
+
+
+def judge_token_login(request, token):
+    """Log a judge in from a one-time link and go straight to judging."""
+    login_token = redeem_judge_login_token(token)
+    if login_token is None:
+        messages.error(request, _("This login link is invalid, expired or has already been used."))
+        return redirect("login")
+
+    if request.user.is_authenticated:
+        logout(request)
+    login(request, login_token.judge, backend="django.contrib.auth.backends.ModelBackend")
+    return redirect(f"{reverse('judge_view', args=[login_token.event_id])}?group=0")
+
+
+@staff_member_required
+@require_POST
+def delete_single_judge(request, event_id, judge_id):
+    judge = get_object_or_404(User, id=judge_id, username__startswith=f"judge_{event_id}_")
+    judge.delete()
+    messages.success(request, f"Judge {judge.username} deleted.")
+    return redirect('manage_judges', event_id=event_id)
+
+
+@staff_member_required
+@require_POST
+def delete_judges_for_event(request, event_id):
+    # Delete all judges with the new naming pattern
+    User.objects.filter(username__startswith=f"judge_{event_id}_").delete()
+    return redirect('event_list')
@@ -0,0 +1,54 @@
+import logging
+import sys
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+from django.shortcuts import render
+
+from ..error_alerts import record_server_error
+from ..metrics import render_prometheus
+
+
+logger = logging.getLogger(__name__)
+
+
+def custom_server_error(request):
+    path = request.get_full_path() if request else "unknown"
+    user_id = getattr(getattr(request, "user", None), "id", None)
+    username = getattr(getattr(request, "user", None), "username", "anonymous")
+    remote_addr = request.META.get("REMOTE_ADDR", "unknown") if request else "unknown"
+    user_agent = request.META.get("HTTP_USER_AGENT", "") if request else ""
+
+    logger.exception(
+        "Unhandled server error page reached",
+        extra={
+            "path": path,
+            "user_id": user_id,
+            "username": username,
+            "remote_addr": remote_addr,
+        },
+    )
+
+    # Only count it: the send_outbox worker mails one digest per kind of error
+    try:
+        record_server_error(
+            request,
+            sys.exc_info(),
+            (
+                f"Path: {path}\n"
+                f"User ID: {user_id}\n"
+                f"Username: {username}\n"
+                f"IP: {remote_addr}\n"
+                f"User-Agent: {user_agent}\n"
+            ),
+        )
+    except Exception:
+        logger.exception("Failed to record server error for alerting")
+
+    return render(request, "500.html", status=500)
+
+
+@staff_member_required
+def request_metrics(request):
+    """Per-view request metrics of the worker that serves this request, in Prometheus text format."""
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,141 @@
+import io
+import logging
+import os
+
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_POST
+
+from ..models import Event, Participation
+from ..playback import build_playlist_manifest, get_music_index, set_playback_highlight
+
+
+logger = logging.getLogger(__name__)
+
+
+def _music_category_payload(categories, current_index):
+    total = len(categories)
+    category = categories[current_index] if current_index < total else None
+    return {
+        "index": current_index,
+        "total": total,
+        "key": category["key"] if category else None,
+        "key_str": category["key_str"] if category else None,
+        "entries": category["entries"] if category else [],
+        "has_next": current_index + 1 < total,
+        "has_prev": current_index > 0,
+    }
+
+
+def _clamp_category_index(raw_value, total):
+    try:
+        index = int(raw_value or 0)
+    except (TypeError, ValueError):
+        index = 0
+    return max(0, min(index, total - 1)) if total else 0
+
+
+@staff_member_required
+def event_music_view(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    categories = get_music_index(event)
+    current_index = _clamp_category_index(request.GET.get("group"), len(categories))
+    payload = _music_category_payload(categories, current_index)
+
+    if payload["key_str"]:
+        set_playback_highlight(event, payload["key_str"])
+
+    return render(request, "core/event_music.html", {
+        "event": event,
+        "category": payload,
+        "current_key": payload["key_str"],
+        "current_index": current_index,
+        "total_categories": payload["total"],
+        "has_next": payload["has_next"],
+    })
+
+
+@staff_member_required
+@require_POST
+def event_music_state(request, event_id):
+    """JSON page turn for the music booth: move the highlight and return that category."""
+    event = get_object_or_404(Event, id=event_id)
+
+    categories = get_music_index(event)
+    current_index = _clamp_category_index(request.POST.get("group"), len(categories))
+    payload = _music_category_payload(categories, current_index)
+
+    payload["changed"] = bool(payload["key_str"]) and set_playback_highlight(event, payload["key_str"])
+    return JsonResponse(payload)
+
+
+@staff_member_required
+def event_music_playlist(request, event_id):
+    """Playlist manifest (start-list order, sizes, SHA-256) for the booth's offline mode."""
+    event = get_object_or_404(Event, id=event_id)
+    response = JsonResponse(build_playlist_manifest(event))
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def music_service_worker(request):
+    # Served from the site root so its scope covers both the music pages and /media/.
+    response = render(request, "core/music_sw.js", content_type="application/javascript")
+    response["Service-Worker-Allowed"] = "/"
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@staff_member_required
+def download_event_music(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    participations = (
+        Participation.objects.filter(event=event)
+        .exclude(music_file="")
+        .exclude(music_file__isnull=True)
+        .select_related("style")
+        .order_by("group_display_order", "display_order", "id")
+    )
+
+    if not participations.exists():
+        messages.warning(request, _("No uploaded music files found for this event."))
+        return redirect("event_music", event_id=event.id)
+
+    import zipfile  # only the bulk download builds archives
+
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for p in participations:
+            try:
+                file_obj = p.music_file
+                if not file_obj:
+                    continue
+                file_obj.open("rb")
+                data = file_obj.read()
+                ext = os.path.splitext(file_obj.name)[1] or ".mp3"
+                safe_ext = ext if len(ext) <= 10 else ".mp3"
+                filename = f"{p.id:04d}_{p.group_type}_{p.age_group}_{p.difficulty}{safe_ext}"
+                filename = filename.replace("/", "-").replace("\\", "-")
+                zf.writestr(filename, data)
+            except Exception:
+                logger.exception(
+                    "Failed to add music file to zip",
+                    extra={"event_id": event_id, "participation_id": p.id},
+                )
+            finally:
+                try:
+                    p.music_file.close()
+                except Exception:
+                    pass
+
+    zip_buffer.seek(0)
+    city = (event.city or "event").replace(" ", "_")
+    date_str = event.date.isoformat() if event.date else "no-date"
+    response = HttpResponse(zip_buffer.getvalue(), content_type="application/zip")
+    response["Content-Disposition"] = f'attachment; filename="{city}_{date_str}_music.zip"'
+    return response
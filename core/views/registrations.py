@@ -0,0 +1,621 @@
+from collections import defaultdict
+from datetime import date
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, F, Prefetch, Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_POST
+
+from .. import bulk_import, exports
+from ..age_groups import calculate_age_group
+from ..db import statement_timeout
+from ..forms import GroupParticipationForm, ParticipationImportForm
+from ..models import DanceClub, Dancer, DancerParticipation, Event, Participation
+from ..playback import invalidate_music_index
+from ..snapshots import schedule_snapshot_refresh
+from .common import _export_filename
+
+
+@require_POST
+@login_required
+def calculate_age_group_view(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    group_type = request.POST.get("group_type")
+
+    # ✅ Use dancers[] and strip blanks
+    dancer_ids = [d for d in request.POST.getlist("dancers[]") if d]
+
+    if group_type == "Production":
+        return JsonResponse({
+            "age_group": "Mixed Age",
+            "avg_age": "",
+        })
+
+    dancers = Dancer.objects.filter(id__in=dancer_ids)
+
+    age_group, avg_age = calculate_age_group(dancers)
+    return JsonResponse({
+        "age_group": age_group or "",
+        "avg_age": avg_age or ""
+    })
+
+
+def _age_group_data(form):
+    """Birth dates of the dancers a form can select, for in-browser age groups."""
+    return {
+        "reference_date": date.today().isoformat(),
+        "birth_dates": {
+            str(dancer_id): dob.isoformat()
+            for dancer_id, dob in form.fields["dancers"].queryset.values_list("id", "date_of_birth")
+            if dob
+        },
+    }
+
+
+@login_required
+def register_dancer(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    # ⛔ Block normal clubs if registration is closed
+    if not request.user.is_superuser and not event.registration_open:
+        messages.error(request, _("Registration is currently closed for this event."))
+        return redirect("event_list")
+
+    if request.user.is_superuser:
+        clubs = DanceClub.objects.all()
+        club_id = request.GET.get("club_id")
+        selected_club = None
+
+        if club_id:
+            selected_club = get_object_or_404(DanceClub, id=club_id)
+
+        if not selected_club:
+            return render(request, 'core/register_dancer.html', {
+                'event': event,
+                'clubs': clubs,
+                'selected_club': None,
+                'form': None,
+                'is_superuser': True,
+            })
+    else:
+        selected_club = get_object_or_404(DanceClub, user=request.user)
+        clubs = None
+        club_id = selected_club.id
+
+    avg_age = None
+    age_group = None
+
+    if request.method == 'POST':
+        print("DEBUG dancers POST:", request.POST.getlist("dancers"))
+        form = GroupParticipationForm(request.POST, request.FILES, club=selected_club, event=event)
+        if form.is_valid():
+            dancers = form.cleaned_data['dancers']
+            group_type = form.cleaned_data['group_type']
+            if group_type == "Production":
+                age_group, avg_age = "Mixed Age", None
+            else:
+                age_group, avg_age = calculate_age_group(dancers)
+
+            participation = Participation.objects.create(
+                event=event,
+                club=selected_club,
+                style=form.cleaned_data['style'],
+                group_type=form.cleaned_data['group_type'],
+                age_group=age_group,  # ✅ auto-assigned
+                difficulty=form.cleaned_data['difficulty'],
+                choreographer_name=form.cleaned_data['choreographer_name'],
+                choreography_name=form.cleaned_data['choreography_name'],
+                group_name=form.cleaned_data.get('group_name'),
+                # ⛔ only save music if window is open
+                music_file=form.cleaned_data.get('music_file') if event.music_open else None,
+            )
+
+            # save dancer links
+            for dancer in dancers:
+                DancerParticipation.objects.create(participation=participation, dancer=dancer)
+            invalidate_music_index(event.id)
+            schedule_snapshot_refresh(event)
+
+            if form.cleaned_data.get('music_file') and not event.music_open:
+                messages.warning(request, _("Music file was not saved because the upload period is closed."))
+
+            messages.success(request, _("Participation registered successfully."))
+            return redirect(f'{request.path}?club_id={club_id}')
+    else:
+        form = GroupParticipationForm(club=selected_club, event=event)
+
+    # The age group preview is computed in the browser from age_group_data;
+    # the server only recomputes it on a valid submit above.
+
+    # Force field value & disable editing
+    if age_group:
+        form.fields['age_group'].initial = age_group
+    form.fields['age_group'].disabled = True
+
+    return render(request, 'core/register_dancer.html', {
+        'form': form,
+        'event': event,
+        'clubs': clubs,
+        'selected_club': selected_club,
+        'is_superuser': request.user.is_superuser,
+        'avg_age': avg_age,
+        'age_group_data': _age_group_data(form),
+    })
+
+
+@login_required
+def import_participations(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    if not request.user.is_superuser and not event.registration_open:
+        messages.error(request, _("Registration is currently closed for this event."))
+        return redirect("event_list")
+
+    if request.user.is_superuser:
+        club = get_object_or_404(DanceClub, id=request.GET.get("club_id") or 0)
+    else:
+        club = get_object_or_404(DanceClub, user=request.user)
+    register_url = f"{reverse('register_dancer', args=[event.id])}?club_id={club.id}"
+
+    report = None
+    if request.method == 'POST':
+        form = ParticipationImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                report = bulk_import.import_participations(
+                    event, club, form.cleaned_data['sheet'], form.cleaned_data['music_files'],
+                )
+            except bulk_import.SheetError as exc:
+                form.add_error('sheet', str(exc))
+            else:
+                if not report.errors:
+                    invalidate_music_index(event.id)
+                    schedule_snapshot_refresh(event)
+                    for row_number, warning in report.warnings:
+                        messages.warning(request, _("Row %(row)d: %(warning)s") % {"row": row_number, "warning": warning})
+                    messages.success(request, _("Imported %(created)d participation(s).") % {"created": report.created})
+                    return redirect(register_url)
+    else:
+        form = ParticipationImportForm()
+
+    return render(request, 'core/import_participations.html', {
+        'form': form,
+        'event': event,
+        'club': club,
+        'report': report,
+        'columns': bulk_import.PARTICIPATION_COLUMNS,
+        'register_url': register_url,
+        'is_superuser': request.user.is_superuser,
+    })
+
+
+# Entries per page of list_event_participants and its JSON feed.
+PARTICIPANTS_PAGE_SIZE = 100
+
+CHOICE_FILTERS = (
+    ("group_type", Participation.CHOREO_TYPE_CHOICES),
+    ("age_group", Participation.AGE_GROUP_CHOICES),
+    ("difficulty", Participation.DIFFICULTY_CHOICES),
+)
+
+
+def _participant_queryset(request, event):
+    """
+    Entries of `event` the user may list, narrowed by the GET filters (club,
+    style, group_type, age_group, difficulty, music=missing). Returns the
+    queryset and the filters that were applied; unknown values are ignored.
+    """
+    params = request.GET
+    filters = {}
+    participations = Participation.objects.filter(event=event)
+
+    if request.user.is_superuser:
+        if params.get("club", "").isdigit():
+            filters["club"] = int(params["club"])
+            participations = participations.filter(club_id=filters["club"])
+    else:
+        club = get_object_or_404(DanceClub, user=request.user)
+        # Every entry one of the club's dancers is in, whoever registered it
+        participations = participations.filter(id__in=(
+            DancerParticipation.objects.filter(participation__event=event, dancer__club=club)
+            .values("participation_id")
+        ))
+
+    if params.get("style", "").isdigit():
+        filters["style"] = int(params["style"])
+        participations = participations.filter(style_id=filters["style"])
+    for field, choices in CHOICE_FILTERS:
+        value = params.get(field, "")
+        if value in dict(choices):
+            filters[field] = value
+            participations = participations.filter(**{field: value})
+    if params.get("music") == "missing":
+        filters["music"] = "missing"
+        participations = participations.filter(Q(music_file__isnull=True) | Q(music_file=""))
+    return participations, filters
+
+
+def _parse_cursor(value):
+    """'<club id>.<entry id>' (club 0: entry without a club) -> (club_id, entry_id), None if malformed."""
+    club_id, _sep, entry_id = (value or "").partition(".")
+    if not (club_id.isdigit() and entry_id.isdigit()):
+        return None
+    return int(club_id) or None, int(entry_id)
+
+
+def _participant_page(participations, after=None, size=PARTICIPANTS_PAGE_SIZE):
+    """
+    One keyset page of entries ordered by (club, id), entries without a club
+    last, starting after the `after` cursor. Reads only the page's rows
+    (through participation_event_club_idx) however deep the page is.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if after:
+        club_id, entry_id = after
+        if club_id is None:
+            participations = participations.filter(club__isnull=True, id__gt=entry_id)
+        else:
+            participations = participations.filter(
+                Q(club_id=club_id, id__gt=entry_id) | Q(club_id__gt=club_id) | Q(club__isnull=True)
+            )
+
+    page = list(
+        participations.select_related("style", "club")
+        .prefetch_related(Prefetch(
+            "dancer_links", queryset=DancerParticipation.objects.select_related("dancer").order_by("id"),
+        ))
+        .order_by(F("club_id").asc(nulls_last=True), "id")[:size + 1]
+    )
+    next_cursor = None
+    if len(page) > size:
+        page = page[:size]
+        next_cursor = f"{page[-1].club_id or 0}.{page[-1].id}"
+
+    rows = [{
+        "style": p.style,
+        "group_type": p.group_type,
+        "age_group": p.age_group,
+        "difficulty": p.difficulty,
+        "choreographer_name": p.choreographer_name,
+        "choreography_name": p.choreography_name or "Untitled",
+        "group_name": p.group_name,
+        "club": p.club,
+        "dancers": [dp.dancer for dp in p.dancer_links.all()],
+        "participation_id": p.id,
+        "music_file": p.music_file,
+    } for p in page]
+    return rows, next_cursor
+
+
+@login_required
+@statement_timeout()
+def list_event_participants(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    # 📊 Club Summary Mode
+    if request.user.is_superuser and request.GET.get("view") == "summary":
+        clubs = DanceClub.objects.all()
+        summary_data = []
+
+        total_counts = {
+            "Solo": 0, "Duo": 0, "Trio": 0, "Group": 0, "Formation": 0, "Production": 0,
+            "unique_dancer_count": 0,
+            "total_dancer_count": 0
+        }
+
+        # One pass over the event's dancer links instead of queries per club and entry
+        entry_dancers = defaultdict(list)
+        entry_group_type = {}
+        club_entries = defaultdict(set)
+        club_event_dancers = defaultdict(dict)
+        for dp in (
+            DancerParticipation.objects.filter(participation__event=event)
+            .select_related("dancer", "participation")
+            .order_by("id")
+        ):
+            entry_dancers[dp.participation_id].append(dp.dancer_id)
+            entry_group_type[dp.participation_id] = dp.participation.group_type
+            club_entries[dp.dancer.club_id].add(dp.participation_id)
+            club_event_dancers[dp.dancer.club_id][dp.dancer_id] = dp.dancer
+
+        for club in clubs:
+            group_type_counts = defaultdict(int)
+            dancer_ids = set()
+            total_dancer_count = 0
+
+            for pid in club_entries.get(club.id, ()):
+                group_type_counts[entry_group_type[pid]] += 1
+
+                linked_dancers = entry_dancers[pid]
+
+                total_dancer_count += len(linked_dancers)
+                dancer_ids.update(linked_dancers)
+
+            unique_count = len(dancer_ids)
+            unique_dancers = sorted(
+                club_event_dancers.get(club.id, {}).values(),
+                key=lambda d: (d.last_name, d.first_name),
+            )
+
+            # 🚫 Skip clubs with no registered dancers
+            if unique_count == 0 and total_dancer_count == 0:
+                continue
+
+            summary_data.append({
+                "club": club,
+                "group_type_counts": dict(group_type_counts),
+                "unique_dancer_count": unique_count,
+                "total_dancer_count": total_dancer_count,
+                "unique_dancers": unique_dancers,
+            })
+
+            # Update totals only for clubs with dancers
+            for gt in ["Solo", "Duo", "Trio", "Group", "Formation", "Production"]:
+                total_counts[gt] += group_type_counts.get(gt, 0)
+            total_counts["unique_dancer_count"] += unique_count
+            total_counts["total_dancer_count"] += total_dancer_count
+
+        return render(request, "core/participant_summary_by_club.html", {
+            "event": event,
+            "summary_data": summary_data,
+            "total_counts": total_counts
+        })
+
+    # Regular participant view: one table row per Participation, a page at a time
+    participations, filters = _participant_queryset(request, event)
+    rows, next_cursor = _participant_page(participations, _parse_cursor(request.GET.get("after")))
+
+    return render(request, "core/list_event_participants.html", {
+        "event": event,
+        "grouped_participations": rows,
+        "next_cursor": next_cursor,
+        "total_count": participations.count(),
+        "filters": filters,
+        "filter_query": urlencode(filters),
+        "filter_clubs": (
+            DanceClub.objects.filter(participations__event=event).distinct().order_by("club_name")
+            if request.user.is_superuser else None
+        ),
+        "filter_styles": event.style_categories.order_by("name"),
+        "group_type_choices": Participation.CHOREO_TYPE_CHOICES,
+        "age_group_choices": Participation.AGE_GROUP_CHOICES,
+        "difficulty_choices": Participation.DIFFICULTY_CHOICES,
+    })
+
+
+@login_required
+@statement_timeout()
+def list_event_participants_rows(request, event_id):
+    """
+    Next page of list_event_participants for incremental loading: the rendered
+    table rows and the cursor for the page after them (null on the last page).
+    """
+    event = get_object_or_404(Event, id=event_id)
+    participations, _filters = _participant_queryset(request, event)
+    rows, next_cursor = _participant_page(participations, _parse_cursor(request.GET.get("after")))
+    html = render_to_string(
+        "core/list_event_participants_rows.html", {"grouped_participations": rows}, request=request,
+    )
+    return JsonResponse({"html": html, "next": next_cursor})
+
+@login_required
+def edit_participation(request, participation_id):
+    participation = get_object_or_404(Participation, id=participation_id)
+    event = participation.event
+
+    dancers = DancerParticipation.objects.filter(participation=participation).select_related("dancer__club")
+    dancer_list = [dp.dancer for dp in dancers]
+    club = dancer_list[0].club if dancer_list else None
+
+    limits = {
+        "Solo": (1, 1),
+        "Duo": (2, 2),
+        "Trio": (3, 3),
+        "Group": (4, 9),
+        "Formation": (10, 29),
+        "Production": (30, 200),
+    }
+    min_required, max_required = limits.get(participation.group_type, (0, 999))
+    if not (min_required <= len(dancer_list) <= max_required):
+        messages.warning(
+            request,
+            _("This entry has an invalid dancer count for its group type. Please review and save corrections."),
+        )
+
+    if not request.user.is_superuser and (not club or club.user != request.user):
+        return redirect('club_dashboard')
+
+    # Case 1: both closed → block
+    if not request.user.is_superuser and not event.registration_open and not event.music_open:
+        messages.error(request, _("Editing is closed for this event."))
+        return redirect("event_list")
+
+    if request.method == 'POST':
+        # ⚡ Case 2: Only music open (skip GroupParticipationForm)
+        if not request.user.is_superuser and not event.registration_open and event.music_open:
+            if "remove_music" in request.POST:
+                if participation.music_file:
+                    participation.music_file.delete(save=False)
+                participation.music_file = None
+            elif "music_file" in request.FILES:
+                participation.music_file = request.FILES["music_file"]
+            participation.save()
+            invalidate_music_index(event.id)
+            messages.success(request, _("Music updated successfully."))
+            return redirect('list_event_participants', event_id=event.id)
+
+        # ⚡ Case 3: Full editing allowed
+        form = GroupParticipationForm(request.POST, request.FILES, club=club, event=event)
+        if form.is_valid():
+            new_dancers = form.cleaned_data['dancers']
+            group_type = form.cleaned_data['group_type']
+            if group_type == "Production":
+                age_group, avg_age = "Mixed Age", None
+            else:
+                age_group, avg_age = calculate_age_group(new_dancers)
+
+            participation.style = form.cleaned_data['style']
+            participation.group_type = form.cleaned_data['group_type']
+            participation.age_group = age_group
+            participation.difficulty = form.cleaned_data['difficulty']
+            participation.choreographer_name = form.cleaned_data['choreographer_name']
+            participation.choreography_name = form.cleaned_data['choreography_name']
+            participation.group_name = form.cleaned_data.get('group_name')
+            participation.club = club
+
+            # update dancer links
+            DancerParticipation.objects.filter(participation=participation).exclude(dancer__in=new_dancers).delete()
+            for dancer in new_dancers:
+                DancerParticipation.objects.get_or_create(participation=participation, dancer=dancer)
+
+            # music (admin or within window)
+            if "remove_music" in request.POST:
+                if participation.music_file:
+                    participation.music_file.delete(save=False)
+                participation.music_file = None
+            elif form.cleaned_data.get("music_file"):
+                if event.music_open or request.user.is_superuser:
+                    participation.music_file = form.cleaned_data["music_file"]
+
+            participation.save()
+            invalidate_music_index(event.id)
+            schedule_snapshot_refresh(event)
+            messages.success(request, _("Participation updated successfully."))
+            return redirect('list_event_participants', event_id=event.id)
+        else:
+            messages.error(request, _("Please correct the errors below."))
+    else:
+        initial_dancers = list(
+            DancerParticipation.objects.filter(participation=participation).values_list("dancer_id", flat=True)
+        )
+        form = GroupParticipationForm(
+            club=club,
+            event=event,
+            initial={
+                "dancers": initial_dancers,
+                "style": participation.style,
+                "group_type": participation.group_type,
+                "age_group": participation.age_group,
+                "difficulty": participation.difficulty,
+                "choreographer_name": participation.choreographer_name,
+                "choreography_name": participation.choreography_name,
+                "group_name": participation.group_name,
+            },
+        )
+
+    return render(request, "core/edit_participation.html", {
+        "form": form,
+        "participation": participation,
+        "age_group_data": _age_group_data(form),
+    })
+
+
+@login_required
+def delete_participation(request, participation_id):
+    participation = get_object_or_404(Participation, id=participation_id)
+    event = participation.event
+
+    if request.method != "POST":
+        return redirect("list_event_participants", event_id=event.id)
+
+    # Block normal clubs if registration is closed
+    if not request.user.is_superuser and not event.registration_open:
+        messages.error(request, _("You cannot delete participations after registration has closed."))
+        return redirect("list_event_participants", event_id=event.id)
+
+    # Permission check: admin can delete any; club user only their own participation
+    if not request.user.is_superuser:
+        club = get_object_or_404(DanceClub, user=request.user)
+        owns_participation = DancerParticipation.objects.filter(
+            participation=participation,
+            dancer__club=club,
+        ).exists()
+        if not owns_participation:
+            messages.error(request, _("You do not have permission to delete this participation."))
+            return redirect("list_event_participants", event_id=event.id)
+
+    participation.delete()
+    invalidate_music_index(event.id)
+    schedule_snapshot_refresh(event)
+    messages.success(request, _("Participation deleted successfully."))
+    return redirect("list_event_participants", event_id=event.id)
+
+
+@login_required
+def delete_participation_group(request):
+    if request.method == 'POST':
+        event_id = request.POST.get("event_id")
+        style_id = request.POST.get("style_id")
+        group_type = request.POST.get("group_type")
+        age_group = request.POST.get("age_group")
+        difficulty = request.POST.get("difficulty")
+        choreographer_name = request.POST.get("choreographer_name")
+
+        event = get_object_or_404(Event, id=event_id)
+
+        # ⛔ Block normal clubs if registration is closed
+        if not request.user.is_superuser and not event.registration_open:
+            messages.error(request, _("You cannot delete participations after registration has closed."))
+            return redirect('list_event_participants', event_id=event.id)
+
+        participations = Participation.objects.filter(
+            event=event,
+            style_id=style_id,
+            group_type=group_type,
+            age_group=age_group,
+            difficulty=difficulty,
+            choreographer_name=choreographer_name
+        )
+
+        if not request.user.is_superuser:
+            club = get_object_or_404(DanceClub, user=request.user)
+            participations = participations.filter(dancer_links__dancer__club=club).distinct()
+
+        participations.delete()
+        invalidate_music_index(event.id)
+        schedule_snapshot_refresh(event)
+        messages.success(request, _("Participation deleted successfully."))
+        return redirect('list_event_participants', event_id=event.id)
+
+    return redirect('event_list')
+
+
+@login_required
+def export_registrations_csv(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    club = None if request.user.is_superuser else get_object_or_404(DanceClub, user=request.user)
+    return exports.csv_response(
+        _export_filename(event, "registrations"),
+        exports.REGISTRATION_HEADER,
+        exports.registration_rows(event, club=club),
+    )
+
+@login_required
+@statement_timeout()
+def list_event_participants_by_category(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    # Group participations by (style, group_type, age_group, difficulty)
+    categories = (
+        Participation.objects.filter(event=event)
+        .values("style__name", "group_type", "age_group", "difficulty")
+        .annotate(competitors=Count("id"))
+        .order_by("difficulty", "style__name", "group_type", "age_group")
+    )
+
+    # Make sure 'A' comes before 'B' explicitly
+    categories = sorted(categories, key=lambda x: (0 if x["difficulty"] == "A" else 1,
+                                                   x["style__name"],
+                                                   x["group_type"],
+                                                   x["age_group"]))
+
+    return render(request, "core/list_event_participants_by_category.html", {
+        "event": event,
+        "categories": categories
+    })
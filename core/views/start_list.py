@@ -0,0 +1,335 @@
+import json
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_POST
+
+from .. import exports
+from ..db import read_only_transaction, statement_timeout, write_transaction
+from ..forms import CeremonyForm
+from ..models import DancerParticipation, Event, EventPlaybackState, Participation, StartListSlot
+from ..playback import get_music_duration, invalidate_music_index
+from ..snapshots import START_LIST, schedule_snapshot_refresh, serves_snapshots, snapshot_url
+from ..start_list import default_start_list_order
+from .common import _export_filename
+
+
+def _build_start_list(event, participations, ceremonies, dancer_map, is_admin=False):
+    """
+    Merge performances and ceremony slots into the timed start list, grouped by
+    category. Start times run from event.start_time using each entry's music length.
+    Non-admins see the group name instead of the dancer list for groups over three.
+    """
+    grouped_entries = OrderedDict()
+    global_counter = 101
+    current_time = datetime.combine(datetime.today(), event.start_time) if event.start_time else None
+
+    # Unified timeline
+    timeline = []
+    for p in participations:
+        timeline.append((p.display_order, "performance", p))
+    for c in ceremonies:
+        timeline.append((c.display_order, "ceremony", c))
+
+    # ✅ safe sort (handles NULLs in display_order)
+    timeline.sort(key=lambda x: x[0] if x[0] is not None else 999999)
+
+    for _, entry_type, obj in timeline:
+        if entry_type == "performance":
+            dancers = dancer_map.get(obj.id, [])
+            club = dancers[0].club if dancers else None
+            group_key = (obj.style.name, obj.group_type, obj.age_group, obj.difficulty)
+
+            if group_key not in grouped_entries:
+                grouped_entries[group_key] = []
+
+            start_time_str = current_time.strftime("%H:%M") if current_time else None
+            dancer_names = [f"{d.first_name} {d.last_name}" for d in dancers]
+            grouped_entries[group_key].append({
+                "id": obj.id,
+                "style": obj.style.name,
+                "difficulty": obj.difficulty,
+                "group_type": obj.group_type,
+                "age_group": obj.age_group,
+                "dancers": obj.group_name if not is_admin and len(dancers) > 3 and obj.group_name else dancers,
+                "num_dancers": len(dancers),
+                "group_name": obj.group_name,
+                "dancer_names": dancer_names,
+                "dancer_names_text": ", ".join(dancer_names),
+                "choreographer": obj.choreographer_name,
+                "choreography_name": obj.choreography_name,
+                "club_name": club.club_name if club else "–",
+                "club_city": club.city if club else "–",
+                "global_row_number": global_counter,
+                "start_time": start_time_str,
+                "is_ceremony": False,
+            })
+            global_counter += 1
+            if current_time:
+                current_time += timedelta(seconds=get_music_duration(obj))
+
+        elif entry_type == "ceremony":
+            start_time_str = current_time.strftime("%H:%M") if current_time else None
+            end_time_str = (current_time + timedelta(minutes=obj.duration_minutes)).strftime("%H:%M") if current_time else None
+            group_key = ("Ceremony", "", obj.age_group or "", obj.id)
+            grouped_entries[group_key] = [{
+                "id": f"ceremony-{obj.id}",
+                "title": obj.title,
+                "start_time": start_time_str,
+                "end_time": end_time_str,
+                "duration": obj.duration_minutes,
+                "is_ceremony": True,
+                "age_group": obj.age_group,
+            }]
+            if current_time:
+                current_time += timedelta(minutes=obj.duration_minutes)
+
+    return grouped_entries
+
+
+@login_required
+@read_only_transaction
+def start_list(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    is_admin = request.user.is_superuser
+    show_entries = event.start_list_published or is_admin
+    enable_auto_refresh = is_admin
+
+    participations = list(
+        Participation.objects.filter(event=event).select_related("style")
+    )
+    ceremonies = list(StartListSlot.objects.filter(event=event))
+
+    # Prefetch dancers
+    dancer_participations = DancerParticipation.objects.filter(
+        participation__in=participations
+    ).select_related("dancer", "dancer__club")
+
+    dancer_map = defaultdict(list)
+    for dp in dancer_participations:
+        dancer_map[dp.participation_id].append(dp.dancer)
+
+    grouped_entries = _build_start_list(event, participations, ceremonies, dancer_map, is_admin=is_admin)
+
+    # Highlight
+    highlight_key = None
+    try:
+        highlight_key = EventPlaybackState.objects.get(event=event).current_highlight_key
+    except EventPlaybackState.DoesNotExist:
+        pass
+
+    return render(request, "core/start_list.html", {
+        "event": event,
+        "grouped_entries": grouped_entries if show_entries else {},
+        "is_admin": is_admin,
+        "is_published": event.start_list_published,
+        "show_entries": show_entries,
+        "highlight_key": highlight_key,
+        "enable_auto_refresh": enable_auto_refresh,
+        "snapshot_url": (
+            snapshot_url(event, START_LIST) if event.start_list_published and serves_snapshots() else None
+        ),
+    })
+
+
+@user_passes_test(lambda u: u.is_superuser)
+@statement_timeout()
+def manage_start_list(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    participations = list(
+        Participation.objects.filter(event=event).select_related("style")
+    )
+    ceremonies = list(StartListSlot.objects.filter(event=event))
+
+    dancer_participations = DancerParticipation.objects.filter(
+        participation__in=participations
+    ).select_related("dancer", "dancer__club")
+
+    dancer_map = defaultdict(list)
+    for dp in dancer_participations:
+        dancer_map[dp.participation_id].append(dp.dancer)
+
+    grouped_entries = _build_start_list(event, participations, ceremonies, dancer_map, is_admin=True)
+
+    # Highlight
+    highlight_key = None
+    try:
+        highlight_key = EventPlaybackState.objects.get(event=event).current_highlight_key
+    except EventPlaybackState.DoesNotExist:
+        pass
+
+    return render(request, "core/manage_start_list.html", {
+        "event": event,
+        "grouped_entries": grouped_entries,
+        "is_admin": True,
+        "is_published": event.start_list_published,
+        "show_entries": True,
+        "highlight_key": highlight_key,
+    })
+
+
+@staff_member_required
+@require_POST
+@statement_timeout()
+def publish_start_list(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    mode = request.POST.get("mode", "default")
+
+    participations = list(Participation.objects.filter(event=event).select_related("style"))
+    ceremonies = list(StartListSlot.objects.filter(event=event))
+
+    if mode in ("save", "publish"):
+        ordered_json = request.POST.get("ordered_ids_json", "[]")
+        try:
+            ordered_ids = json.loads(ordered_json)
+        except Exception:
+            ordered_ids = []
+
+        group_index_map = {}
+        current_index = 0
+
+        # One write transaction for the whole reorder instead of one per row
+        with write_transaction():
+            for idx, pid in enumerate(ordered_ids):
+                if str(pid).startswith("ceremony-"):
+                    slot_id = int(pid.split("-")[1])
+                    try:
+                        c = StartListSlot.objects.get(id=slot_id, event=event)
+                        c.display_order = idx
+                        c.save(update_fields=["display_order"])
+                    except StartListSlot.DoesNotExist:
+                        continue
+                else:
+                    try:
+                        p = Participation.objects.get(id=int(pid), event=event)
+                        group_key = (p.style.name, p.group_type, p.age_group, p.difficulty)
+                        if group_key not in group_index_map:
+                            group_index_map[group_key] = current_index
+                            current_index += 1
+
+                        p.display_order = idx
+                        p.group_display_order = group_index_map[group_key]
+                        p.save(update_fields=["display_order", "group_display_order"])
+                    except Participation.DoesNotExist:
+                        continue
+
+        if mode == "publish":
+            event.start_list_published = True
+            event.save(update_fields=["start_list_published"])
+            messages.success(request, _("Start list published successfully."))
+        else:
+            messages.success(request, _("Start list saved successfully."))
+
+    elif mode == "default":
+        # Reset to default group ordering
+        with write_transaction():
+            Participation.objects.bulk_update(
+                default_start_list_order(participations),
+                ["group_display_order", "display_order"],
+                batch_size=500,
+            )
+
+        messages.success(request, _("Start list reset to default order."))
+
+    else:
+        messages.error(request, "Invalid mode.")
+        return redirect("manage_start_list", event_id=event.id)
+
+    invalidate_music_index(event.id)
+    if event.start_list_published:
+        schedule_snapshot_refresh(event, [START_LIST])
+    return redirect("manage_start_list", event_id=event.id)
+
+
+@staff_member_required
+@require_POST
+def unpublish_start_list(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    event.start_list_published = False
+    event.save(update_fields=["start_list_published"])
+    schedule_snapshot_refresh(event, [START_LIST])
+    messages.info(request, _("Start list unpublished."))
+    return redirect('manage_start_list', event_id=event.id)
+
+
+@login_required
+def export_start_list_csv(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+    if not (event.start_list_published or request.user.is_superuser):
+        raise Http404
+    return exports.csv_response(
+        _export_filename(event, "start-list"),
+        exports.START_LIST_HEADER,
+        exports.start_list_rows(event, is_admin=request.user.is_superuser),
+    )
+
+
+@staff_member_required
+def add_ceremony(request, event_id):
+    event = get_object_or_404(Event, id=event_id)
+
+    # fetch ceremonies for this event
+    ceremonies = StartListSlot.objects.filter(event=event, is_ceremony=True).order_by("display_order")
+
+    if request.method == "POST":
+        form = CeremonyForm(request.POST)
+        if form.is_valid():
+            slot = form.save(commit=False)
+            slot.event = event
+            slot.is_ceremony = True   # ✅ mark as ceremony
+            slot.display_order = StartListSlot.objects.filter(event=event).count() + 1
+            slot.save()
+            if event.start_list_published:
+                schedule_snapshot_refresh(event, [START_LIST])
+            messages.success(request, _("Ceremony added successfully."))
+            return redirect("add_ceremony", event_id=event.id)
+    else:
+        form = CeremonyForm()
+
+    return render(request, "core/add_ceremony.html", {
+        "form": form,
+        "event": event,
+        "ceremonies": ceremonies,
+    })
+
+
+@staff_member_required
+def edit_ceremony(request, slot_id):
+    slot = get_object_or_404(StartListSlot, id=slot_id, is_ceremony=True)
+    event = slot.event
+
+    if request.method == "POST":
+        form = CeremonyForm(request.POST, instance=slot)
+        if form.is_valid():
+            form.save()
+            if event.start_list_published:
+                schedule_snapshot_refresh(event, [START_LIST])
+            messages.success(request, _("Ceremony updated successfully."))
+            return redirect("add_ceremony", event_id=event.id)
+    else:
+        form = CeremonyForm(instance=slot)
+
+    return render(request, "core/add_ceremony.html", {
+        "form": form,
+        "event": event,
+        "ceremonies": StartListSlot.objects.filter(event=event, is_ceremony=True).order_by("display_order"),
+        "edit_mode": True,
+    })
+
+
+@staff_member_required
+def delete_ceremony(request, slot_id):
+    slot = get_object_or_404(StartListSlot, id=slot_id, is_ceremony=True)
+    event = slot.event
+    slot.delete()
+    if event.start_list_published:
+        schedule_snapshot_refresh(event, [START_LIST])
+    messages.success(request, _("Ceremony deleted successfully."))
+    return redirect("add_ceremony", event_id=event.id)
@@ -63,6 +63,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -74,6 +75,13 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Per-request metrics (core.middleware.RequestMetricsMiddleware); a request
+# is logged to "core.metrics" when it crosses either threshold.
+REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+REQUEST_METRICS_SLOW_MS = int(os.getenv("REQUEST_METRICS_SLOW_MS", "1000"))
+REQUEST_METRICS_SLOW_QUERIES = int(os.getenv("REQUEST_METRICS_SLOW_QUERIES", "50"))
+REQUEST_METRICS_TOP_SHAPES = 5
+
 ROOT_URLCONF = "dance_portal.urls"
 
 TEMPLATES = [
@@ -119,6 +127,14 @@ STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
 ]
 
+# collectstatic writes content-hashed copies (e.g. site.3f2a9c1b7d4e.css) plus
+# .gz/.br variants; templates link the hashed names via {% static %}, so nginx
+# can cache them forever. With DEBUG=True the plain names are served as before.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.storage.PrecompressedManifestStaticFilesStorage"},
+}
+
 # Uploaded media
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -126,6 +142,11 @@ MEDIA_ROOT = BASE_DIR / "media"
 # ── Database ───────────────────────────────────────────────────────────────────
 USE_POSTGRES = os.getenv("USE_POSTGRES", "0").lower() in ("1", "true", "yes")
 
+POSTGRES_POOL = os.getenv("POSTGRES_POOL", "0").lower() in ("1", "true", "yes")
+
+# Server-side cap for statements in expensive admin views (core.db.statement_timeout).
+ADMIN_STATEMENT_TIMEOUT_MS = int(os.getenv("ADMIN_STATEMENT_TIMEOUT_MS", "30000"))
+
 if USE_POSTGRES:
     DATABASES = {
         "default": {
@@ -135,6 +156,18 @@ if USE_POSTGRES:
             "PASSWORD": os.getenv("POSTGRES_PASSWORD", "change-me"),
             "HOST": os.getenv("POSTGRES_HOST", "localhost"),
             "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            # Reuse connections across requests (the pool replaces this when on);
+            # health checks swap out connections the server has dropped.
+            "CONN_MAX_AGE": 0 if POSTGRES_POOL else int(os.getenv("POSTGRES_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                # psycopg pool per gunicorn worker (needs psycopg[pool]).
+                "pool": {
+                    "min_size": int(os.getenv("POSTGRES_POOL_MIN", "2")),
+                    "max_size": int(os.getenv("POSTGRES_POOL_MAX", "8")),
+                    "timeout": int(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+                },
+            } if POSTGRES_POOL else {},
         }
     }
 else:
@@ -142,9 +175,45 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": {
+                # Seconds a writer waits for the lock before "database is locked".
+                "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "20")),
+                # Write paths take the lock at BEGIN via core.db.write_transaction;
+                # other atomic blocks keep the default deferred BEGIN.
+            },
         }
     }
 
+# Live-event write profile, applied to each new SQLite connection by
+# core.db.configure_sqlite_connection (WAL, relaxed fsync, mmap reads).
+SQLITE_PRAGMAS_ENABLED = os.getenv("SQLITE_PRAGMAS_ENABLED", "1").lower() in ("1", "true", "yes")
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "20")) * 1000,
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+} if SQLITE_PRAGMAS_ENABLED else {}
+
+# ── Cache ──────────────────────────────────────────────────────────────────────
+# File-based so all gunicorn workers share entries (and invalidations).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("DJANGO_CACHE_DIR", str(BASE_DIR / "cache")),
+    }
+}
+
+# ── Public page cache ──────────────────────────────────────────────────────────
+# Anonymous home / public event list pages (core.page_cache) are cached until an
+# Event changes, at most this long; nginx may reuse a response for PUBLIC_PAGE_MAX_AGE.
+PUBLIC_PAGE_CACHE_SECONDS = int(os.getenv("PUBLIC_PAGE_CACHE_SECONDS", "3600"))
+PUBLIC_PAGE_MAX_AGE = int(os.getenv("PUBLIC_PAGE_MAX_AGE", "10"))
+
+# ── Bulk import ────────────────────────────────────────────────────────────────
+# Largest roster / entry sheet accepted in one upload (rows after the header).
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "2000"))
+
 # ── Password validation ────────────────────────────────────────────────────────
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -156,7 +225,7 @@ AUTH_PASSWORD_VALIDATORS = [
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # ── Email (Gmail App Password) ─────────────────────────────────────────────────
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -168,6 +237,11 @@ SERVER_EMAIL = os.getenv("SERVER_EMAIL", DEFAULT_FROM_EMAIL)
 ADMINS = [
     ("Developer", DEVELOPER_ALERT_EMAIL),
 ]
+# Views queue mail in OutboxEmail; `manage.py send_outbox` delivers it.
+EMAIL_OUTBOX_RATE_PER_MINUTE = int(os.getenv("EMAIL_OUTBOX_RATE_PER_MINUTE", "60"))
+# 500s are grouped by exception, code location and URL route; each group is
+# mailed to DEVELOPER_ALERT_EMAIL at most once per window (by send_outbox).
+ERROR_ALERT_WINDOW_MINUTES = int(os.getenv("ERROR_ALERT_WINDOW_MINUTES", "15"))
 
 # Invalid Host headers are usually internet scanners hitting the VPS IP/reverse DNS.
 # Keep real 500 emails, but do not email admins for this noisy security logger.
@@ -178,12 +252,20 @@ LOGGING = {
         "null": {
             "class": "logging.NullHandler",
         },
+        "console": {
+            "class": "logging.StreamHandler",
+        },
     },
     "loggers": {
         "django.security.DisallowedHost": {
             "handlers": ["null"],
             "propagate": False,
         },
+        "core.metrics": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
 }
 
@@ -4,6 +4,8 @@ from core.views import CustomLoginView, custom_logout_view
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.auth import views as auth_views  
+from django.views.decorators.csrf import csrf_exempt
+from django.views.i18n import set_language
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -40,7 +42,9 @@ urlpatterns = [
     ),
 
     path('', include('core.urls')),
-    path("i18n/", include("django.conf.urls.i18n")),
+    # Switching language only sets a cookie; exempt so the switcher needs no
+    # per-visitor token and public pages can be shared from the cache
+    path("i18n/setlang/", csrf_exempt(set_language), name="set_language"),
 ]
 
 if settings.DEBUG:
@@ -45,6 +45,9 @@ python manage.py compilemessages --ignore venv --ignore staticfiles --ignore med
 echo "🔹 Collecting static files..."
 python manage.py collectstatic --noinput
 
+echo "🔹 Checking worker start-up import time..."
+python manage.py check_import_time || echo "WARNING: start-up import budget exceeded; see the output above."
+
 # === Gunicorn service ===
 echo "🔹 Updating Gunicorn systemd service..."
 sudo cp $PROJECT_DIR/gunicorn.service /etc/systemd/system/$SERVICE_NAME.service
@@ -52,6 +55,18 @@ sudo systemctl daemon-reload
 sudo systemctl enable $SERVICE_NAME
 echo "INFO: Ensure /opt/dance_portal_starter/.env exists on the server (not in git)."
 
+# === Outbox email worker ===
+echo "🔹 Updating outbox worker systemd service..."
+sudo cp $PROJECT_DIR/outbox.service /etc/systemd/system/outbox.service
+sudo systemctl daemon-reload
+sudo systemctl enable outbox
+
+# === Media file purge worker ===
+echo "🔹 Updating file purge worker systemd service..."
+sudo cp $PROJECT_DIR/purge_files.service /etc/systemd/system/purge_files.service
+sudo systemctl daemon-reload
+sudo systemctl enable purge_files
+
 # === Nginx configuration (safe mode) ===
 echo "🔹 Verifying Nginx configuration..."
 if [ -f "$NGINX_CONF_PATH" ]; then
@@ -65,8 +80,10 @@ fi
 sudo nginx -t
 
 # === Restart services ===
-echo "🔹 Restarting Gunicorn and Nginx..."
+echo "🔹 Restarting Gunicorn, the outbox and file purge workers and Nginx..."
 sudo systemctl restart $SERVICE_NAME
+sudo systemctl restart outbox
+sudo systemctl restart purge_files
 sudo systemctl restart nginx
 
 # === Verify SSL certificate ===